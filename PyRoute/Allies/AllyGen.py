@@ -6,6 +6,7 @@ Created on Mar 26, 2014
 import functools
 import typing
 
+import numpy as np
 from typing_extensions import TypeAlias
 
 from PyRoute.Outputs.Colour import Colour
@@ -144,6 +145,63 @@ class AllyGen(object):
         "NONE": "white",  # Default color
     }
 
+    # Integer ids for allegiance codes, handed out the first time each code is seen (ie as sectors are read), so that
+    # hot-path alliance checks are array lookups rather than scans over sameAligned.  For ids i and j:
+    # alliance_matrix[i, j] is are_allies, owned_alliance_matrix[i, j] is are_owned_allies, same_align_ids[i] is the
+    # id of same_align, and nonaligned_ids[i] / strict_nonaligned_ids[i] are is_nonaligned.  The arrays carry spare
+    # capacity past the last assigned id, so registering a new code is amortised constant time.
+    alg_ids: dict[Alg, int] = {}
+    alg_id_codes: list[Alg] = []
+    alliance_matrix: np.ndarray = np.zeros((0, 0), dtype=bool)
+    owned_alliance_matrix: np.ndarray = np.zeros((0, 0), dtype=bool)
+    same_align_ids: np.ndarray = np.zeros(0, dtype=np.int32)
+    nonaligned_ids: np.ndarray = np.zeros(0, dtype=bool)
+    strict_nonaligned_ids: np.ndarray = np.zeros(0, dtype=bool)
+
+    @staticmethod
+    def alg_id(alg: Alg) -> int:
+        alg_id = AllyGen.alg_ids.get(alg, None)
+        if alg_id is None:
+            alg_id = AllyGen._register_alg(alg)
+        return alg_id
+
+    @staticmethod
+    def _register_alg(alg: Alg) -> int:
+        alg_id = len(AllyGen.alg_id_codes)
+        AllyGen.alg_ids[alg] = alg_id
+        AllyGen.alg_id_codes.append(alg)
+        AllyGen._reserve_alg_ids(alg_id + 1)
+
+        codes = AllyGen.alg_id_codes
+        AllyGen.alliance_matrix[alg_id, :alg_id + 1] = [AllyGen._are_allies_core(alg, other) for other in codes]
+        AllyGen.alliance_matrix[:alg_id + 1, alg_id] = [AllyGen._are_allies_core(other, alg) for other in codes]
+        AllyGen.owned_alliance_matrix[alg_id, :alg_id + 1] = [AllyGen._are_owned_allies_core(alg, other) for other in codes]
+        AllyGen.owned_alliance_matrix[:alg_id + 1, alg_id] = [AllyGen._are_owned_allies_core(other, alg) for other in codes]
+        AllyGen.nonaligned_ids[alg_id] = alg in AllyGen.nonAligned or alg in AllyGen.noOne
+        AllyGen.strict_nonaligned_ids[alg_id] = alg in AllyGen.nonAligned
+
+        base = AllyGen.same_align(alg)
+        AllyGen.same_align_ids[alg_id] = alg_id if base == alg else AllyGen.alg_id(base)
+        return alg_id
+
+    @staticmethod
+    def _reserve_alg_ids(count: int) -> None:
+        capacity = len(AllyGen.same_align_ids)
+        if count <= capacity:
+            return
+        new_capacity = max(count, 2 * capacity, 64)
+
+        for name in ['alliance_matrix', 'owned_alliance_matrix']:
+            old_matrix = getattr(AllyGen, name)
+            matrix = np.zeros((new_capacity, new_capacity), dtype=bool)
+            matrix[:capacity, :capacity] = old_matrix
+            setattr(AllyGen, name, matrix)
+        for name in ['same_align_ids', 'nonaligned_ids', 'strict_nonaligned_ids']:
+            old_column = getattr(AllyGen, name)
+            column = np.zeros(new_capacity, dtype=old_column.dtype)
+            column[:capacity] = old_column
+            setattr(AllyGen, name, column)
+
     @staticmethod
     def is_unclaimed(alg: Alg) -> bool:
         return alg in AllyGen.noOne
@@ -151,9 +209,11 @@ class AllyGen(object):
     @staticmethod
     def is_nonaligned(alg: Alg, strict: bool = False) -> bool:
         assert isinstance(strict, bool)
+        # Take the id first, as registering a new code swaps in bigger arrays
+        alg_id = AllyGen.alg_id(alg)
         if strict:
-            return alg in AllyGen.nonAligned
-        return alg in AllyGen.nonAligned or alg in AllyGen.noOne
+            return bool(AllyGen.strict_nonaligned_ids[alg_id])
+        return bool(AllyGen.nonaligned_ids[alg_id])
 
     @staticmethod
     def is_wilds(alg: Alg) -> bool:
@@ -244,6 +304,22 @@ class AllyGen(object):
         Public function to determine if the Allegiances of two
         world are considered allied for the owned world checks.
         """
+        alg1_id = AllyGen.alg_id(alg1)
+        alg2_id = AllyGen.alg_id(alg2)
+        return bool(AllyGen.owned_alliance_matrix[alg1_id, alg2_id])
+
+    @staticmethod
+    def are_allies(alg1: Alg, alg2: Alg) -> bool:
+        """
+        Public function to determine if the Allegiance of two
+        worlds are considered allied for trade purposes or not.
+        """
+        alg1_id = AllyGen.alg_id(alg1)
+        alg2_id = AllyGen.alg_id(alg2)
+        return bool(AllyGen.alliance_matrix[alg1_id, alg2_id])
+
+    @staticmethod
+    def _are_owned_allies_core(alg1: Alg, alg2: Alg) -> bool:
         if alg1 is None or alg2 is None:
             return False
         if alg1 in AllyGen.noOne or alg2 in AllyGen.noOne:
@@ -253,12 +329,7 @@ class AllyGen(object):
         return any(alg1 in sameAlg and alg2 in sameAlg for sameAlg in AllyGen.sameAligned)
 
     @staticmethod
-    @functools.cache
-    def are_allies(alg1: Alg, alg2: Alg) -> bool:
-        """
-        Public function to determine if the Allegiance of two
-        worlds are considered allied for trade purposes or not.
-        """
+    def _are_allies_core(alg1: Alg, alg2: Alg) -> bool:
         if alg1 is None or alg2 is None:
             return False
         if alg1 in AllyGen.noOne or alg2 in AllyGen.noOne:
@@ -0,0 +1,70 @@
+"""
+Created on Oct 19, 2026
+
+@author: CyberiaResurrection
+"""
+import codecs
+import hashlib
+import json
+import logging
+import os
+
+
+class BorderCache(object):
+    """
+    Finished borders, stored on disk keyed by a digest of everything that goes into drawing them: each world's hex,
+    allegiance and starport, in galaxy order, the size of each allegiance, the border algorithm, the match mode, and
+    the enforce and debug flags.  Trade routes and statistics play no part, so changing route options between runs
+    still finds the borders from the last run.
+    """
+    # Bump this when a change to border generation would change the borders drawn from the same galaxy
+    version = 1
+
+    def __init__(self, cache_dir: str) -> None:
+        self.cache_dir = cache_dir
+        self.logger = logging.getLogger('PyRoute.BorderCache')
+
+    def digest(self, galaxy, border_gen: str, match: str, enforce: bool) -> str:
+        """
+        Digest of the border inputs for galaxy.
+        """
+        worlds = [[star.q, star.r, star.alg_code, star.port] for star in galaxy.star_mapping.values()]
+        alg_sizes = sorted([code, alg.stats.number] for code, alg in galaxy.alg.items())
+        inputs = [self.version, border_gen, match, enforce, galaxy.debug_flag, alg_sizes, worlds]
+        return hashlib.sha256(json.dumps(inputs, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, 'borders-' + digest + '.json')
+
+    def load(self, digest: str, borders) -> bool:
+        """
+        Fill borders' ally map and border colours from the cache, returning whether there was anything to fill them.
+        """
+        path = self._path(digest)
+        try:
+            with codecs.open(path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            self.logger.warning('Ignoring unreadable border cache file {}: {}'.format(path, e))
+            return False
+
+        borders.allyMap = {(q, r): alg for q, r, alg in stored['allyMap']}
+        borders.borders = {(q, r): colours for q, r, colours in stored['borders']}
+        return True
+
+    def save(self, digest: str, borders) -> None:
+        """
+        Store borders' ally map and border colours in the cache, in the order they were generated.
+        """
+        stored = {
+            'allyMap': [[q, r, alg] for (q, r), alg in borders.allyMap.items()],
+            'borders': [[q, r, colours] for (q, r), colours in borders.borders.items()]
+        }
+        path = self._path(digest)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Write to one side, then move into place, so an interrupted run can't leave a half-written entry
+        with codecs.open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(stored, f, separators=(',', ':'))
+        os.replace(path + '.tmp', path)
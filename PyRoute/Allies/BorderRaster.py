@@ -0,0 +1,296 @@
+"""
+Created on Oct 19, 2026
+
+@author: CyberiaResurrection
+"""
+from dataclasses import dataclass
+import logging
+from typing import Optional
+
+import numpy as np
+
+from PyRoute.Allies.AllyGen import AllyGen, Alg, AllyMap
+from PyRoute.Allies.HexClaims import HexClaims
+
+
+@dataclass
+class ErodeStars:
+    """
+    The worlds the erode border algorithm claims territory from, in galaxy order: each world's hex, own allegiance
+    and claim range, plus the map of world hexes to allegiances.  index and key_index place each world and each
+    star_map hex in the whole galaxy's order, out of num_stars worlds with claim ranges up to max_range, so part of a
+    galaxy claims hexes in the same order as the whole of it.
+    """
+    q: list[int]
+    r: list[int]
+    own_algs: list[Alg]
+    ranges: list[int]
+    star_map: AllyMap
+    index: list[int]
+    key_index: list[int]
+    num_stars: int
+    max_range: int
+
+    def subset(self, keep: list[bool]) -> 'ErodeStars':
+        """
+        The worlds flagged in keep, with the star map cut down to their hexes.
+        """
+        kept = [pos for pos, flag in enumerate(keep) if flag]
+        hexes = {(self.q[pos], self.r[pos]) for pos in kept}
+        keys = [(pos, key) for pos, key in enumerate(self.star_map) if key in hexes]
+        return ErodeStars([self.q[pos] for pos in kept], [self.r[pos] for pos in kept],
+                          [self.own_algs[pos] for pos in kept], [self.ranges[pos] for pos in kept],
+                          {key: self.star_map[key] for _, key in keys}, [self.index[pos] for pos in kept],
+                          [self.key_index[pos] for pos, _ in keys], self.num_stars, self.max_range)
+
+
+class BorderRaster(object):
+    """
+    The erode border algorithm from Borders.create_erode_border, run over a dense raster covering the galaxy's axial
+    bounding box rather than over dicts keyed by (q, r).
+
+    Each cell holds the AllyGen.alg_id of its allegiance, or -1 when the hex is not in the ally map at all, alongside
+    the order the hex would have been added to the dict-based ally map.  That order decides which colour wins on
+    shared border edges in Borders._generate_borders, so it is carried through to the finished ally map.
+
+    Claims and erosion are whole-raster array operations.  Span breaking and bridge building each depend on the
+    changes they have already made, so they're vectorised down to the few hexes that could change, then walked in
+    the same order as the dict version.
+    """
+    # Widest reach from a world: claims out to 4 hexes, span checks 3 hexes beyond those, then neighbours of those
+    margin = 8
+
+    def __init__(self, logger: logging.Logger, alg_sizes: dict[Alg, int]) -> None:
+        self.logger = logger
+        self.alg_sizes = alg_sizes
+        self.q_min = 0
+        self.r_min = 0
+        self.width = 0
+        self.offsets: list[int] = []
+        self.values: np.ndarray = np.zeros(0, dtype=np.int32)
+        self.rank: np.ndarray = np.zeros(0, dtype=np.int64)
+        self.star_mask: np.ndarray = np.zeros(0, dtype=bool)
+        self.star_values: np.ndarray = np.zeros(0, dtype=np.int32)
+        self.star_cells: np.ndarray = np.zeros(0, dtype=np.int64)
+        self.key_index: np.ndarray = np.zeros(0, dtype=np.int64)
+        self.bridge_rank = 0
+        self.none_id = AllyGen.alg_id(None)
+
+    def erode_border(self, stars: ErodeStars) -> AllyMap:
+        """
+        Run the whole erode process, returning the same ally map as the dict-based version.
+        """
+        self.erode_raster(stars)
+        return self.ally_map()
+
+    def erode_raster(self, stars: ErodeStars) -> None:
+        """
+        Run the whole erode process, leaving the result in the raster.
+        """
+        if not self.erode_map(stars):
+            return
+        changed = True
+        change_count = 0
+        while changed:
+            if change_count == 100:
+                self.logger.error('Change count for map processing exceeded expected value of 100')
+                break
+            changed = self.erode()
+            if not changed:
+                changed = self.break_spans()
+            change_count += 1  # pragma: no mutate
+
+        self.logger.debug('Change Count: {}'.format(change_count))
+        self.build_bridges()
+
+    def erode_map(self, stars: ErodeStars) -> bool:
+        """
+        Fill the raster with each world's claims, resolved as Borders._erode_map does.  Returns False if there are no
+        worlds to claim anything.
+        """
+        if 0 == len(stars.q):
+            return False
+
+        star_q = np.array(stars.q, dtype=np.int64)
+        star_r = np.array(stars.r, dtype=np.int64)
+        self._size_raster(star_q, star_r)
+
+        star_map = stars.star_map
+        keys = list(star_map.keys())
+        self.star_cells = self._cell(np.array([key[0] for key in keys], dtype=np.int64),
+                                     np.array([key[1] for key in keys], dtype=np.int64))
+        self.star_mask[self.star_cells] = True
+        self.star_values[self.star_cells] = [AllyGen.alg_id(star_map[key]) for key in keys]
+        self.key_index = np.array(stars.key_index, dtype=np.int64)
+
+        # Claim ranges use whichever allegiance ended up in star_map, as the dict version does
+        own_ids = np.array([AllyGen.alg_id(alg) for alg in stars.own_algs], dtype=np.int64)
+        ring_ids = np.array([AllyGen.alg_id(star_map[key]) for key in zip(stars.q, stars.r)], dtype=np.int64)
+        claims = HexClaims.claims(self._cell(star_q, star_r), self.width, own_ids, ring_ids,
+                                  np.array(stars.ranges, dtype=np.int64), np.array(stars.index, dtype=np.int64),
+                                  stars.num_stars, stars.max_range)
+        cells, min_dist, algs, tied, first_rank = HexClaims.resolve(*claims)
+
+        # Hexes join the ally map in the order they're first claimed, and bridges after all the claims
+        self.rank[cells] = first_rank
+        self.bridge_rank = stars.num_stars * (len(HexClaims.stencil(max(0, stars.max_range - 1))) + 1)
+        self.values[cells] = algs
+        codes = AllyGen.alg_id_codes
+        for index, tied_algs in tied.items():
+            ally_list = sorted(codes[alg] for alg in tied_algs)  # type: ignore[type-var]
+            self.values[cells[index]] = AllyGen.alg_id(HexClaims.erode_claim(ally_list, int(min_dist[index]),
+                                                                              self.alg_sizes))
+        return True
+
+    def _size_raster(self, star_q: np.ndarray, star_r: np.ndarray) -> None:
+        self.q_min = int(star_q.min()) - self.margin
+        self.r_min = int(star_r.min()) - self.margin
+        height = int(star_q.max()) + self.margin - self.q_min + 1
+        self.width = int(star_r.max()) + self.margin - self.r_min + 1
+        size = height * self.width
+
+        self.offsets = [dq * self.width + dr for dq, dr in HexClaims.directions]
+        self.values = np.full(size, -1, dtype=np.int32)
+        self.rank = np.zeros(size, dtype=np.int64)
+        self.star_mask = np.zeros(size, dtype=bool)
+        self.star_values = np.full(size, -1, dtype=np.int32)
+
+    def _cell(self, q: np.ndarray, r: np.ndarray) -> np.ndarray:
+        return (q - self.q_min) * self.width + (r - self.r_min)
+
+    def _lookup(self) -> np.ndarray:
+        # What ally_map.get() would give for each hex
+        return np.where(self.values < 0, self.none_id, self.values)
+
+    def erode(self) -> bool:
+        """
+        Remove empty hexes from a polity if three contiguous neighbours are not aligned with it.
+        """
+        cells = np.flatnonzero((0 <= self.values) & ~self.star_mask)
+        lookup = self._lookup()
+        allies = AllyGen.alliance_matrix
+        cand = lookup[cells]
+        not_ally = [~allies[cand, lookup[cells + offset]] for offset in self.offsets]
+        eroded = np.zeros(len(cells), dtype=bool)
+        for direction in range(6):
+            eroded |= not_ally[direction] & not_ally[(direction + 1) % 6] & not_ally[(direction + 2) % 6]
+        self.values[cells[eroded]] = -1
+        # Worlds keep their allegiances
+        self.values[self.star_cells] = self.star_values[self.star_cells]
+        return bool(eroded.any())
+
+    def break_spans(self) -> bool:
+        """
+        Find a span of four empty edge hexes and break the span by setting one to not aligned.
+        """
+        cells = np.flatnonzero(0 <= self.values)
+        lookup = self._lookup()
+        allies = AllyGen.alliance_matrix
+        cand = lookup[cells]
+        edge = np.zeros(len(cells), dtype=bool)
+        for offset in self.offsets:
+            edge |= ~allies[cand, lookup[cells + offset]]
+        edge_cells = cells[edge]
+        edge_lookup = np.full(len(self.values), self.none_id, dtype=np.int32)
+        edge_lookup[edge_cells] = lookup[edge_cells]
+
+        # Spans as they stand before any are broken.  Breaking a span only ever sets hexes to None, which can't
+        # create a new span, so only these hexes need walking in order.
+        start = edge_cells[~self.star_mask[edge_cells]]
+        start_alg = edge_lookup[start]
+        spans = []
+        for offset in self.offsets:
+            span = np.ones(len(start), dtype=bool)
+            for distance in range(1, 4):
+                check = start + offset * distance
+                span &= ~self.star_mask[check] & allies[start_alg, edge_lookup[check]]
+            spans.append(span)
+        any_span = np.logical_or.reduce(spans)
+        if not any_span.any():
+            return False
+
+        order = np.argsort(self.rank[start[any_span]], kind='stable')
+        walk = start[any_span][order].tolist()
+        span_rows = [span[any_span][order].tolist() for span in spans]
+        broken: set[int] = set()
+        for row, cand_hex in enumerate(walk):
+            if cand_hex in broken:
+                continue
+            for direction, offset in enumerate(self.offsets):
+                if not span_rows[direction][row]:
+                    continue
+                check_hexes = [cand_hex + offset * distance for distance in range(1, 4)]
+                if any(check_hex in broken for check_hex in check_hexes):
+                    continue
+                self.values[check_hexes[0]] = self.none_id
+                broken.add(check_hexes[0])
+                break
+
+        return 0 < len(broken)
+
+    def build_bridges(self) -> None:
+        """
+        Build a bridge between two worlds one hex apart as to avoid disrupting contiguous empires.
+        """
+        allies = AllyGen.alliance_matrix
+        # Only worlds with an allied world two hexes away can get a bridge
+        second_ring = [dq * self.width + dr for dq, dr, dist in HexClaims.stencil(2) if 2 == dist]
+        cells = self.star_cells
+        cand = self.star_values[cells]
+        bridgeable = np.zeros(len(cells), dtype=bool)
+        for offset in second_ring:
+            check = cells + offset
+            bridgeable |= self.star_mask[check] & allies[cand, np.where(self.star_mask[check], self.star_values[check],
+                                                                        self.none_id)]
+
+        for cand_hex, key_index in zip(cells[bridgeable].tolist(), self.key_index[bridgeable].tolist()):
+            new_bridge = self._search_range(cand_hex)
+            if new_bridge is None:
+                continue
+            # New hexes join the ally map in star map order, after everything else
+            if 0 > self.values[new_bridge]:
+                self.rank[new_bridge] = self.bridge_rank + key_index
+            self.values[new_bridge] = self.star_values[cand_hex]
+
+    def _search_range(self, cand_hex: int) -> Optional[int]:
+        allies = AllyGen.alliance_matrix
+        star_candidate = self.star_values[cand_hex]
+        neighbours = [cand_hex + offset for offset in self.offsets]
+        new_bridge = None
+        checked: list[int] = []
+        for check_hex in neighbours:
+            if self.star_mask[check_hex]:
+                if allies[star_candidate, self.star_values[check_hex]]:
+                    checked.append(check_hex)
+                continue
+            check_alg = self.values[check_hex]
+            if allies[star_candidate, self.none_id if 0 > check_alg else check_alg]:
+                checked.append(check_hex)
+                continue
+            for offset in self.offsets:
+                search_hex = check_hex + offset
+                if search_hex in checked:
+                    new_bridge = None
+                    continue
+                if search_hex == cand_hex or search_hex in neighbours:
+                    continue
+                if self.star_mask[search_hex] and allies[star_candidate, self.star_values[search_hex]]:
+                    new_bridge = check_hex
+                    checked.append(check_hex)
+        return new_bridge
+
+    def hexes(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        The q, r, allegiance id and ally map order of each hex in the ally map, in that order.
+        """
+        cells = np.flatnonzero(0 <= self.values)
+        cells = cells[np.argsort(self.rank[cells], kind='stable')]
+        return cells // self.width + self.q_min, cells % self.width + self.r_min, self.values[cells], self.rank[cells]
+
+    def ally_map(self) -> AllyMap:
+        """
+        The raster as an ally map, with hexes in the order the dict-based version adds them.
+        """
+        q, r, algs, _ = self.hexes()
+        codes = AllyGen.alg_id_codes
+        return {(hex_q, hex_r): codes[alg] for hex_q, hex_r, alg in zip(q.tolist(), r.tolist(), algs.tolist())}
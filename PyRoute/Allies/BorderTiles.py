@@ -0,0 +1,135 @@
+"""
+Created on Oct 19, 2026
+
+@author: CyberiaResurrection
+"""
+import logging
+from multiprocessing import Pool
+from typing import Optional
+
+import numpy as np
+
+from PyRoute.Allies.AllyGen import AllyGen, Alg, AllyMap
+from PyRoute.Allies.BorderRaster import BorderRaster, ErodeStars
+
+# A tile's edges, as inclusive (dx_min, dx_max, dy_min, dy_max) in galaxy-wide offset hex coordinates
+TileRect = tuple[int, int, int, int]
+
+
+def erode_tile(payload: tuple[ErodeStars, TileRect, int, dict[Alg, int]]) -> tuple[list, dict]:
+    """
+    Run the erode border algorithm over one tile's worlds.  Returns the (q, r, allegiance, ally map order) of each
+    ally map hex inside the tile, and the allegiance of each ally map hex within seam hexes outside it.
+    """
+    stars, core, seam, alg_sizes = payload
+    raster = BorderRaster(logging.getLogger('PyRoute.Borders'), alg_sizes)
+    raster.erode_raster(stars)
+    q, r, algs, rank = raster.hexes()
+    dx, dy = BorderTiles.offset(q, r)
+    in_core = BorderTiles.inside(dx, dy, core, 0)
+    in_band = BorderTiles.inside(dx, dy, core, seam) & ~in_core
+
+    codes = AllyGen.alg_id_codes
+    q_list = q.tolist()
+    r_list = r.tolist()
+    alg_list = algs.tolist()
+    rank_list = rank.tolist()
+    hexes = [(q_list[pos], r_list[pos], codes[alg_list[pos]], rank_list[pos]) for pos in np.flatnonzero(in_core)]
+    band = {(q_list[pos], r_list[pos]): codes[alg_list[pos]] for pos in np.flatnonzero(in_band)}
+    return hexes, band
+
+
+class BorderTiles(object):
+    """
+    The erode border algorithm split over sector-aligned tiles, each tile_size sectors on a side, run over a process
+    pool and stitched back into one ally map.
+
+    Each tile is eroded from its own worlds plus every world within halo hexes of it, using BorderRaster.  Claim
+    order is kept galaxy-wide, so the stitched ally map has its hexes in the same order as a single run over the
+    whole galaxy, and _generate_borders picks the same colours on shared edges.
+
+    Erosion runs until nothing changes, so its reach is not strictly bounded.  The seam check has every tile's result
+    for the hexes just past its edges match what the neighbouring tiles made of them, and if any don't, the galaxy is
+    eroded in one piece instead.
+    """
+    # Widest claim is 4 hexes from a world, then erosion reach as for BorderRaster
+    halo = 4 + BorderRaster.margin
+    seam = 4
+    # How far claims reach past a world, to find every tile with hexes claimed
+    reach = 4
+
+    def __init__(self, logger: logging.Logger, alg_sizes: dict[Alg, int], mp_threads: int, tile_size: int = 2) -> None:
+        self.logger = logger
+        self.alg_sizes = alg_sizes
+        self.mp_threads = mp_threads
+        self.tile_width = 32 * tile_size
+        self.tile_height = 40 * tile_size
+
+    @staticmethod
+    def offset(q: np.ndarray, r: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Axial hex coordinates to galaxy-wide offset coordinates, as in Hex.axial_to_hex.
+        """
+        return q, r + (q + (q & 1)) // 2
+
+    @staticmethod
+    def inside(dx: np.ndarray, dy: np.ndarray, rect: TileRect, margin: int) -> np.ndarray:
+        """
+        Which hexes lie in rect, widened by margin on every side.  Every hex within margin hexes of rect does.
+        """
+        return ((rect[0] - margin <= dx) & (dx <= rect[1] + margin) &
+                (rect[2] - margin <= dy) & (dy <= rect[3] + margin))
+
+    def erode_border(self, stars: ErodeStars) -> AllyMap:
+        """
+        Run the whole erode process, returning the same ally map as BorderRaster does.
+        """
+        dx, dy = self.offset(np.array(stars.q, dtype=np.int64), np.array(stars.r, dtype=np.int64))
+        tiles: set[tuple[int, int]] = set()
+        for step_x in [-self.reach, self.reach]:
+            for step_y in [-self.reach, self.reach]:
+                tiles.update(zip(((dx + step_x) // self.tile_width).tolist(),
+                                 ((dy + step_y) // self.tile_height).tolist()))
+
+        if 2 > self.mp_threads or 2 > len(tiles):
+            return BorderRaster(self.logger, self.alg_sizes).erode_border(stars)
+
+        cores = []
+        payloads = []
+        for tile_x, tile_y in sorted(tiles):
+            core = (tile_x * self.tile_width, (tile_x + 1) * self.tile_width - 1,
+                    tile_y * self.tile_height, (tile_y + 1) * self.tile_height - 1)
+            keep = self.inside(dx, dy, core, self.halo)
+            cores.append(core)
+            payloads.append((stars.subset(keep.tolist()), core, self.seam, self.alg_sizes))
+
+        processes = min(self.mp_threads, len(payloads))
+        self.logger.info('Eroding {} border tiles over {} processes'.format(len(payloads), processes))
+        with Pool(processes=processes) as pool:
+            results = pool.map(erode_tile, payloads)
+
+        ally_map = self.stitch(cores, results)
+        if ally_map is None:
+            self.logger.warning('Border tiles disagree at their seams, eroding the galaxy in one piece')
+            return BorderRaster(self.logger, self.alg_sizes).erode_border(stars)
+        return ally_map
+
+    def stitch(self, cores: list[TileRect], results: list[tuple[list, dict]]) -> Optional[AllyMap]:
+        """
+        Join the tiles' hexes into one ally map in ally map order, or None if any tile's hexes past its edges differ
+        from the tiles they are inside.
+        """
+        hexes = sorted((entry for tile_hexes, _ in results for entry in tile_hexes), key=lambda entry: entry[3])
+        ally_map = {(hex_q, hex_r): alg for hex_q, hex_r, alg, _ in hexes}
+
+        q = np.array([entry[0] for entry in hexes], dtype=np.int64)
+        r = np.array([entry[1] for entry in hexes], dtype=np.int64)
+        dx, dy = self.offset(q, r)
+        missing = object()
+        for core, (_, band) in zip(cores, results):
+            in_band = self.inside(dx, dy, core, self.seam) & ~self.inside(dx, dy, core, 0)
+            if int(np.count_nonzero(in_band)) != len(band):
+                return None
+            if any(ally_map.get(pos, missing) != alg for pos, alg in band.items()):
+                return None
+        return ally_map
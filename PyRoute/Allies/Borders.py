@@ -7,10 +7,15 @@ from collections import defaultdict
 import logging
 from operator import itemgetter
 
+import numpy as np
+
 from typing_extensions import TypeAlias
 from typing import Optional, Union
 
 from PyRoute.Allies.AllyGen import AllyGen
+from PyRoute.Allies.BorderRaster import ErodeStars
+from PyRoute.Allies.BorderTiles import BorderTiles
+from PyRoute.Allies.HexClaims import HexClaims
 import PyRoute.AreaItems.Galaxy as Galaxy
 from PyRoute.Outputs.Colour import Colour
 from PyRoute.Position.Hex import Hex, HexPos
@@ -184,27 +189,17 @@ class Borders(object):
         self._generate_borders(self.allyMap, enforce)
 
     def _ally_map(self, match: str) -> AllyMap:
-        # Create list of stars
-        ally_map, star_map, stars = self._unpack_stars_and_maps(match)
-
-        # Pass 1: generate initial allegiance arrays,
-        # with overlapping maps
+        star_map, own_algs, stars = self._unpack_stars(match)
+        max_ranges = []
         for star in stars:
+            alg = star_map[(star.q, star.r)]
             # skip the E/X ports
-            cand_hex = (star.q, star.r)
-            alg = star_map[cand_hex]
-
             max_range = 1 if star.port in ['E', 'X', '?'] else ['D', 'C', 'B', 'A'].index(star.port) + 2
             if AllyGen.is_nonaligned(alg):
                 max_range = 2
-            for dist in range(max_range):
-                neighbor = Hex.get_neighbor(cand_hex, 4, dist)
-                for direction in range(6):
-                    for _ in range(dist):
-                        star_dist = Hex.axial_distance(cand_hex, neighbor)
-                        ally_map[neighbor].add((alg, star_dist))
-                        neighbor = Hex.get_neighbor(neighbor, direction)
+            max_ranges.append(max_range)
 
+        # Pass 1: generate initial allegiance claims, with overlapping maps
         # Pass 2: find overlapping areas and reduce
         # 0: hexes with only one claimant, give it to them
         # 1: hexes with the world (dist 0) get selected
@@ -212,28 +207,19 @@ class Borders(object):
         # 3: hexes claimed by two (or more) allies are pushed to the closest world
         # 4: hexes claimed by two (or more) allies at the same distance
         #    are claimed by the larger empire.
-        for cand_hex in ally_map:
-            if len(ally_map[cand_hex]) == 1:
-                ally_map[cand_hex] = ally_map[cand_hex].pop()[0]
-            else:
-                raw_ally_list = [algs for algs in ally_map[cand_hex]]
-                ally_list = sorted(raw_ally_list, key=itemgetter(1, 0))  # pragma: no mutate
-
-                min_distance = ally_list[0][1]
-                ally_dist = [algs for algs in ally_list if algs[1] == min_distance]
-                if len(ally_dist) == 1:
-                    ally_map[cand_hex] = ally_dist[0][0]
-                else:
-                    max_count = -1  # pragma: no mutate
-                    max_ally: Union[str, None] = None  # pragma: no mutate
-                    for alg, _ in ally_dist:
-                        if AllyGen.is_nonaligned(alg):
-                            max_ally = alg
-                            break
-                        if self.galaxy.alg[alg].stats.number > max_count:  # type: ignore
-                            max_ally = alg
-                            max_count = self.galaxy.alg[alg].stats.number  # type: ignore
-                    ally_map[cand_hex] = max_ally  # type: ignore
+        hexes, _, algs, tied = self._claim_hexes(star_map, own_algs, stars, max_ranges)
+        ally_map: defaultdict[tuple[int, int], Union[set, Alg]] = defaultdict(set, zip(hexes, algs))
+        for index, ally_list in tied.items():
+            max_count = -1  # pragma: no mutate
+            max_ally: Union[str, None] = None  # pragma: no mutate
+            for alg in ally_list:
+                if AllyGen.is_nonaligned(alg):
+                    max_ally = alg
+                    break
+                if self.galaxy.alg[alg].stats.number > max_count:  # type: ignore
+                    max_ally = alg
+                    max_count = self.galaxy.alg[alg].stats.number  # type: ignore
+            ally_map[hexes[index]] = max_ally
 
         # Pass 3: find lonely claimed hexes and remove them
         # Do two passes through the data
@@ -248,16 +234,26 @@ class Borders(object):
 
                 alg_list = sorted(iter(neighbor_algs.items()), key=itemgetter(1), reverse=True)
                 # Alg_list can't be empty, as it's a sort on items of a 6-element defaultdict
-                ally_map[cand_hex] = alg_list[0][0]  # type: ignore
+                ally_map[cand_hex] = alg_list[0][0]
 
         return ally_map  # type: ignore
 
-    def create_erode_border(self, match: str, enforce=True) -> None:
+    def create_erode_border(self, match: str, enforce=True, raster=False, mp_threads=1) -> None:
         """
         Create borders around various allegiances, Algorithm Three.
         From TravellerMap http://travellermap.com/borders/doc.htm
+
+        With raster set, the work is done by BorderRaster over a dense array of the galaxy, rather than over dicts,
+        split into tiles over mp_threads processes by BorderTiles if there's more than one.
+        The result is the same either way.
         """
         self.logger.info('Processing worlds for erode map drawing')
+        if raster:
+            tiles = BorderTiles(self.logger, self._alg_sizes(), mp_threads)
+            self.allyMap = tiles.erode_border(self._erode_stars(match))
+            self._generate_borders(self.allyMap, enforce)
+            return
+
         ally_map, star_map = self._erode_map(match)
         changed = True
         change_count = 0
@@ -408,67 +404,61 @@ class Borders(object):
         Generate the initial map of allegiances for the erode map.
         Note: This does not match the original system.
         """
-        # Create list of stars
-        ally_map, star_map, stars = self._unpack_stars_and_maps(match)
+        star_map, own_algs, stars = self._unpack_stars(match)
+        max_ranges = self._erode_ranges(star_map, stars)
 
-        # Pass 1: generate initial allegiance arrays,
-        # with overlapping maps
-        for star in stars:
-            cand_hex = (star.q, star.r)
-            alg = star_map[cand_hex]
+        # Pass 1: generate initial allegiance claims, with overlapping maps
+        # Pass 2: find overlapping areas and reduce
+        # 0: hexes with only one claimant, give it to them
+        # 3: hexes claimed by two (or more) allies are pushed to the closest world
+        # The rest are settled by HexClaims.erode_claim
+        hexes, min_dist, algs, tied = self._claim_hexes(star_map, own_algs, stars, max_ranges)
+        ally_map: defaultdict[tuple[int, int], Union[set, Alg]] = defaultdict(set, zip(hexes, algs))
+        alg_sizes = self._alg_sizes() if tied else {}
+        for index, ally_list in tied.items():
+            ally_map[hexes[index]] = HexClaims.erode_claim(ally_list, min_dist[index], alg_sizes)
+
+        return ally_map, star_map  # type: ignore
 
+    def _alg_sizes(self) -> dict[Alg, int]:
+        """
+        Number of worlds in each allegiance, to settle contested hexes in favour of the larger empire.
+        """
+        return {code: alg.stats.number for code, alg in self.galaxy.alg.items()}  # type: ignore
+
+    def _erode_ranges(self, star_map: AllyMap, stars: list[Star]) -> list[int]:
+        """
+        How far each world claims territory for the erode map, from the allegiance its hex ended up with in star_map.
+        """
+        max_ranges = []
+        for star in stars:
+            alg = star_map[(star.q, star.r)]
             if AllyGen.is_nonaligned(alg):
                 max_range = 0  # pragma: no mutate
             elif star.port in ['E', 'X', '?']:
                 max_range = 1  # pragma: no mutate
             else:
                 max_range = ['D', 'C', 'B', 'A'].index(star.port) + 2
+            max_ranges.append(max_range)
+        return max_ranges
 
-            # Walk the ring filling in the hexes around star with this neighbour
-            for dist in range(1, max_range):  # pragma: no mutate
-                # Start in direction 0, at distance n
-                neighbour = Hex.get_neighbor(cand_hex, 4, dist)
-                # walk six sides
-                for side in range(6):
-                    for _ in range(dist):
-                        ally_map[neighbour].add((alg, Hex.axial_distance(cand_hex, neighbour)))
-                        neighbour = Hex.get_neighbor(neighbour, side)
-
-        # Pass 2: find overlapping areas and reduce
-        # 0: hexes with only one claimant, give it to them
-        # 1: hexes with the world (dist 0) get selected
-        # 3: hexes claimed by two (or more) allies are pushed to the closest world
-        # 4: hexes claimed by two (or more) allies at the same distance
-        #    are claimed by the larger empire.
-        for cand_hex in ally_map:
-            if len(ally_map[cand_hex]) == 1:  # pragma: no mutate
-                ally_map[cand_hex] = ally_map[cand_hex].pop()[0]
-            else:
-                ally_list = sorted([algs for algs in ally_map[cand_hex]], key=itemgetter(1, 0))  # pragma: no mutate
-                min_distance = ally_list[0][1]
-                if min_distance == 0:  # pragma: no mutate
-                    ally_map[cand_hex] = ally_list[0][0]
-                else:
-                    ally_dist = [algs for algs in ally_list if algs[1] == min_distance]
-                    if len(ally_dist) == 1:
-                        ally_map[cand_hex] = ally_dist[0][0]
-                    else:
-                        max_count = -1  # pragma: no mutate
-                        max_ally = None  # pragma: no mutate
-                        for alg, _ in ally_dist:
-                            if AllyGen.is_nonaligned(alg):  # pragma: no mutate
-                                continue  # pragma: no mutate
-                            if self.galaxy.alg[alg].stats.number > max_count:  # type: ignore
-                                max_ally = alg
-                                max_count = self.galaxy.alg[alg].stats.number  # type: ignore
-                        ally_map[cand_hex] = max_ally  # type: ignore
-
-        return ally_map, star_map  # type: ignore
+    def _erode_stars(self, match: str) -> ErodeStars:
+        """
+        The galaxy's worlds, as the raster and tiled erode border engines need them.
+        """
+        star_map, own_algs, stars = self._unpack_stars(match)
+        max_ranges = self._erode_ranges(star_map, stars)
+        return ErodeStars([star.q for star in stars], [star.r for star in stars], own_algs, max_ranges, star_map,
+                          list(range(len(stars))), list(range(len(star_map))), len(stars), max(max_ranges, default=0))
 
-    def _unpack_stars_and_maps(self, match: str) -> tuple[defaultdict[tuple[int, int], set], AllyMap, list[Star]]:
-        stars = self.galaxy.star_mapping.values()  # type: ignore
-        ally_map: defaultdict[tuple[int, int], set] = defaultdict(set)
-        star_map = {}
+    def _unpack_stars(self, match: str) -> tuple[AllyMap, list[Alg], list[Star]]:
+        """
+        Map each world's hex to its allegiance, as used for borders.  Also returns each world's own allegiance, in
+        world order - where worlds share a hex, the map holds the last of them.
+        """
+        stars = list(self.galaxy.star_mapping.values())  # type: ignore
+        star_map: AllyMap = {}
+        own_algs = []
         # Mark the map with all the stars
         for star in stars:
             alg = star.alg_code
@@ -479,9 +469,38 @@ class Borders(object):
             # Collapse same Aligned into one
             alg = self._collapse_allegiance_if_needed(alg, match)
 
-            ally_map[(star.q, star.r)].add((alg, 0))
+            own_algs.append(alg)
             star_map[(star.q, star.r)] = alg
-        return ally_map, star_map, stars
+        return star_map, own_algs, stars
+
+    def _claim_hexes(self, star_map: AllyMap, own_algs: list[Alg], stars: list[Star],
+                     max_ranges: list[int]) -> tuple[list[HexPos], list[int], list[Alg], dict[int, list[Alg]]]:
+        """
+        Each world claims its own hex, and the hexes out to (but not including) its max range.  Returns the claimed
+        hexes, in the order they were first claimed, the closest claim distance to each, and the allegiance claiming
+        each hex at that distance.  Where more than one allegiance does, the allegiance is None and the claimants,
+        sorted by code, are keyed by position in the last return value.
+        """
+        if 0 == len(stars):
+            return [], [], [], {}
+        star_q = np.array([star.q for star in stars], dtype=np.int64)
+        star_r = np.array([star.r for star in stars], dtype=np.int64)
+        margin = max(max_ranges)
+        q_min = int(star_q.min()) - margin
+        r_min = int(star_r.min()) - margin
+        width = int(star_r.max()) + margin - r_min + 1
+
+        own_ids = np.array([AllyGen.alg_id(alg) for alg in own_algs], dtype=np.int64)
+        ring_ids = np.array([AllyGen.alg_id(star_map[(star.q, star.r)]) for star in stars], dtype=np.int64)
+        claims = HexClaims.claims((star_q - q_min) * width + (star_r - r_min), width, own_ids, ring_ids,
+                                  np.array(max_ranges, dtype=np.int64))
+        cells, min_dist, algs, tied, _ = HexClaims.resolve(*claims)
+
+        # Tied hexes have alg -1, which picks up the trailing None
+        codes = np.array(AllyGen.alg_id_codes + [None], dtype=object)
+        hexes = list(zip((cells // width + q_min).tolist(), (cells % width + r_min).tolist()))
+        tied_algs = {index: sorted(codes[tied_ids].tolist()) for index, tied_ids in tied.items()}
+        return hexes, min_dist.tolist(), codes[algs].tolist(), tied_algs
 
     def _collapse_allegiance_if_needed(self, alg: Alg, match: str) -> Alg:
         if 'collapse' == match:
@@ -0,0 +1,139 @@
+"""
+Created on Oct 19, 2026
+
+@author: CyberiaResurrection
+"""
+import functools
+from typing import Optional
+
+import numpy as np
+
+from PyRoute.Allies.AllyGen import AllyGen, Alg
+
+
+class HexClaims(object):
+    """
+    Territory claimed by worlds out to a radius set by each world's starport, built as one table of (hex, allegiance
+    id, distance) claims from precomputed hex-ring stencils rather than walking the rings around each world in turn.
+
+    Hexes are given as cell numbers in a (q, r) grid, cell = (q - q_min) * width + (r - r_min), so a stencil offset is
+    a single integer add.  Allegiances are AllyGen.alg_id values.
+    """
+    # Axial offsets for Hex.DOWN_RIGHT through Hex.DOWN, in direction order
+    directions = [(1, -1), (1, 0), (0, 1), (-1, 1), (-1, 0), (0, -1)]
+
+    @staticmethod
+    @functools.cache
+    def stencil(max_distance: int) -> tuple[tuple[int, int, int], ...]:
+        """
+        (dq, dr, distance) for every hex within max_distance of a world, in the order Borders walks the rings
+        around the world - starting down and left at each distance, then round the six sides.
+        """
+        offsets = []
+        for dist in range(1, max_distance + 1):
+            dq, dr = -dist, 0
+            for side in range(6):
+                for _ in range(dist):
+                    offsets.append((dq, dr, (abs(dq) + abs(dr) + abs(dq + dr)) // 2))
+                    dq += HexClaims.directions[side][0]
+                    dr += HexClaims.directions[side][1]
+        return tuple(offsets)
+
+    @staticmethod
+    def claims(cells: np.ndarray, width: int, own_ids: np.ndarray, ring_ids: np.ndarray, ranges: np.ndarray,
+               index: Optional[np.ndarray] = None, num_stars: Optional[int] = None,
+               max_range: Optional[int] = None) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Each world claims its own hex at distance 0 as own_ids, then every hex out to (but not including) its range
+        as ring_ids.  Returns the claimed cell, distance, allegiance id and claim order of every claim.  Claim order is
+        when the ring walk in Borders would first reach that hex - worlds' own hexes first, then the rings around each
+        world in world order - which fixes the order hexes go into the ally map.
+
+        When the worlds are only part of the galaxy, index is each world's position in the galaxy's num_stars worlds,
+        and max_range the largest range over the galaxy, so claim order is the same as for the whole galaxy.
+        """
+        if index is None:
+            index = np.arange(len(cells), dtype=np.int64)
+        if num_stars is None:
+            num_stars = len(cells)
+        if max_range is None:
+            max_range = int(ranges.max(initial=0))
+        ring = HexClaims.stencil(max(0, max_range - 1))
+        claim_cells = [cells]
+        claim_dists = [np.zeros(len(cells), dtype=np.int64)]
+        claim_algs = [own_ids]
+        claim_ranks = [index]
+        for k, (dq, dr, dist) in enumerate(ring):
+            claimant = np.flatnonzero(dist < ranges)
+            if 0 == len(claimant):
+                continue
+            claim_cells.append(cells[claimant] + dq * width + dr)
+            claim_dists.append(np.full(len(claimant), dist, dtype=np.int64))
+            claim_algs.append(ring_ids[claimant])
+            claim_ranks.append(num_stars + index[claimant] * len(ring) + k)
+
+        return (np.concatenate(claim_cells), np.concatenate(claim_dists), np.concatenate(claim_algs),
+                np.concatenate(claim_ranks))
+
+    @staticmethod
+    def resolve(cell: np.ndarray, dist: np.ndarray, alg: np.ndarray,
+                rank: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, dict[int, list[int]], np.ndarray]:
+        """
+        Sort the claims by hex, then distance, and group them.  Only the closest claims to each hex count.
+
+        Returns the claimed cells in claim order, the closest claim distance for each, the allegiance id of each
+        hex claimed by a single allegiance at that distance (-1 otherwise), and, for the rest, the allegiance ids
+        tied at that distance keyed by position in the returned cells.  Settling ties is left to the caller.  Last is
+        the claim order of each cell.
+        """
+        order = np.lexsort((alg, dist, cell))
+        cell = cell[order]
+        dist = dist[order]
+        alg = alg[order]
+        rank = rank[order]
+
+        new_cell = np.ones(len(cell), dtype=bool)
+        new_cell[1:] = cell[1:] != cell[:-1]
+        starts = np.flatnonzero(new_cell)
+        sizes = np.diff(np.append(starts, len(cell)))
+        min_dist = dist[starts]
+        first_rank = np.minimum.reduceat(rank, starts)
+
+        # Count the distinct allegiances at the closest distance - those claims lead each group, ordered by id
+        closest = dist == np.repeat(min_dist, sizes)
+        new_alg = new_cell.copy()
+        new_alg[1:] |= alg[1:] != alg[:-1]
+        distinct = closest & new_alg
+        counts = np.add.reduceat(distinct.astype(np.int64), starts)
+
+        algs = np.where(1 == counts, alg[starts], -1)
+        ordered = np.argsort(first_rank, kind='stable')
+        tied_groups = np.flatnonzero(1 < counts[ordered]).tolist()
+        tied = {}
+        for index in tied_groups:
+            group = ordered[index]
+            start = starts[group]
+            tied[index] = alg[start:start + sizes[group]][distinct[start:start + sizes[group]]].tolist()
+
+        return cell[starts][ordered], min_dist[ordered], algs[ordered], tied, first_rank[ordered]
+
+    @staticmethod
+    def erode_claim(ally_list: list[Alg], min_distance: int, alg_sizes: dict[Alg, int]) -> Alg:
+        """
+        Settle the allegiance of a hex claimed by more than one allegiance at the closest distance for the erode map,
+        given those allegiances sorted by code, and the number of worlds in each allegiance.
+        1: hexes with the world (dist 0) get selected
+        4: hexes claimed by two (or more) allies at the same distance
+           are claimed by the larger empire.
+        """
+        if min_distance == 0:  # pragma: no mutate
+            return ally_list[0]
+        max_count = -1  # pragma: no mutate
+        max_ally = None  # pragma: no mutate
+        for alg in ally_list:
+            if AllyGen.is_nonaligned(alg):  # pragma: no mutate
+                continue  # pragma: no mutate
+            if alg_sizes[alg] > max_count:
+                max_ally = alg
+                max_count = alg_sizes[alg]
+        return max_ally
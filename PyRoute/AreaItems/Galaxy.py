@@ -10,11 +10,13 @@ import os
 import ast
 import itertools
 import math
+from typing import Optional
 
 import networkx as nx
 import numpy as np
 
 from PyRoute.Allies.AllyGen import AllyGen
+from PyRoute.Allies.BorderCache import BorderCache
 from PyRoute.Allies.Borders import Borders
 from PyRoute.AreaItems.AreaItem import AreaItem
 from PyRoute.AreaItems.Allegiance import Allegiance
@@ -28,7 +30,9 @@ from PyRoute.Calculation.OwnedWorldCalculation import OwnedWorldCalculation
 from PyRoute.Calculation.NoneCalculation import NoneCalculation
 from PyRoute.Calculation.XRouteCalculation import XRouteCalculation
 from PyRoute.DataClasses.ReadSectorOptions import ReadSectorOptions
+from PyRoute.Inputs.DerivedValues import DerivedValues
 from PyRoute.Pathfinding.RouteLandmarkGraph import RouteLandmarkGraph
+from PyRoute.Position.Hex import HexPos
 
 
 class Galaxy(AreaItem):
@@ -52,7 +56,12 @@ class Galaxy(AreaItem):
         self.historic_costs = None
         self.big_component = None
         self.star_mapping = dict()
+        # Axial (q, r) position -> star index, for O(1) spatial lookups
+        self.hex_index: dict[HexPos, int] = dict()
         self.trade = None
+        # Consistency check level - 'none', 'load' (once per object, straight after parsing) or 'full'
+        self.validate = 'full'
+        self.validated = False
 
     # For the JSONPickel work
     def __getstate__(self):
@@ -64,6 +73,9 @@ class Galaxy(AreaItem):
         del state['trade']
         del state['sectors']
         del state['alg_sorted']
+        del state['hex_index']
+        del state['validate']
+        del state['validated']
         return state
 
     # def read_sectors(self, sectors, pop_code, ru_calc,
@@ -79,38 +91,52 @@ class Galaxy(AreaItem):
         pop_code = options.pop_code
         ru_calc = options.ru_calc
         fix_pop = options.fix_pop
+        self.validate = options.validate
+        self.validated = False
         self._set_trade_object(route_reuse, trade_choice, route_btn, mp_threads, debug_flag)
+        self.trade.pathfinding_memory = options.pathfinding_memory
+        self.trade.forest_float32 = options.pathfinding_float32
+        self.trade.mp_threads = mp_threads
         star_counter = 0
         loaded_sectors: set[str] = set()
         from PyRoute.Inputs.ParseStarInput import ParseStarInput
         ParseStarInput.deep_space = {} if not isinstance(options.deep_space, dict) else options.deep_space
         logger = self.logger
-        for sector in sectors:
-            headers, starlines = ParseSectorInput.read_sector_file(sector, logger)
-
-            if 0 == len(headers):
-                continue
-
-            sec, raw_counter = ParseSectorInput.read_parsed_sector_to_sector_object(fix_pop, headers, loaded_sectors,
-                                                                                    logger, pop_code, ru_calc, sector,
-                                                                                    star_counter, starlines, self)
-            if sec is None:
-                continue
-            star_counter = raw_counter
-            self.sectors[sec.name] = sec
-            self.logger.info("Sector {} loaded {} worlds".format(sec, len(sec.worlds)))
+        loaded_stars: list[Star] = []
+        ParseStarInput.defer_derived_values = True
+        try:
+            for sector in sectors:
+                sec, raw_counter = ParseSectorInput.stream_sector_file_to_sector_object(fix_pop, loaded_sectors,
+                                                                                        logger, pop_code, ru_calc,
+                                                                                        sector, star_counter, self,
+                                                                                        options.chunk_size)
+                if sec is None:
+                    continue
+                star_counter = raw_counter
+                self.sectors[sec.name] = sec
+                loaded_stars.extend(sec.worlds)
+                self.logger.info("Sector {} loaded {} worlds".format(sec, len(sec.worlds)))
+        finally:
+            ParseStarInput.defer_derived_values = False
+            ParseStarInput.clear_interned()
+        DerivedValues.calculate(loaded_stars, pop_code, ru_calc)
 
         self.set_bounding_sectors()
         self.set_bounding_subsectors()
         self.set_positions()
         self.logger.debug("Allegiances: {}".format(self.alg.keys()))
+        if 'load' == self.validate:
+            # Each star was checked as it was added, so only check the galaxy-wide items, then record the result
+            self._check_well_formed(check_stars=False)
+            self.validated = True
 
     def add_star_to_galaxy(self, star: Star, star_counter: int, sec: Sector) -> int:
         assert star not in sec.worlds, "Star " + str(star) + " duplicated in sector " + str(sec)
         star.index = star_counter
         self.star_mapping[star.index] = star
+        self.hex_index.setdefault(star.hex_position, star.index)
 
-        sec.worlds.append(star)
+        sec.add_world(star)
         sec.subsectors[star.subsector()].worlds.append(star)
         star.alg_base_code = AllyGen.same_align(star.alg_code)
 
@@ -121,9 +147,51 @@ class Galaxy(AreaItem):
         star.tradeCode.sophont_list.append("{}A".format(self.alg[star.alg_code].population))
         star.is_redzone = self.trade.unilateral_filter(star)
         star.allegiance_base = self.alg[star.alg_base_code]
-        star.is_well_formed()
+        if 'none' != self.validate:
+            star.is_well_formed()
         return star_counter + 1
 
+    def remove_star_from_galaxy(self, star: Star) -> None:
+        """
+        Undo add_star_to_galaxy for a star, before routes are generated
+        """
+        sec = star.sector
+        sec.remove_world(star)
+        sec.subsectors[star.subsector()].worlds.remove(star)
+        for area in [self, sec, sec.subsectors[star.subsector()]]:
+            for code in {star.alg_base_code, star.alg_code}:
+                if code in area.alg and star in area.alg[code].worlds:
+                    area.alg[code].worlds.remove(star)
+
+        del self.star_mapping[star.index]
+        if self.hex_index.get(star.hex_position, None) == star.index:
+            del self.hex_index[star.hex_position]
+            for other in self.star_mapping.values():
+                if other.hex_position == star.hex_position:
+                    self.hex_index[star.hex_position] = other.index
+                    break
+        if star.index in self.stars:
+            self.stars.remove_node(star.index)
+        if star in self.ranges:
+            self.ranges.remove_node(star)
+
+    def star_at(self, hex_pos: HexPos) -> Optional[Star]:
+        index = self.hex_index.get(hex_pos, None)
+        return None if index is None else self.star_mapping[index]
+
+    def stars_within(self, hex_pos: HexPos, radius: int) -> list[Star]:
+        """
+        Stars no more than radius parsecs from hex_pos, found by walking the hexes around it rather than every star
+        """
+        found = []
+        q, r = hex_pos
+        for dq in range(-radius, radius + 1):
+            for dr in range(max(-radius, -dq - radius), min(radius, -dq + radius) + 1):
+                index = self.hex_index.get((q + dq, r + dr), None)
+                if index is not None:
+                    found.append(self.star_mapping[index])
+        return found
+
     def set_area_alg(self, star, area, algs: dict) -> None:
         full_alg = algs.get(star.alg_code, Allegiance(star.alg_code, 'Unknown Allegiance'))
         base_alg = algs.get(star.alg_base_code, Allegiance(star.alg_base_code, 'Unknown Allegiance', base=True))
@@ -189,14 +257,28 @@ class Galaxy(AreaItem):
         elif routes == 'none':
             self.trade = NoneCalculation(self)
 
-    def set_borders(self, border_gen, match, enforce: bool = True) -> None:
+    def set_borders(self, border_gen, match, enforce: bool = True, mp_threads: int = 1,
+                    cache_dir: Optional[str] = None) -> None:
         self.logger.info('setting borders...')
+        cache = None
+        if cache_dir is not None and border_gen in ['range', 'allygen', 'erode', 'erode-raster']:
+            cache = BorderCache(cache_dir)
+            digest = cache.digest(self, border_gen, match, enforce)
+            if cache.load(digest, self.borders):
+                self.logger.info('borders loaded from cache')
+                return
+
         if border_gen == 'range':
             self.borders.create_borders(match, enforce)
         elif border_gen == 'allygen':
             self.borders.create_ally_map(match, enforce)
         elif border_gen == 'erode':
             self.borders.create_erode_border(match, enforce)
+        elif border_gen == 'erode-raster':
+            self.borders.create_erode_border(match, enforce, raster=True, mp_threads=mp_threads)
+
+        if cache is not None:
+            cache.save(digest, self.borders)
 
     def write_routes(self, routes=None) -> None:
         path = os.path.join(self.output_path, 'ranges.txt')
@@ -275,7 +357,7 @@ class Galaxy(AreaItem):
                     continue
                 neighbours = [self.star_mapping[item] for item in self.stars.neighbors(world)]
                 ownedBy = [star for star in neighbours if star.tl >= 9 and star.popCode >= 6 and star.port in 'ABC'
-                           and star.ownedBy == star and AllyGen.are_owned_allies(star.alg_code, worldstar.alg_code)]
+                           and star.ownedBy == star and AllyGen.owned_alliance_matrix[star.alg_id, worldstar.alg_id]]
 
                 ownedBy.sort(reverse=True,
                              key=lambda star: star.popCode)
@@ -332,6 +414,11 @@ class Galaxy(AreaItem):
                 worldstar.ownedBy = (owner, ownedBy[0:4])
 
     def is_well_formed(self) -> None:  # type: ignore
+        if 'none' == self.validate or self.validated:
+            return
+        self._check_well_formed()
+
+    def _check_well_formed(self, check_stars: bool = True) -> None:
         for item in self.sectors:
             sector = self.sectors[item]
             assert isinstance(sector, Sector), "Galaxy sectors must be instance of Sector object"
@@ -346,6 +433,8 @@ class Galaxy(AreaItem):
         result, msg = self._check_allegiance_counts_well_formed()
         assert result, msg
 
+        if not check_stars:
+            return
         for item in self.stars.nodes:
             assert isinstance(item, int), "Star nodes must be integers"
             assert 'star' in self.stars.nodes[item], "Star attribute not set for item " + str(item)
@@ -362,6 +451,16 @@ class Galaxy(AreaItem):
 
         return raw
 
+    def trade_code_flags(self) -> np.ndarray:
+        """
+        Column of every world's trade code flags (see TradeCodes.flags), indexed by star index, for vectorised checks
+        """
+        size = max(self.star_mapping) + 1 if self.star_mapping else 0
+        flags = np.zeros(size, dtype=np.int64)
+        for index, star in self.star_mapping.items():
+            flags[index] = star.tradeCode.flags
+        return flags
+
     def route_cost(self, route) -> float:
         """
         Given a route, return its total cost _at the moment_
@@ -55,6 +55,9 @@ class Sector(AreaItem):
         self.coreward = None
         self.rimward = None
         self.filename = None
+        # Position -> world lookup for find_world_by_pos, along with how many of self.worlds it covers
+        self._world_index: dict[str, Star] = {}
+        self._indexed_worlds = 0
 
     # For the JSONPickel work
     def __getstate__(self):
@@ -64,6 +67,8 @@ class Sector(AreaItem):
         del state['coreward']
         del state['rimward']
         del state['alg_sorted']
+        del state['_world_index']
+        del state['_indexed_worlds']
         return state
 
     def __str__(self):
@@ -81,10 +86,41 @@ class Sector(AreaItem):
         return self.name.removesuffix(' Sector').removesuffix('Sector').strip()
 
     def find_world_by_pos(self, pos) -> Optional[Star]:
+        # Worlds appended straight onto self.worlds, rather than via add_world, show up as a length mismatch
+        if self._indexed_worlds != len(self.worlds):
+            self._reindex_worlds()
+        world = self._world_index.get(pos, None)
+        if world is not None and world.position != pos:
+            self._reindex_worlds()
+            world = self._world_index.get(pos, None)
+        return world
+
+    def add_world(self, star: Star) -> None:
+        in_sync = self._indexed_worlds == len(self.worlds)
+        self.worlds.append(star)
+        if in_sync:
+            self._world_index.setdefault(star.position, star)
+            self._indexed_worlds += 1
+
+    def remove_world(self, star: Star) -> None:
+        in_sync = self._indexed_worlds == len(self.worlds)
+        self.worlds.remove(star)
+        if not in_sync:
+            return
+        self._indexed_worlds -= 1
+        if self._world_index.get(star.position, None) is star:
+            del self._world_index[star.position]
+            # If another world shares the removed one's position, it now answers lookups for that position
+            for world in self.worlds:
+                if world.position == star.position:
+                    self._world_index[star.position] = world
+                    break
+
+    def _reindex_worlds(self) -> None:
+        self._world_index = {}
         for world in self.worlds:
-            if world.position == pos:
-                return world
-        return None
+            self._world_index.setdefault(world.position, world)
+        self._indexed_worlds = len(self.worlds)
 
     def is_well_formed(self) -> tuple[bool, str]:
         # check name
@@ -40,7 +40,7 @@ class CommCalculation(RouteCalculation):
         self.min_importance = 4
 
     def base_route_filter(self, star, neighbor) -> bool:
-        return not AllyGen.are_allies(star.alg_code, neighbor.alg_code)
+        return not AllyGen.alliance_matrix[star.alg_id, neighbor.alg_id]
 
     def base_range_routes(self, star, neighbor) -> Optional[int]:
         if not getattr(self.galaxy.alg[star.alg_base_code], 'min_importance', False):
@@ -144,7 +144,8 @@ class CommCalculation(RouteCalculation):
         # Feed the landmarks in as roots of their respective shortest-path trees.
         # This sets up the approximate-shortest-path bounds to be during the first pathfinding call.
         self.shortest_path_tree = ApproximateShortestPathForestUnified(source.index, self.galaxy.stars, self.epsilon,
-                                                                       sources=None if 0 == len(landmarks) else landmarks)
+                                                                       sources=None if 0 == len(landmarks) else landmarks,
+                                                                       float32=self.forest_float32)
 
         self.logger.info('sorting routes...')
         routes = [(s, n, d) for (s, n, d) in self.galaxy.ranges.edges(data=True)]
@@ -22,11 +22,14 @@ class OwnedWorldCalculation(RouteCalculation):
         pass
 
     def base_route_filter(self, star, neighbor) -> bool:
-        return not AllyGen.are_owned_allies(star.alg_code, neighbor.alg_code)
+        return not AllyGen.owned_alliance_matrix[star.alg_id, neighbor.alg_id]
 
     def base_range_routes(self, star, neighbor) -> int:
         return star.distance(neighbor)
 
+    def _raw_ranges(self):
+        return self._raw_ranges_within_jump()
+
     def route_weight(self, star, target) -> float:
         dist = star.distance(target)
         weight = self.distance_weight[dist]
@@ -16,6 +16,7 @@ import networkx as nx
 from PyRoute.Allies.AllyGen import AllyGen
 from PyRoute.Pathfinding.DistanceGraph import DistanceGraph
 from PyRoute.Pathfinding.LandmarkSchemes.LandmarksTriaxialExtremes import LandmarksTriaxialExtremes
+from PyRoute.TradeCodes import TradeCodes
 
 
 class RouteCalculation(object):
@@ -48,6 +49,13 @@ class RouteCalculation(object):
         self.shortest_path_tree = None
         self.star_graph = None
 
+        # Pathfinding memory budget, in MiB, for landmark forest storage - None means no budget
+        self.pathfinding_memory = None
+        # Store landmark forest distance labels as float32 rather than float64
+        self.forest_float32 = False
+        # Number of processes available to parallelisable setup work, such as landmark selection
+        self.mp_threads = 1
+
     def generate_routes(self) -> None:
         raise NotImplementedError("Base Class")
 
@@ -112,6 +120,30 @@ class RouteCalculation(object):
                       not star.is_redzone and not neighbour.is_redzone)
         return raw_ranges
 
+    def _raw_ranges_within_jump(self):
+        """
+        The pairs _raw_ranges would give that are within jump range, found through the galaxy's hex index rather
+        than by checking every pair, and in the same order.  Only for calculations whose base_route_filter and
+        base_range_routes have no side effects, as pairs further apart are never offered to them.
+        """
+        stars = list(self.galaxy.ranges)
+        if len(self.galaxy.hex_index) != len(stars):
+            # Some worlds share a hex, so the hex index can't stand in for checking every pair
+            yield from RouteCalculation._raw_ranges(self)
+            return
+
+        max_range = self.galaxy.max_jump_range
+        order = {star: i for i, star in enumerate(stars)}
+        for star in stars:
+            if star.is_redzone:
+                continue
+            star_order = order[star]
+            nearby = [item for item in self.galaxy.stars_within(star.hex_position, max_range)
+                      if order.get(item, -1) > star_order and not item.is_redzone]
+            nearby.sort(key=order.__getitem__)
+            for neighbour in nearby:
+                yield star, neighbour
+
     def check_existing_routes(self, star, neighbor) -> None:
         for route in star.routes:
             route_des = route[3:] if len(route) == 7 else route[8:]
@@ -128,14 +160,14 @@ class RouteCalculation(object):
         WTNs plus a modifier for types, minus a modifier for distance.
         """
         btn = star1.wtn + star2.wtn
-        code1 = star1.tradeCode
-        code2 = star2.tradeCode
-        if code1.agricultural or code2.agricultural:
-            btn += 1 if code1.match_ag_codes(code2) else 0
-        if code1.industrial or code2.industrial:
-            btn += 1 if code1.match_in_codes(code2) else 0
-
-        if not AllyGen.are_allies(star1.alg_code, star2.alg_code):
+        flags1 = star1.tradeCode.flags
+        flags2 = star2.tradeCode.flags
+        if TradeCodes.match_ag_flags(flags1, flags2):
+            btn += 1
+        if TradeCodes.match_in_flags(flags1, flags2):
+            btn += 1
+
+        if not AllyGen.alliance_matrix[star1.alg_id, star2.alg_id]:
             btn -= 1
 
             if star1.alg_code == 'Wild' or star2.alg_code == 'Wild':
@@ -6,6 +6,7 @@ Created on Mar 15, 2014
 import functools
 import itertools
 import math
+from collections import defaultdict
 from typing import Optional
 
 import numpy as np
@@ -98,6 +99,17 @@ class TradeCalculation(RouteCalculation):
         self.penumbra_routes = 0
 
         self.shortest_path_tree = None
+
+        # Cache of previously-committed (historic) route costs, keyed by ordered endpoint-index pair.  Each entry is a
+        # (version, cost) tuple - lightening an edge on a historic route bumps that route's version, which stales the
+        # cached cost.  This turns the reheat step in _preheat_upper_bound into a lookup for most historic routes.
+        self.historic_route_costs = dict()
+        self.historic_route_versions = defaultdict(int)
+        # Map each ordered star-graph edge to the set of historic routes that traverse it
+        self.historic_edge_routes = defaultdict(set)
+        self.historic_cost_lookups = 0
+        self.historic_cost_hits = 0
+
         # Track inter-sector passenger imbalances
         self.sector_passenger_balance = TradeBalance(stat_field="passengers", region=galaxy)
         # Track inter-sector trade imbalances
@@ -114,6 +126,12 @@ class TradeCalculation(RouteCalculation):
         self.allegiance_trade_volume_balance = TradeBalance(stat_field="tradeDtonExt", region=galaxy, field="alg",
                                                      star_field="allegiance_base", target_property="code")
 
+        # Running sector and allegiance passenger, trade and trade volume totals, less what the balances above have
+        # credited, kept up to date by update_statistics.  This lets the periodic cross checks during route
+        # calculation compare counters instead of re-summing every sector and allegiance.  None until a full
+        # cross check seeds them.
+        self.region_totals: Optional[dict[str, int]] = None
+
     def base_route_filter(self, star, neighbor) -> bool:
         # by the time we've _reached_ here, we're assuming generate_base_routes() has handled the unilateral filtering
         # - in this case, red/forbidden zones and barren systems - so only bilateral filtering remains.
@@ -212,6 +230,8 @@ class TradeCalculation(RouteCalculation):
         for the lower routes to follow.
         """
         self.logger.info('sorting routes...')
+        # Sector and allegiance stats may have changed since the last cross check
+        self.region_totals = None
         # Filter out pathfinding attempts that can never return a route, as they're between two different
         # connected components in the underlying galaxy.stars graph - such pathfinding attempts are doomed
         # to failure.
@@ -250,7 +270,8 @@ class TradeCalculation(RouteCalculation):
         # Feed the landmarks in as roots of their respective shortest-path trees.
         # This sets up the approximate-shortest-path bounds to be during the first pathfinding call.
         self.shortest_path_tree = ApproximateShortestPathForestUnified(source.index, self.galaxy.stars,
-                                                                             self.epsilon, sources=landmarks)
+                                                                             self.epsilon, sources=landmarks,
+                                                                             float32=self.forest_float32)
         self.star_len_root = max(1, math.floor(math.sqrt(len(self.star_graph))) // 2)
 
         base_btn = 0  # pragma: no mutate
@@ -304,6 +325,8 @@ class TradeCalculation(RouteCalculation):
             self.logger.info('Total f-exhausted nodes {}'.format(total_f_exhausted))
             self.logger.info('Total target-exhausted nodes {}'.format(total_targ_exhausted))
             self.logger.info('Total un-exhausted nodes {}'.format(total_un_exhausted))
+            self.logger.info('Historic route cost cache hit rate {}% ({} hits out of {} lookups)'.
+                             format(self.historic_cost_hit_rate, self.historic_cost_hits, self.historic_cost_lookups))
 
     def get_trade_between(self, star, target) -> None:
         """
@@ -409,7 +432,7 @@ class TradeCalculation(RouteCalculation):
 
                         # The 0.5% bump is to _ensure_ the newcost remains an _upper_ bound
                         # on the historic-route cost
-                        newcost = self.galaxy.route_cost(edge['route']) * 1.005
+                        newcost = self.historic_route_cost(pair[0], pair[1], edge['route']) * 1.005
                         if edge['weight'] > newcost:
                             edge['weight'] = newcost
                             self.galaxy.historic_costs.lighten_edge(pair[0], pair[1], newcost)
@@ -418,6 +441,44 @@ class TradeCalculation(RouteCalculation):
 
         return upbound
 
+    def historic_route_cost(self, stardex, targdex, route) -> float:
+        """
+        Given the endpoints of a committed historic route and that route, return its total cost _at the moment_,
+        reusing the cached value if no edge on the route has been lightened since it was last costed.
+        """
+        key = (stardex, targdex) if stardex <= targdex else (targdex, stardex)
+        version = self.historic_route_versions[key]
+        self.historic_cost_lookups += 1
+        cached = self.historic_route_costs.get(key, None)
+        if cached is not None and cached[0] == version:
+            self.historic_cost_hits += 1
+            return cached[1]
+
+        cost = self.galaxy.route_cost(route)
+        self.historic_route_costs[key] = (version, cost)
+        return cost
+
+    @property
+    def historic_cost_hit_rate(self) -> float:
+        if 0 == self.historic_cost_lookups:
+            return 0.0
+        return round(100 * self.historic_cost_hits / self.historic_cost_lookups, 2)
+
+    def _register_historic_route(self, route) -> None:
+        stardex = route[0].index
+        targdex = route[-1].index
+        key = (stardex, targdex) if stardex <= targdex else (targdex, stardex)
+        start = route[0]
+        for end in route[1:]:
+            edge = (start.index, end.index) if start.index <= end.index else (end.index, start.index)
+            self.historic_edge_routes[edge].add(key)
+            start = end
+
+    def _invalidate_historic_routes(self, u, v) -> None:
+        edge = (u, v) if u <= v else (v, u)
+        for key in self.historic_edge_routes.get(edge, ()):
+            self.historic_route_versions[key] += 1
+
     def update_statistics(self, star, target, tradeCr, tradePass, tradeDton=0) -> None:
         if star.sector != target.sector:
             star.sector.stats.tradeExt += tradeCr // 2
@@ -446,15 +507,17 @@ class TradeCalculation(RouteCalculation):
                 target.sector.subsectors[target.subsector()].stats.tradeExt += tradeCr // 2
                 star.sector.subsectors[star.subsector()].stats.tradeDtonExt += tradeDton // 2
                 target.sector.subsectors[target.subsector()].stats.tradeDtonExt += tradeDton // 2
-        starcode = AllyGen.same_align(star.alg_code)
-        targcode = AllyGen.same_align(target.alg_code)
+        star_base_id = AllyGen.same_align_ids[star.alg_id]
+        targ_base_id = AllyGen.same_align_ids[target.alg_id]
+        starcode = AllyGen.alg_id_codes[star_base_id]
+        targcode = AllyGen.alg_id_codes[targ_base_id]
         # By definition, _any_ nonalighed system is _not_ allied to anything - even nonaligned systems of the same
         # allegiance code (eg NaVa, NaHu, etc).  As we're tracking allegiance-level imbalances, we can't just _ignore_
         # odd passengers/trade units.  The simplest way around this is to directly add the odd unit in to that
         # allegiance's tradeExt or passenger totals, as needed.
-        double_up = AllyGen.is_nonaligned(starcode) and (starcode == targcode)
+        double_up = AllyGen.nonaligned_ids[star_base_id] and (star_base_id == targ_base_id)
 
-        if AllyGen.are_allies(star.alg_code, target.alg_code):
+        if AllyGen.alliance_matrix[star.alg_id, target.alg_id]:
             self.galaxy.alg[starcode].stats.trade += tradeCr
             self.galaxy.alg[starcode].stats.passengers += tradePass
             self.galaxy.alg[starcode].stats.tradeDton += tradeDton
@@ -485,9 +548,33 @@ class TradeCalculation(RouteCalculation):
         self.galaxy.stats.passengers += tradePass
         self.galaxy.stats.tradeDton += tradeDton
 
+        totals = self.region_totals
+        if totals is not None:
+            # Odd units across sectors or allegiances go to the balances, which count what they credit themselves
+            if star.sector != target.sector:
+                totals['sector_pax'] += tradePass - (tradePass & 1)
+                totals['sector_trade'] += tradeCr - (tradeCr & 1)
+                totals['sector_volume'] += tradeDton - (tradeDton & 1)
+            else:
+                totals['sector_pax'] += tradePass
+                totals['sector_trade'] += tradeCr
+                totals['sector_volume'] += tradeDton
+            if double_up or AllyGen.alliance_matrix[star.alg_id, target.alg_id]:
+                totals['allegiance_pax'] += tradePass
+                totals['allegiance_trade'] += tradeCr
+                totals['allegiance_volume'] += tradeDton
+            else:
+                totals['allegiance_pax'] += tradePass - (tradePass & 1)
+                totals['allegiance_trade'] += tradeCr - (tradeCr & 1)
+                totals['allegiance_volume'] += tradeDton - (tradeDton & 1)
+
         try:
             if 0 == (star.index + target.index) % (self.star_len_root):
-                self.cross_check_totals()
+                # Debug runs re-sum every sector and allegiance each time, which also checks the running totals
+                if self.debug_flag or totals is None:
+                    self.cross_check_totals()
+                else:
+                    self._check_totals(self._running_totals())
         except AssertionError as e:
             msg = str(star.name) + "-" + str(target.name) + ": " + str(e)
             raise AssertionError(msg)
@@ -521,6 +608,7 @@ class TradeCalculation(RouteCalculation):
             self.galaxy.stars.add_edge(source.index, target.index, distance=distance, weight=cost, trade=0, btn=0,
                                        count=0, exhaust=0, route=route)
             self.galaxy.historic_costs.add_edge(source.index, target.index, cost)
+            self._register_historic_route(route)
 
         # Gather basic statistics.
         tradeBTN = self.get_btn(source, target, distance)
@@ -548,6 +636,7 @@ class TradeCalculation(RouteCalculation):
                 data['weight'] -= (data['weight'] - data['distance']) / self.route_reuse
                 self.star_graph.lighten_edge(start.index, end.index, data['weight'])
                 self.shortest_path_tree.lighten_edge(start.index, end.index, data['weight'])
+                self._invalidate_historic_routes(start.index, end.index)
                 # Edge can only trip an update if it's not exhausted
                 edges.append((start.index, end.index))
                 data['count'] += 1
@@ -631,23 +720,62 @@ class TradeCalculation(RouteCalculation):
         self.sector_trade_volume_balance.multilateral_balance()
         self.allegiance_trade_volume_balance.multilateral_balance()
 
+    def _region_balances(self) -> dict[str, TradeBalance]:
+        return {
+            'sector_pax': self.sector_passenger_balance,
+            'sector_trade': self.sector_trade_balance,
+            'sector_volume': self.sector_trade_volume_balance,
+            'allegiance_pax': self.allegiance_passenger_balance,
+            'allegiance_trade': self.allegiance_trade_balance,
+            'allegiance_volume': self.allegiance_trade_volume_balance
+        }
+
+    def _summed_totals(self) -> dict[str, int]:
+        """
+        Sector and allegiance passenger, trade and trade volume totals, summed from every sector and allegiance.
+        """
+        sectors = self.galaxy.sectors.values()
+        base_allegiances = {AllyGen.same_align(item) for item in self.galaxy.alg}
+        allegiances = [self.galaxy.alg[item] for item in base_allegiances]
+
+        return {
+            'sector_pax': sum([item.stats.passengers for item in sectors]),
+            'sector_trade': sum([item.stats.trade + item.stats.tradeExt for item in sectors]),
+            'sector_volume': sum([item.stats.tradeDton + item.stats.tradeDtonExt for item in sectors]),
+            'allegiance_pax': sum([item.stats.passengers for item in allegiances]),
+            'allegiance_trade': sum([item.stats.trade + item.stats.tradeExt for item in allegiances]),
+            'allegiance_volume': sum([item.stats.tradeDton + item.stats.tradeDtonExt for item in allegiances])
+        }
+
+    def _running_totals(self) -> dict[str, int]:
+        """
+        Sector and allegiance passenger, trade and trade volume totals, from the running totals.
+        """
+        assert self.region_totals is not None, "Running totals not yet seeded"
+        balances = self._region_balances()
+        return {key: value + balances[key].credited for key, value in self.region_totals.items()}
+
     def cross_check_totals(self) -> None:
+        totals = self._summed_totals()
+        if self.debug_flag and self.region_totals is not None:
+            assert totals == self._running_totals(), "Running totals not in step with sector and allegiance totals"
+        self._check_totals(totals)
+
+        # Pick up the running totals from here
+        balances = self._region_balances()
+        self.region_totals = {key: value - balances[key].credited for key, value in totals.items()}
+
+    def _check_totals(self, totals: dict[str, int]) -> None:
         grand_total_pax = self.galaxy.stats.passengers
         grand_total_trade = self.galaxy.stats.trade
         grand_total_volume = self.galaxy.stats.tradeDton
 
-        total_sector_pax = sum([item.stats.passengers for item in self.galaxy.sectors.values()])
-        total_sector_trade = sum([item.stats.trade + item.stats.tradeExt for item in self.galaxy.sectors.values()])
-        total_sector_volume = sum([item.stats.tradeDton + item.stats.tradeDtonExt
-                                   for item in self.galaxy.sectors.values()])
-
-        base_allegiances = {AllyGen.same_align(item) for item in self.galaxy.alg}
-
-        total_allegiance_pax = sum([self.galaxy.alg[item].stats.passengers for item in base_allegiances])
-        total_allegiance_trade = sum([self.galaxy.alg[item].stats.trade + self.galaxy.alg[item].stats.tradeExt
-                                      for item in base_allegiances])
-        total_allegiance_volume = sum([self.galaxy.alg[item].stats.tradeDton + self.galaxy.alg[item].stats.tradeDtonExt
-                                      for item in base_allegiances])
+        total_sector_pax = totals['sector_pax']
+        total_sector_trade = totals['sector_trade']
+        total_sector_volume = totals['sector_volume']
+        total_allegiance_pax = totals['allegiance_pax']
+        total_allegiance_trade = totals['allegiance_trade']
+        total_allegiance_volume = totals['allegiance_volume']
 
         assert grand_total_pax == total_sector_pax + self.sector_passenger_balance.sum, "Sector total pax not balanced with galaxy pax"
         assert grand_total_trade == total_sector_trade + self.sector_trade_balance.sum, "Sector total trade not balanced with galaxy trade"
@@ -3,6 +3,8 @@
 """
 import math
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 import networkx as nx
 from networkx import is_path
@@ -20,13 +22,13 @@ except ImportError:
 except AttributeError:
     from PyRoute.Pathfinding.ApproximateShortestPathForestUnifiedFallback import ApproximateShortestPathForestUnified  # type: ignore
 try:
-    from PyRoute.Pathfinding.astar_numpy import astar_path_numpy
+    from PyRoute.Pathfinding.astar_numpy import astar_path_numpy, astar_path_csr
 except ModuleNotFoundError:
-    from PyRoute.Pathfinding.astar_numpy_fallback import astar_path_numpy
+    from PyRoute.Pathfinding.astar_numpy_fallback import astar_path_numpy, astar_path_csr
 except ImportError:
-    from PyRoute.Pathfinding.astar_numpy_fallback import astar_path_numpy
+    from PyRoute.Pathfinding.astar_numpy_fallback import astar_path_numpy, astar_path_csr
 except AttributeError:
-    from PyRoute.Pathfinding.astar_numpy_fallback import astar_path_numpy
+    from PyRoute.Pathfinding.astar_numpy_fallback import astar_path_numpy, astar_path_csr
 
 # Convert the TradeMPCalculation to a global variable to allow the child processes to access it, and all the data.
 tradeCalculation = None
@@ -91,37 +93,6 @@ def intrasector_process(working_queue, processed_queue) -> None:
     tradeCalculation.logger.info(f"child process {os.getpid()} completed.")
 
 
-def long_route_process(working_queue, processed_queue) -> None:
-    global tradeCalculation
-    assert isinstance(tradeCalculation, TradeMPCalculation), "Global tradeCalculation instance not TradeMPCalculation"
-    processed = 0
-    total = working_queue.qsize()
-
-    # Working queue here is sending a pair of star indexes to process.
-    while True:
-        try:
-            (star, neighbor) = working_queue.get(block=True, timeout=1)
-        except Empty:
-            break
-
-        try:
-            upbound = tradeCalculation._preheat_upper_bound(star, neighbor)
-
-            rawroute, _ = astar_path_numpy(tradeCalculation.star_graph, star, neighbor,
-                                       tradeCalculation.galaxy.heuristic_distance_bulk, upbound=upbound)
-        except nx.NetworkXNoPath:
-            continue
-
-        # Route is a list of star indexes, which is what the parent process is assuming.
-        processed_queue.put(rawroute)
-        processed += 1
-        if total > 100 and processed % (total // 20) == 0:
-            tradeCalculation.logger.info(f'Child {os.getpid()} processed {processed} routes, at {processed // (total // 100)}%')
-
-    # And were done. Note this for the user.
-    tradeCalculation.logger.info(f"child process {os.getpid()} completed, processed {processed} routes")
-
-
 class TradeMPCalculation(TradeCalculation):
     """
     Perform the trade calculations by generating the routes
@@ -142,6 +113,8 @@ class TradeMPCalculation(TradeCalculation):
         for the lower routes to follow.
         """
         self.logger.info('sorting routes...')
+        # Sector and allegiance stats may have changed since the last cross check
+        self.region_totals = None
 
         # Filter out pathfinding attempts that can never return a route, as they're between two different
         # connected components in the underlying galaxy.stars graph - such pathfinding attempts are doomed
@@ -163,7 +136,8 @@ class TradeMPCalculation(TradeCalculation):
         source.is_landmark = True
         # Feed the landmarks in as roots of their respective shortest-path trees.
         # This sets up the approximate-shortest-path bounds to be during the first pathfinding call.
-        self.shortest_path_tree = ApproximateShortestPathForestUnified(source.index, self.galaxy.stars, self.epsilon, sources=landmarks)
+        self.shortest_path_tree = ApproximateShortestPathForestUnified(source.index, self.galaxy.stars, self.epsilon,
+                                                                       sources=landmarks, float32=self.forest_float32)
         self.star_graph = DistanceGraph(self.galaxy.stars)
         self.star_len_root = max(1, math.floor(math.sqrt(len(self.star_graph))) // 2)
 
@@ -235,56 +209,67 @@ class TradeMPCalculation(TradeCalculation):
     def process_long_routes(self, btn) -> None:
 
         self.shortest_path_tree = ApproximateShortestPathForestUnified(0, self.galaxy.stars,
-                                             0, sources=self.shortest_path_tree.sources)
+                                             0, sources=self.shortest_path_tree.sources, float32=self.forest_float32)
 
-        # Create the Queues for sending data between processes.
-        find_queue: Queue[tuple[int, int]] = Queue()
-        routes_queue: Queue[tuple[int, int]] = Queue()
+        # skip the routes already that have been processed, in the intra-sector processing
+        pairs = [(start.index, target.index) for (start, target, data) in btn if not data.get('jumps', False)]
+        total = len(pairs)
         processed = 0
 
-        for (start, target, data) in btn:
-            # skip the routes already that have been processed, in the intra-sector processing
-            if data.get('jumps', False):
-                continue
-            find_queue.put((start.index, target.index))
-
-        total = find_queue.qsize()
-        self.logger.info(f"Starting {self.mp_threads} child processes for long route calculations. processing {total} routes")
+        # Long routes are applied without reweighting, so neither the star graph nor the forest change for the rest of
+        # this pass.  All worker threads can thus share one read-only snapshot of the graph, and run their searches
+        # with the GIL released.
+        csr = self.star_graph.csr()
+        threads = max(1, self.mp_threads)
+        self.logger.info(f"Starting {threads} threads for long route calculations. processing {total} routes")
+
+        # Upper bounds are preheated here, in submission order, as preheating can reheat historic routes.
+        # Keeping a bounded window of searches in flight, and applying their results in submission order, keeps
+        # the outcome independent of thread scheduling.
+        pending: deque = deque()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            for (stardex, targdex) in pairs:
+                if len(pending) >= 2 * threads:
+                    processed += self._apply_long_route(pending.popleft().result(), processed, total)
+                upbound = self._preheat_upper_bound(stardex, targdex)
+                pending.append(executor.submit(self._find_long_route, csr, stardex, targdex, upbound))
+            while pending:
+                processed += self._apply_long_route(pending.popleft().result(), processed, total)
 
-        with Pool(processes=self.mp_threads, initializer=long_route_process, initargs=(find_queue, routes_queue)):
-            # Loop over the routes found by the child processes.
-            while True:
-                try:
-                    # Get a route from the child processes. This assumes the child processes (collectively)
-                    # won't take more than 5 seconds to produce a route. And they will produce routes faster
-                    # than the parent process can consume them. Which is why we have the queue.
-                    route_list = routes_queue.get(block=True, timeout=5)
-                except Empty:
-                    if not find_queue.empty():
-                        continue
-                    break
-                route = [self.galaxy.star_mapping[item] for item in route_list]
-                assert is_path(self.galaxy.stars, route_list), f"Route returned by mp process is not a correct path: {route}"
+        self.logger.info(f"Long route processing completed. process {processed} routes")
+        self.total_processed += processed
+        self.logger.info('{} penumbra routes included out of {}'.format(self.penumbra_routes, self.total_processed))
 
-                distance = self.route_distance(route)
-                btn = self.get_btn(route[0], route[-1], distance)
-                processed += 1
-                if self.min_btn > btn:
-                    self.penumbra_routes += 1
-                    continue
+    def _find_long_route(self, csr, stardex, targdex, upbound):
+        try:
+            potentials = self.galaxy.heuristic_distance_bulk(targdex)
+            rawroute, _ = astar_path_csr(csr, stardex, targdex, potentials, upbound=upbound)
+        except nx.NetworkXNoPath:
+            return None
+        return rawroute
 
-                if total > 100 and processed % (total // 20) == 0:
-                    self.logger.info(f'processed {processed} routes, at {processed // (total // 100)}%')
+    def _apply_long_route(self, route_list, processed, total) -> int:
+        if route_list is None:
+            return 0
+        route = [self.galaxy.star_mapping[item] for item in route_list]
+        assert is_path(self.galaxy.stars, route_list), f"Route returned by worker thread is not a correct path: {route}"
 
-                # Using the route found by the child process update the stars / routes graphs in the parent process
-                start = route[0]
-                target = route[-1]
-                tradeCr, tradePass, tradeDton = self.route_update_simple(route, False)
-                self.update_statistics(start, target, tradeCr, tradePass, tradeDton)
+        distance = self.route_distance(route)
+        btn = self.get_btn(route[0], route[-1], distance)
+        if self.min_btn > btn:
+            self.penumbra_routes += 1
+            return 1
 
-        self.logger.info(f"Long route processing completed. process {processed} routes")
-        self.total_processed += processed
-        self.logger.info('{} penumbra routes included out of {}'.format(self.penumbra_routes, self.total_processed))
+        processed += 1
+        if total > 100 and processed % (total // 20) == 0:
+            self.logger.info(f'processed {processed} routes, at {processed // (total // 100)}%')
+
+        # Using the route found by the worker thread update the stars / routes graphs
+        start = route[0]
+        target = route[-1]
+        tradeCr, tradePass, tradeDton = self.route_update_simple(route, False)
+        self.update_statistics(start, target, tradeCr, tradePass, tradeDton)
+        return 1
 
     def process_routes(self, btn) -> None:
         """
@@ -47,8 +47,11 @@ class XRouteCalculation(RouteCalculation):
     def base_range_routes(self, star, neighbor) -> int:
         return star.distance(neighbor)
 
+    def _raw_ranges(self):
+        return self._raw_ranges_within_jump()
+
     def base_route_filter(self, star, neighbor) -> bool:
-        return not AllyGen.are_allies(star.alg_code, neighbor.alg_code)
+        return not AllyGen.alliance_matrix[star.alg_id, neighbor.alg_id]
 
     def generate_routes(self) -> None:
         self.distance_weight = self.capSec_weight
@@ -188,7 +191,8 @@ class XRouteCalculation(RouteCalculation):
         # Feed the landmarks in as roots of their respective shortest-path trees.
         # This sets up the approximate-shortest-path bounds to be during the first pathfinding call.
         self.shortest_path_tree = ApproximateShortestPathForestUnified(source.index, self.galaxy.stars, self.epsilon,
-                                                                       sources=None if 0 == len(landmarks) else landmarks)
+                                                                       sources=None if 0 == len(landmarks) else landmarks,
+                                                                       float32=self.forest_float32)
         self.logger.info('XRoute pass 1')
         self.routes_pass_1()
 
@@ -4,6 +4,7 @@ Created on Apr 04, 2023
 @author: CyberiaResurrection
 """
 from dataclasses import dataclass
+from typing import Optional
 
 
 @dataclass(frozen=True)
@@ -19,3 +20,7 @@ class ReadSectorOptions:
     fix_pop: bool = False
     deep_space: dict = None
     map_type: str = 'classic'
+    pathfinding_memory: Optional[int] = None
+    pathfinding_float32: bool = False
+    validate: str = 'full'
+    chunk_size: int = 1000
@@ -0,0 +1,212 @@
+"""
+Created on Oct 19, 2026
+
+@author: CyberiaResurrection
+"""
+import codecs
+import json
+import logging
+import os
+from multiprocessing import Pool
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+import numpy as np
+
+# The DataExport a process pool is writing sectors for.  Forked workers inherit it, galaxy and all, instead of having
+# the galaxy pickled across to them.
+dataExport = None
+
+
+def export_sector(name: str) -> str:
+    return dataExport.write_sector(dataExport.galaxy.sectors[name])  # type: ignore[union-attr]
+
+
+class DataExport(object):
+    """
+    Flat export of the galaxy: sectors, subsectors, allegiances, sophont populations, stars, routes and their
+    statistics, one record per line.  Each record is a JSON array, its record type followed by the values of that
+    type's fields, in the order given by schema.json.  Each sector gets its own file, holding the sector along with
+    everything in it, and each route goes with the sector of its lower-indexed end.  galaxy.records.jsonl holds the
+    galaxy-wide records, and schema.json lists the files making up the export.
+    """
+    # Bump this when a change to the record layout would break a loader written against the old one
+    version = 1
+
+    stats_fields = ('population', 'economy', 'trade', 'tradeExt', 'tradeVol', 'tradeDton', 'tradeDtonExt', 'percapita',
+                    'number', 'milBudget', 'maxTL', 'maxPort', 'maxPop', 'sum_ru', 'shipyards', 'col_be', 'im_be',
+                    'passengers', 'spa_people', 'eti_worlds', 'eti_cargo', 'eti_pass', 'TLmean', 'TLstddev',
+                    'gg_count', 'worlds', 'stars')
+
+    star_fields = ('sector', 'subsector', 'position', 'name', 'uwp', 'tradeCode', 'importance', 'economics', 'social',
+                   'nobles', 'baseCode', 'zone', 'popM', 'belts', 'ggCount', 'worlds', 'alg_code', 'alg_base_code',
+                   'stellar', 'population', 'gwp', 'perCapita', 'mspr', 'wtn', 'ru', 'budget', 'tcs_gwp',
+                   'ship_capacity', 'raw_be', 'im_be', 'col_be', 'eti_cargo', 'eti_passenger', 'eti_cargo_volume',
+                   'eti_pass_volume', 'eti_worlds', 'tradeIn', 'tradeOver', 'tradeCount', 'passIn', 'passOver',
+                   'starportSize', 'starportBudget', 'starportPop')
+
+    route_fields = ('source_sector', 'source_position', 'target_sector', 'target_position', 'distance', 'weight',
+                    'trade', 'btn', 'count', 'exhaust', 'xboat', 'comm')
+
+    # Star fields that aren't read straight off the star
+    star_getters: dict[str, Callable] = {
+        'sector': lambda star: star.sector.name,
+        'subsector': lambda star: star.subsector(),
+        'stellar': lambda star: str(star.star_list_object)
+    }
+
+    schema = {
+        'galaxy': stats_fields,
+        'sector': ('name', 'x', 'y') + stats_fields,
+        'subsector': ('sector', 'position', 'name') + stats_fields,
+        'allegiance': ('sector', 'code', 'name', 'base', 'sophont') + stats_fields,
+        'sophont': ('sector', 'subsector', 'allegiance', 'code', 'count', 'population'),
+        'star': star_fields,
+        'route': route_fields
+    }
+
+    galaxy_file = 'galaxy.records.jsonl'
+    schema_file = 'schema.json'
+
+    def __init__(self, galaxy, mp_threads: int = 1) -> None:
+        self.galaxy = galaxy
+        self.mp_threads = mp_threads
+        self.logger = logging.getLogger('PyRoute.DataExport')
+
+    @staticmethod
+    def sector_file(sector) -> str:
+        return sector.sector_name() + ' Sector.records.jsonl'
+
+    @staticmethod
+    def _value(value) -> Any:
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        if isinstance(value, np.generic):
+            return value.item()
+        return str(value)
+
+    def write(self) -> None:
+        """
+        Write the galaxy-wide records, every sector's records, and then the schema, the sectors over a process pool
+        if there are threads to spare.  Each sector is written the same way either way, so the output doesn't depend
+        on how many processes wrote it.
+        """
+        self.logger.info('Exporting galaxy data')
+        self._write_records(self.galaxy_file, self.galaxy_records())
+        self._write_sectors()
+
+        # The schema goes last, naming this run's files, so sector files left behind by an earlier export into the
+        # same directory aren't read back as part of this one
+        files = [self.galaxy_file] + [self.sector_file(sector) for sector in self.galaxy.sectors.values()]
+        self._write_lines(self.schema_file, [json.dumps({'version': self.version, 'records': self.schema,
+                                                         'files': files}, indent=2)])
+
+    def _write_sectors(self) -> None:
+        names = list(self.galaxy.sectors)
+        if 2 > self.mp_threads or 2 > len(names):
+            for name in names:
+                self.write_sector(self.galaxy.sectors[name])
+            return
+
+        global dataExport
+        dataExport = self
+        processes = min(self.mp_threads, len(names))
+        self.logger.info('Exporting {} sectors over {} processes'.format(len(names), processes))
+        try:
+            with Pool(processes=processes) as pool:
+                # One sector at a time, as sectors vary a lot in size
+                for _ in pool.imap_unordered(export_sector, names, chunksize=1):
+                    pass
+        finally:
+            dataExport = None
+
+    def write_sector(self, sector) -> str:
+        filename = self.sector_file(sector)
+        self._write_records(filename, self.sector_records(sector))
+        return filename
+
+    def _write_lines(self, filename: str, lines: Iterable[str]) -> None:
+        path = os.path.join(self.galaxy.output_path, filename)
+        # Write to one side, then move into place, so nothing ever sees a half-written file
+        with codecs.open(path + '.tmp', 'w', encoding='utf-8') as f:
+            for line in lines:
+                f.write(line)
+                f.write('\n')
+        os.replace(path + '.tmp', path)
+
+    def _write_records(self, filename: str, records: Iterable[list]) -> None:
+        self._write_lines(filename, (json.dumps(record, separators=(',', ':')) for record in records))
+
+    def galaxy_records(self) -> Iterator[list]:
+        galaxy = self.galaxy
+        yield ['galaxy'] + self._stats(galaxy.stats)
+        yield from self._sophonts(galaxy.stats, None, None, None)
+        yield from self._allegiances(galaxy.alg, None)
+
+    def sector_records(self, sector) -> Iterator[list]:
+        yield ['sector', sector.name, sector.x, sector.y] + self._stats(sector.stats)
+        yield from self._sophonts(sector.stats, sector.name, None, None)
+        for position, subsector in sector.subsectors.items():
+            yield ['subsector', sector.name, position, subsector.name] + self._stats(subsector.stats)
+            yield from self._sophonts(subsector.stats, sector.name, position, None)
+        yield from self._allegiances(sector.alg, sector.name)
+
+        for star in sector.worlds:
+            yield ['star'] + self._star(star)
+
+        stars = self.galaxy.stars
+        for star in sector.worlds:
+            if star.index not in stars:
+                continue
+            for neighbour, data in stars.adj[star.index].items():
+                if star.index < neighbour:
+                    yield ['route'] + self._route(star, self.galaxy.star_mapping[neighbour], data)
+
+    def _stats(self, stats) -> list:
+        return [self._value(stats[field]) for field in self.stats_fields]
+
+    def _sophonts(self, stats, sector: Optional[str], subsector: Optional[str],
+                  allegiance: Optional[str]) -> Iterator[list]:
+        for code, population in stats.populations.items():
+            yield ['sophont', sector, subsector, allegiance, code, population.count,
+                   self._value(population.population)]
+
+    def _allegiances(self, algs: dict, sector: Optional[str]) -> Iterator[list]:
+        for code, alg in algs.items():
+            yield ['allegiance', sector, code, alg.name, alg.base, alg.population] + self._stats(alg.stats)
+            yield from self._sophonts(alg.stats, sector, None, code)
+
+    def _star(self, star) -> list:
+        getters = self.star_getters
+        return [self._value(getters[field](star) if field in getters else star[field]) for field in self.star_fields]
+
+    def _route(self, star, neighbour, data: dict) -> list:
+        return [star.sector.name, star.position, neighbour.sector.name, neighbour.position] + \
+            [self._value(data.get(field, False if field in ('xboat', 'comm') else None))
+             for field in self.route_fields[4:]]
+
+    @staticmethod
+    def load(output_path: str, record_types: Optional[list[str]] = None) -> dict[str, list[dict]]:
+        """
+        Read an export back, as a list of records for each record type, each record a dict keyed by field name.  Only
+        the files schema.json lists are read.  Give record_types to read only those types; lines of other types are
+        skipped without being parsed.
+        """
+        with codecs.open(os.path.join(output_path, DataExport.schema_file), 'r', encoding='utf-8') as f:
+            schema = json.load(f)
+        if DataExport.version != schema['version']:
+            raise ValueError('Export version {} does not match loader version {}'.format(schema['version'],
+                                                                                          DataExport.version))
+
+        fields = schema['records']
+        wanted = list(fields) if record_types is None else record_types
+        prefixes = tuple('["{}",'.format(record_type) for record_type in wanted)
+        result: dict[str, list[dict]] = {record_type: [] for record_type in wanted}
+
+        for filename in schema['files']:
+            with codecs.open(os.path.join(output_path, filename), 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.startswith(prefixes):
+                        continue
+                    record = json.loads(line)
+                    result[record[0]].append(dict(zip(fields[record[0]], record[1:])))
+        return result
@@ -38,7 +38,8 @@ def process() -> None:
     logger.setLevel(logging.ERROR)
 
     alleg = parser.add_argument_group('Allegiance', 'Alter processing of allegiances')
-    alleg.add_argument('--borders', choices=['none', 'range', 'allygen', 'erode'], default='range',
+    alleg.add_argument('--borders', choices=['none', 'range', 'allygen', 'erode', 'erode-raster'],
+                       default='range',
                        help='Allegiance border generation, default [range]')
     alleg.add_argument('--ally-match', choices=['collapse', 'separate'], default='collapse',
                        help='Allegiance matching for borders, default [collapse]')
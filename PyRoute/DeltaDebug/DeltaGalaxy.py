@@ -50,6 +50,8 @@ class DeltaGalaxy(Galaxy):
 
             self.sectors[sec.name] = sec
             self.logger.info("Sector {} loaded {} worlds".format(sec, len(sec.worlds)))
+        from PyRoute.Inputs.ParseStarInput import ParseStarInput
+        ParseStarInput.clear_interned()
 
         self.set_bounding_sectors()
         self.set_bounding_subsectors()
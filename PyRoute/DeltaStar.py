@@ -133,6 +133,7 @@ class DeltaStar(Star):
 
     def reduce_extra_stars(self) -> None:
         if 0 < len(self.star_list):  # pragma: no mutate
+            self.star_list_object = self.star_list_object.unshared()
             self.star_list_object.stars_list = [self.star_list_object.stars_list[0]]
 
     def reduce_pbg(self) -> None:
@@ -0,0 +1,231 @@
+"""
+Created on Oct 19, 2026
+
+@author: CyberiaResurrection
+
+Bulk counterpart of Star's calculate_wtn, calculate_mspr, calculate_gwp, calculate_TCS, calculate_army, calculate_ru
+and calculate_eti.  Rather than walking each star through those methods one at a time, pull the UWP, PBG, trade code
+and importance columns out of every star at once, work the derived values out in numpy, then write them back.
+
+The scalar methods remain the reference implementation - the tables below mirror the ones in those methods, and any
+change to one needs to be made to the other.
+"""
+from typing import Optional
+
+import numpy as np
+
+from PyRoute.Allies.AllyGen import AllyGen
+from PyRoute.SystemData.Utilities import Utilities
+from PyRoute.TradeCodes import TradeCodes
+
+
+class DerivedValues(object):
+
+    # Seed for the benford population multiplier draws, so the same input gives the same output from run to run
+    benford_seed = 0
+
+    calc_gwp = np.array([220, 350, 560, 560, 560, 895, 895, 1430, 2289, 3660, 3660, 3660, 5860, 5860, 9375, 15000,
+                         24400, 24400, 39000, 39000], dtype=np.int64)
+    pop_code_m = np.array([0, 10, 13, 17, 22, 28, 36, 47, 60, 78], dtype=np.int64)
+    benford_range = np.array([0.243529203, 0.442507049, 0.610740422, 0.756470797, 0.885014099, 1])
+    tcs_gwp_base = np.array([2, 4, 6, 8, 10, 12, 14, 16, 18, 20, 22, 24, 28, 32], dtype=np.int64)
+    transfer_rate = {'A': 1.0, 'B': 0.95, 'C': 0.9, 'D': 0.85, 'E': 0.8}
+    military_bases = frozenset(['NS', 'NW', 'D', 'X', 'KV', 'RT', 'CK', 'KM'])
+
+    #                   3, 4, 5, 6, 7, 8, 9, A
+    army_be = np.array([[0, 0, 0, 0, 1, 10, 100, 1000],  # TL 0
+                        [0, 0, 0, 1, 5, 50, 500, 5000],  # TL 1
+                        [0, 0, 1, 5, 50, 500, 5000, 50000],  # TL 2
+                        [0, 1, 10, 100, 1000, 10000, 50000, 100000],  # TL 3
+                        [0, 1, 10, 100, 1000, 2000, 20000, 200000],  # TL 4
+                        [1, 2, 3, 30, 300, 3000, 30000, 300000],  # TL 5
+                        [1, 2, 3, 30, 300, 3000, 30000, 300000],  # TL 6
+                        [0, 1, 2, 20, 200, 2000, 20000, 200000],  # TL 7
+                        [0, 1, 2, 20, 200, 2000, 20000, 200000],  # TL 8
+                        [0, 0, 1, 15, 150, 1500, 15000, 150000],  # TL 9
+                        [0, 0, 1, 15, 150, 1500, 15000, 150000],  # TL A
+                        [0, 0, 1, 12, 120, 1200, 12000, 120000],  # TL B
+                        [0, 0, 1, 12, 120, 1200, 12000, 120000],  # TL C
+                        [0, 0, 1, 10, 100, 1000, 10000, 100000],  # TL D
+                        [0, 0, 0, 7, 70, 700, 7000, 70000],  # TL E
+                        [0, 0, 0, 5, 50, 500, 5000, 50000],  # TL F
+                        [0, 0, 0, 5, 50, 500, 5000, 50000],  # TL G
+                        ], dtype=np.int64)
+
+    @staticmethod
+    def calculate(stars: list, pop_code: str, ru_calc: str, seed: Optional[int] = None) -> None:
+        """
+        Set wtn, mspr, population, perCapita, gwp, ship_capacity, tcs_gwp, budget, raw_be, col_be, im_be, ru,
+        eti_cargo and eti_passenger on every supplied star, matching the per-star calculate_ methods.
+
+        Under the benford pop_code, the population multiplier draws come from a generator seeded with seed (defaulting
+        to benford_seed) rather than the global random module.
+        """
+        assert pop_code in ['scaled', 'fixed', 'benford'], "Unknown pop_code " + str(pop_code)
+        num_stars = len(stars)
+        if 0 == num_stars:
+            return
+
+        rows = [(star.popCode, star.popM, star.tl, star.port, star.size, star.atmo, star.hydro,
+                 star.uwpCodes['Government'], star.uwpCodes['Starport'], star.uwpCodes['Atmosphere'],
+                 star.tradeCode.flags, star.baseCode, star.zone, star.alg_code, star.economics) for star in stars]
+        (raw_pop, raw_pop_m, raw_tl, port, size, atmo, hydro, gov, starport, army_atmo, raw_flags, base, zone,
+         alg_codes, economics) = zip(*rows)
+        pop = np.array(raw_pop, dtype=np.int64)
+        pop_m = np.array(raw_pop_m, dtype=np.int64)
+        tl = np.array(raw_tl, dtype=np.int64)
+        flags = np.array(raw_flags, dtype=np.int64)
+
+        rich = 0 != flags & TradeCodes.RICH
+        industrial = 0 != flags & TradeCodes.INDUSTRIAL
+        agricultural = 0 != flags & TradeCodes.AGRICULTURAL
+
+        wtn = DerivedValues._wtn(pop, tl, port)
+        mspr = DerivedValues._mspr(size, atmo, hydro)
+        population, per_capita, gwp, pop_multiplier = DerivedValues._gwp(pop, pop_m, tl, flags, pop_code, seed)
+        tax = np.array([Utilities.tax_rate[item] for item in gov])
+        ship_capacity, tcs_gwp, budget = DerivedValues._tcs(population, tl, flags, tax, starport)
+        raw_be, col_be, im_be, imperial = DerivedValues._army(pop, tl, army_atmo, alg_codes)
+        ru = DerivedValues._ru(pop, economics, ru_calc)
+
+        # numpy adds boolean arrays as logical or, so count each test as an integer
+        isin = DerivedValues._isin
+        capital = 0 != flags & TradeCodes.CAPITAL
+        poor = 0 != flags & TradeCodes.POOR
+        military = isin(base, DerivedValues.military_bases).astype(np.int64)
+        amber = isin(zone, 'AU').astype(np.int64)
+        eti_cargo = isin(port, 'AB').astype(np.int64) - isin(port, 'DEX') + (tl >= 10) - (tl <= 7) + military
+        eti_cargo = eti_cargo + capital + agricultural + rich + industrial - poor - (pop <= 3) + (pop >= 9)
+        eti_cargo = eti_cargo - amber - 8 * isin(zone, 'RF')
+        eti_passenger = eti_cargo - military - agricultural - 2 * industrial - amber
+
+        columns = zip(wtn.tolist(), mspr.tolist(), population.tolist(), per_capita.tolist(), gwp.tolist(),
+                      ship_capacity.tolist(), tcs_gwp.tolist(), budget.tolist(), raw_be.tolist(), col_be.tolist(),
+                      im_be.tolist(), imperial.tolist(), (tl >= 9).tolist(), ru.tolist(), eti_cargo.tolist(),
+                      eti_passenger.tolist(), pop_multiplier.tolist())
+        for star, values in zip(stars, columns):
+            star.wtn, star.mspr, star.population, star.perCapita, star.gwp = values[0:5]
+            star.ship_capacity, star.tcs_gwp, star.budget, star.raw_be = values[5:9]
+            # The scalar methods leave these as integer zero when they don't apply
+            star.col_be = values[9] if values[12] else 0
+            star.im_be = values[10] if values[11] else 0
+            star.ru, star.eti_cargo, star.eti_passenger = values[13:16]
+            if 'scaled' == pop_code:
+                star.uwpCodes['Pop Code'] = str(values[16] // 10)
+            elif 'benford' == pop_code:
+                star.uwpCodes['Pop Code'] = str(values[16] / 10)
+
+    @staticmethod
+    def _isin(values, options) -> np.ndarray:
+        # Membership of whole values, so a string of options is a set of single characters, not a substring check
+        options = frozenset(options)
+        return np.fromiter((item in options for item in values), dtype=bool, count=len(values))
+
+    @staticmethod
+    def _wtn(pop: np.ndarray, tl: np.ndarray, port: tuple) -> np.ndarray:
+        wtn = pop - (tl == 0) + (tl >= 5) + (tl >= 9) + (tl >= 15)
+        ports = np.array(port)
+        wtn = np.select(
+            [ports == 'A', ports == 'B', ports == 'C', ports == 'D', ports == 'E', ports == 'X'],
+            [(wtn * 3 + 13) // 4, (wtn * 3 + 11) // 4, np.minimum((wtn + 9) // 2, (wtn * 3 + 9) // 4),
+             np.minimum((wtn + 7) // 2, (wtn * 3 + 7) // 4), np.minimum((wtn + 5) // 2, (wtn * 3 + 5) // 4),
+             (wtn - 5) // 2],
+            wtn)
+        return np.maximum(0, wtn)
+
+    @staticmethod
+    def _mspr(size: tuple, atmo: tuple, hydro: tuple) -> np.ndarray:
+        isin = DerivedValues._isin
+        mspr = 9 - 2 * isin(size, '01') - isin(size, '234') - isin(hydro, '12A') - 2 * isin(hydro, '0') -\
+            isin(atmo, '4589') - isin(atmo, '479')
+        return np.where(isin(atmo, '0123ABC'), 0, mspr)
+
+    @staticmethod
+    def _gwp(pop: np.ndarray, pop_m: np.ndarray, tl: np.ndarray, flags: np.ndarray, pop_code: str,
+             seed: Optional[int]) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        # Python's int // float converts the int to the nearest float first, as does astype here
+        if 'fixed' == pop_code:
+            multiplier = pop_m
+            population = (np.power(10, pop) * multiplier).astype(np.float64) // 1e6
+        else:
+            multiplier = DerivedValues.pop_code_m[pop_m]
+            if 'benford' == pop_code:
+                rng = np.random.default_rng(DerivedValues.benford_seed if seed is None else seed)
+                draws = rng.random(len(pop))
+                drawn = (np.searchsorted(DerivedValues.benford_range, draws, side='right') + 4) * 10
+                multiplier = np.where((1 <= pop_m) & (pop_m <= 6), multiplier, drawn)
+            population = (np.power(10, pop) * multiplier).astype(np.float64) // 1e7
+
+        per_capita = np.where(population > 0, DerivedValues.calc_gwp[np.minimum(tl, 19)], 0).astype(np.float64)
+        per_capita = np.where(0 != flags & TradeCodes.RICH, per_capita * 1.6, per_capita)
+        per_capita = np.where(0 != flags & TradeCodes.INDUSTRIAL, per_capita * 1.4, per_capita)
+        per_capita = np.where(0 != flags & TradeCodes.AGRICULTURAL, per_capita * 1.2, per_capita)
+        per_capita = np.where(0 != flags & TradeCodes.LOW_PER_CAPITA_GWP, per_capita * 0.8, per_capita)
+
+        gwp = ((population * per_capita) // 1000).astype(np.int64)
+        return population.astype(np.int64), per_capita.astype(np.int64), gwp, multiplier
+
+    @staticmethod
+    def _tcs(population: np.ndarray, tl: np.ndarray, flags: np.ndarray, tax: np.ndarray,
+             starport: tuple) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        ship_capacity = (population.astype(np.float64) * tax * 1000).astype(np.int64)
+        base = DerivedValues.tcs_gwp_base[np.clip(tl - 5, 0, 13)]
+        tcs_gwp = np.where(tl >= 5, population * base * 1000, 0)
+        for mask, numerator in [(TradeCodes.RICH, 16), (TradeCodes.INDUSTRIAL, 14), (TradeCodes.AGRICULTURAL, 12),
+                                (TradeCodes.POOR, 8), (TradeCodes.NONINDUSTRIAL, 8), (TradeCodes.NONAGRICULTURAL, 8)]:
+            tcs_gwp = np.where(0 != flags & mask, tcs_gwp * numerator // 10, tcs_gwp)
+
+        budget = (tcs_gwp.astype(np.float64) * 0.03 * tax).astype(np.int64)
+        rate = np.array([DerivedValues.transfer_rate.get(item, 0.0) for item in starport])
+        has_rate = DerivedValues._isin(starport, DerivedValues.transfer_rate)
+        access = np.where(has_rate, rate - (15 - tl) * 0.05, 0)
+        access = np.maximum(0, access)
+
+        return ship_capacity, tcs_gwp, (budget.astype(np.float64) * access).astype(np.int64)
+
+    @staticmethod
+    def _army(pop: np.ndarray, tl: np.ndarray, atmo: tuple,
+              alg_codes: tuple) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        pop_code = np.minimum(pop - 3, 7) - ~DerivedValues._isin(atmo, '568')
+        raw_be = np.where(pop_code >= 0, DerivedValues.army_be[np.minimum(tl, 16), np.clip(pop_code, 0, 7)], 0)
+        col_be = raw_be * 0.1
+
+        imperial_codes = {code: AllyGen.imperial_align(code) for code in set(alg_codes)}
+        imperial = np.fromiter((imperial_codes[code] for code in alg_codes), dtype=bool, count=len(alg_codes))
+        im_be = raw_be * 0.05
+        im_be = np.where(tl < 13, im_be * (1 - ((13 - tl) / 10.0)), im_be)
+        return raw_be, col_be, im_be, imperial
+
+    @staticmethod
+    def _ru(pop: np.ndarray, economics: tuple, ru_calc: str) -> np.ndarray:
+        factors = {}
+        for item in set(economics):
+            if item:
+                factors[item] = DerivedValues._ru_factors(item, ru_calc)
+        none = (0, 0, 0, 0.0)
+        resources, labor, infrastructure, efficiency = (np.array(column) for column in
+                                                        zip(*(factors.get(item, none) for item in economics)))
+        labor = np.where(0 != pop, labor, 0)
+        ru = np.round((resources * labor * infrastructure).astype(np.float64) * efficiency).astype(np.int64)
+        return ru
+
+    @staticmethod
+    def _ru_factors(economics: str, ru_calc: str) -> tuple[int, int, int, float]:
+        resources = Utilities.ehex_to_int(economics[1])
+        labor = Utilities.ehex_to_int(economics[2])
+        if economics[3] == '-':
+            infrastructure = Utilities.ehex_to_int(economics[3:5])  # pragma: no mutate
+            efficiency = float(economics[5:7].strip(')'))  # pragma: no mutate
+        else:
+            infrastructure = Utilities.ehex_to_int(economics[3])
+            efficiency = float(economics[4:6])
+
+        resources = resources if resources != 0 else 1
+        resources -= 0 if resources < 18 else 1
+        labor = labor if labor != 0 else 1
+        infrastructure = infrastructure if infrastructure != 0 else 1
+        infrastructure += 0 if infrastructure < 18 else -1
+        efficiency = efficiency if efficiency != 0 else 1
+        if efficiency < 0 and 'scaled' == ru_calc:  # pragma: no mutate
+            efficiency = 1.0 + (efficiency * 0.1)
+        return resources, labor, infrastructure, efficiency
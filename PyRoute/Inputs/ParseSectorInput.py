@@ -7,7 +7,7 @@ import codecs
 import logging
 import os
 from logging import Logger
-from typing import Union
+from typing import Optional, Union
 
 from PyRoute.Allies.AllyGen import AllyGen
 from PyRoute.AreaItems.Allegiance import Allegiance
@@ -131,6 +131,9 @@ class ParseSectorInput:
             subsec = star.subsector()
             subname = subsector_names[subsec]
             sector[subname].items.append(line.strip('\n'))
+        # Only the lines are kept, so nothing is left to share the parsed UWPs, trade codes and star lists with
+        from PyRoute.Inputs.ParseStarInput import ParseStarInput
+        ParseStarInput.clear_interned()
 
         return sector
 
@@ -139,23 +142,116 @@ class ParseSectorInput:
                                             star_counter, starlines, galaxy):
         logger.debug('reading %s ' % sector)
 
+        sec = ParseSectorInput._start_sector_object(headers, loaded_sectors, logger, sector, galaxy)
+        if sec is None:
+            return None, None
+
+        star_counter, _ = ParseSectorInput._add_starlines(fix_pop, pop_code, ru_calc, sec, star_counter, starlines,
+                                                          galaxy)
+
+        return sec, star_counter
+
+    @staticmethod
+    def stream_sector_file_to_sector_object(fix_pop, loaded_sectors, logger, pop_code, ru_calc, sector,
+                                            star_counter, galaxy, chunk_size=1000):
+        """
+        Streaming counterpart to read_sector_file followed by read_parsed_sector_to_sector_object.  Headers and
+        starlines are split as the file is read, and starlines are parsed in chunks of at most chunk_size lines, so
+        the raw text held at any one time stays bounded however big the sector file is.
+
+        The headers of a TravellerMap sector file all come before its starlines.  Should a header line turn up after
+        the starlines have started, it is applied when it's read, so only affects the starlines after it.
+        """
+        assert isinstance(chunk_size, int) and 0 < chunk_size, "chunk_size must be positive integer"
+        logger.debug('reading %s ' % sector)
+        headers: list[str] = []
+        added: list[Star] = []
+        parms = (fix_pop, loaded_sectors, logger, pop_code, ru_calc, sector, galaxy, chunk_size)
+        result: Optional[tuple] = None
+
+        try:
+            with codecs.open(sector, 'r', encoding='utf-8') as infile:
+                try:
+                    result = ParseSectorInput._stream_lines(infile, parms, headers, added, star_counter)
+                except (OSError, IOError):
+                    logger.error("sector file %s can not be read", sector, exc_info=True)
+        except FileNotFoundError:
+            logger.error("sector file %s not found" % sector)
+            return None, None
+
+        if result is None:
+            # Read failed part way through, so back out the stars already added
+            for star in added:
+                galaxy.remove_star_from_galaxy(star)
+            if 0 < len(added):
+                loaded_sectors.discard(str(added[0].sector))
+            return None, None
+
+        sec, star_counter, chunk = result
+        if sec is None:
+            if 0 == len(headers) or chunk is None:
+                return None, None
+            sec = ParseSectorInput._start_sector_object(headers, loaded_sectors, logger, sector, galaxy)
+            if sec is None:
+                return None, None
+
+        star_counter, _ = ParseSectorInput._add_starlines(fix_pop, pop_code, ru_calc, sec, star_counter, chunk,
+                                                          galaxy)
+        return sec, star_counter
+
+    @staticmethod
+    def _stream_lines(infile, parms, headers, added, star_counter):
+        """
+        Split lines from infile into headers and starlines, parsing full chunks of starlines as they fill.  Returns the
+        sector (None if no starlines were seen), the star counter and the final, part-filled, chunk - or None in place
+        of the chunk if the sector turned out to be a duplicate.
+        """
+        fix_pop, loaded_sectors, logger, pop_code, ru_calc, sector, galaxy, chunk_size = parms
+        sec = None
+        chunk: list[str] = []
+        for line in infile:
+            if not line[0].isdigit():
+                headers.append(line)
+                if sec is not None:
+                    ParseSectorInput.parse_allegiance([line], galaxy.alg)
+                    ParseSectorInput.parse_subsectors([line], sec.name, sec)
+                continue
+            if sec is None:
+                sec = ParseSectorInput._start_sector_object(headers, loaded_sectors, logger, sector, galaxy)
+                if sec is None:
+                    return None, star_counter, None
+            chunk.append(line)
+            if chunk_size <= len(chunk):
+                star_counter, stars = ParseSectorInput._add_starlines(fix_pop, pop_code, ru_calc, sec, star_counter,
+                                                                      chunk, galaxy)
+                added.extend(stars)
+                chunk = []
+        return sec, star_counter, chunk
+
+    @staticmethod
+    def _start_sector_object(headers, loaded_sectors, logger, sector, galaxy):
         sec = Sector(headers[3], headers[4])
         sec.filename = os.path.basename(sector)
         if str(sec) not in loaded_sectors:
             loaded_sectors.add(str(sec))
         else:
             logger.error("sector file %s loads duplicate sector %s" % (sector, str(sec)))
-            return None, None
+            return None
 
         # dig out allegiances
         ParseSectorInput.parse_allegiance(headers, galaxy.alg)
 
         # dig out subsector names, and use them to seed the dict entries
         ParseSectorInput.parse_subsectors(headers, sec.name, sec)
+        return sec
 
+    @staticmethod
+    def _add_starlines(fix_pop, pop_code, ru_calc, sec, star_counter, starlines, galaxy) -> tuple[int, list[Star]]:
+        added = []
         for line in starlines:
             star = Star.parse_line_into_star(line, sec, pop_code, ru_calc, fix_pop=fix_pop)
             if star:
                 star_counter = galaxy.add_star_to_galaxy(star, star_counter, sec)
+                added.append(star)
 
-        return sec, star_counter
+        return star_counter, added
@@ -15,9 +15,11 @@ from PyRoute.Inputs.StarlineStationTransformer import StarlineStationTransformer
 from PyRoute.Inputs.StarlineTransformer import StarlineTransformer
 from PyRoute.Inputs.StarlineParser import StarlineParser
 from PyRoute.Nobles import Nobles
+from PyRoute.SystemData.StarList import StarList
 from PyRoute.SystemData.UWP import UWP
 from PyRoute.SystemData.Utilities import Utilities
 from PyRoute.TradeCodes import TradeCodes
+from PyRoute.UWPCodes import UWPCodeRecord
 
 
 class ParseStarInput:
@@ -53,9 +55,21 @@ class ParseStarInput:
     station_parser: Optional[StarlineStationParser] = None
     station_transformer: Optional[StarlineStationTransformer] = None
     deep_space: dict[str, list[str]] = {}
+    # Set while a whole galaxy is being loaded, which then calculates the derived values in bulk - see DerivedValues
+    defer_derived_values = False
     valid_zone = 'arufgbARUFGB-'
     valid_nobles = 'BCcDEeFfGH-'
 
+    @staticmethod
+    def clear_interned() -> None:
+        """
+        Drop the lookup tables of parsed UWPs, trade codes and star lists that loading shares between worlds.  Worlds
+        keep what they were handed; this just stops the tables outliving the load that filled them.
+        """
+        UWP.interned.clear()
+        TradeCodes.interned.clear()
+        StarList.interned.clear()
+
     @staticmethod
     def parse_line_into_star_core(star, line, sector, pop_code, ru_calc, fix_pop=False):
         star.sector = sector
@@ -71,13 +85,13 @@ class ParseStarInput:
         star.name = data[1].strip()
 
         try:
-            star.uwp = UWP(data[2].strip())
+            star.uwp = UWP.intern(data[2].strip())
         except ValueError as e:
             if 'Input UWP malformed' == str(e):
                 return None
             raise e
         try:
-            star.tradeCode = TradeCodes(data[3].strip())
+            star.tradeCode = TradeCodes.intern(data[3].strip())
         except MultipleWPopError:
             return None
         star.ownedBy = star.tradeCode.owned_by(star)
@@ -111,6 +125,7 @@ class ParseStarInput:
         if star.uwp.law.upper() in "KLMNOPQRSTUVWXYZ":
             samecode = AllyGen.same_align(star.alg_code)
             if "Kk" != samecode:
+                star.uwp = star.uwp.unshared()
                 star.uwp.law = "J"
 
         star.stars = data[17].strip()
@@ -127,9 +142,7 @@ class ParseStarInput:
         star.tradeCount = 0
         star.passIn = 0
         star.passOver = 0
-        star.starportSize = 0
-        star.starportBudget = 0
-        star.starportPop = 0
+        star.clear_starport()
 
         star.tradeCode.check_world_codes(star, fix_pop=fix_pop)
 
@@ -146,20 +159,10 @@ class ParseStarInput:
         else:
             star.calculate_importance()
 
-        star.uwpCodes = {'Starport': star.port,
-                         'Size': star.size,
-                         'Atmosphere': star.atmo,
-                         'Hydrographics': star.hydro,
-                         'Population': star.pop,
-                         'Government': star.gov,
-                         'Law Level': star.law,
-                         'Tech Level': star.tl,
-                         'Pop Code': str(star.popM),
-                         'Starport Size': star.starportSize,
-                         'Primary Type': star.primary_type if star.primary_type else 'X',
-                         'Importance': star.importance,
-                         'Resources': Utilities.ehex_to_int(star.economics[1]) if star.economics else 0
-                         }
+        star.uwpCodes = UWPCodeRecord(star.port, star.size, star.atmo, star.hydro, star.pop, star.gov, star.law,
+                                      star.tl, str(star.popM), star.starportSize,
+                                      star.primary_type if star.primary_type else 'X', star.importance,
+                                      Utilities.ehex_to_int(star.economics[1]) if star.economics else 0)
 
         if fix_pop is True:
             star.fix_ex()
@@ -167,20 +170,20 @@ class ParseStarInput:
             star.check_ex()
         star.check_cx()
 
-        star.calculate_wtn()
-        star.calculate_mspr()
-        star.calculate_gwp(pop_code)
-
-        star.calculate_TCS()
-        star.calculate_army()
-        star.calculate_ru(ru_calc)
-
         star.eti_cargo_volume = 0
         star.eti_pass_volume = 0
         star.eti_cargo = 0
         star.eti_passenger = 0
         star.eti_worlds = 0
-        star.calculate_eti()
+        if not ParseStarInput.defer_derived_values:
+            star.calculate_wtn()
+            star.calculate_mspr()
+            star.calculate_gwp(pop_code)
+
+            star.calculate_TCS()
+            star.calculate_army()
+            star.calculate_ru(ru_calc)
+            star.calculate_eti()
 
         star.trade_id = None  # Used by the Speculative Trade
         star.calc_hash()
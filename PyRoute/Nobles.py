@@ -46,9 +46,7 @@ class Nobles(object):
         return ''.join(sorted(nobility, key=lambda v: (v.lower(), v[0].isupper())))
 
     def __getstate__(self):
-        state = self.__dict__.copy()
-        del state['codes']
-        return state
+        return {'nobles': self.nobles}
 
     def count(self, nobility) -> None:
         for code, rank in Nobles.codes.items():
@@ -12,6 +12,7 @@ from typing import Any
 import numpy as np
 from PyRoute.Star import Star
 from PyRoute.Pathfinding.DistanceGraph import DistanceGraph
+from PyRoute.Pathfinding.forest_storage import round_down_float32, round_up_float32, float32_slack
 from PyRoute.Pathfinding.single_source_dijkstra import implicit_shortest_path_dijkstra_distance_graph
 from single_source_dijkstra_core import dijkstra_core
 
@@ -33,8 +34,12 @@ class ApproximateShortestPathForestUnified:
     _graph_len: cython.int
     _distances: cython.declare(cnp.ndarray(cython.float, ndim=2), 'readonly')
     _max_labels: cnp.ndarray(cython.float, ndim=2)
+    _distances_buffer: cnp.ndarray(cython.float, ndim=2)
+    _max_labels_buffer: cnp.ndarray(cython.float, ndim=2)
+    _float32: cython.bint
+    _slack: cython.double
 
-    def __init__(self, source, graph, epsilon, sources=None):
+    def __init__(self, source, graph, epsilon, sources=None, float32=False):
         seeds, source, num_trees = self._get_sources(graph, source, sources)
         self._graph = DistanceGraph(graph)
         self._source = source
@@ -45,8 +50,17 @@ class ApproximateShortestPathForestUnified:
         self._seeds = seeds
         self._num_trees = num_trees
         self._graph_len = len(self._graph)
-        self._distances = np.ones((self._graph_len, self._num_trees), dtype=float, order='F') * float('+inf')
-        self._max_labels = np.ones((self._graph_len, self._num_trees), dtype=float) * float('+inf')
+        # When storing labels as float32, distance labels are rounded down and max labels rounded up.  _slack then
+        # bounds how far a float32-derived lower bound can overshoot, and is subtracted to keep bounds admissible.
+        self._float32 = float32
+        self._slack = 0.0
+        dtype = np.float32 if self._float32 else float
+        # Backing buffers for the forest's columns - _distances and _max_labels are views onto their first _num_trees
+        # columns, so expand_forest can add trees in amortised O(1) rather than reallocating on every expansion
+        self._distances_buffer = np.full((self._graph_len, self._num_trees), float('+inf'), dtype=dtype, order='F')
+        self._max_labels_buffer = np.full((self._graph_len, self._num_trees), float('+inf'), dtype=dtype, order='F')
+        self._distances = self._distances_buffer
+        self._max_labels = self._max_labels_buffer
 
         min_cost = self._graph._min_cost
         # spin up initial distances
@@ -54,17 +68,19 @@ class ApproximateShortestPathForestUnified:
             raw_seeds = self._seeds[i] if isinstance(self._seeds[i], list) else list(self._seeds[i].values())
             self._distances[raw_seeds, i] = 0
             result = implicit_shortest_path_dijkstra_distance_graph(self._graph, self._source,
-                                                                                   self._distances[:, i],
+                                                                                   self._tree_distances(i),
                                                                                    seeds=raw_seeds,
                                                                                    min_cost=min_cost,
                                                                                    divisor=self._divisor)
-            self._distances[:, i], self._max_labels[:, i], _ = result
+            self._set_tree(i, result[0], result[1])
 
     def lower_bound(self, source, target) -> float:
         raw = np.abs(self._distances[source, :] - self._distances[target, :])
         raw = raw[~np.isinf(raw)]
         if 0 == len(raw):
             return 0
+        if self._float32:
+            return max(0.0, float(np.max(raw)) - self._slack)
         return np.max(raw)
 
     @cython.ccall
@@ -92,6 +108,8 @@ class ApproximateShortestPathForestUnified:
 
             raw = actives - target
 
+        if self._float32:
+            return np.maximum(np.max(np.abs(raw), axis=1).astype(float) - self._slack, 0.0)
         return np.max(np.abs(raw), axis=1)
 
     def triangle_upbound(self, source: cython.int, target: cython.int) -> float:
@@ -102,6 +120,8 @@ class ApproximateShortestPathForestUnified:
         if 0 == len(raw):
             return float64max / 2
 
+        if self._float32:
+            return (float(np.min(raw)) + self._slack) * (1 + self._epsilon)
         return np.min(raw) * (1 + self._epsilon)
 
     #  Gratuitous William Gibson reference is gratuitous.
@@ -183,13 +203,13 @@ class ApproximateShortestPathForestUnified:
         for i in tree_dex:
             if 0 == len(dropspecific[i]):
                 continue
-            self._distances[:, i], _, self._max_labels[:, i], _ = dijkstra_core(
-                                                                  arcs,
-                                                                  self._distances[:, i],
-                                                                  self._divisor,
-                                                                  dropspecific[i],
-                                                                  self._max_labels[:, i],
-                                                                  min_cost)
+            distances, _, max_labels, _ = dijkstra_core(arcs,
+                                                        self._tree_distances(i),
+                                                        self._divisor,
+                                                        dropspecific[i],
+                                                        self._tree_max_labels(i),
+                                                        min_cost)
+            self._set_tree(i, distances, max_labels)
 
     def expand_forest(self, nu_seeds) -> None:
         raw_seeds = nu_seeds if isinstance(nu_seeds, list) else list(nu_seeds.values())
@@ -199,13 +219,43 @@ class ApproximateShortestPathForestUnified:
                                                                 nu_distances,
                                                                 seeds=raw_seeds,
                                                                 divisor=self._divisor)
-        result = np.zeros((self._graph_len, 1), dtype=float)
-        result[:, 0] = list(nu_distances)
-        maxresult = np.zeros((self._graph_len, 1), dtype=float)
-        maxresult[:, 0] = list(nu_max_labels)
-        self._distances = np.append(self._distances, result, 1)
-        self._max_labels = np.append(self._distances, maxresult, 1)
+        if self._num_trees == self._distances_buffer.shape[1]:
+            self._grow_forest()
         self._num_trees += 1
+        self._distances = self._distances_buffer[:, :self._num_trees]
+        self._max_labels = self._max_labels_buffer[:, :self._num_trees]
+        self._set_tree(self._num_trees - 1, nu_distances, nu_max_labels)
+
+    def _grow_forest(self) -> None:
+        nu_capacity = max(1, 2 * self._num_trees)
+        dtype = self._distances_buffer.dtype
+        nu_distances = np.full((self._graph_len, nu_capacity), float('+inf'), dtype=dtype, order='F')
+        nu_max_labels = np.full((self._graph_len, nu_capacity), float('+inf'), dtype=dtype, order='F')
+        nu_distances[:, :self._num_trees] = self._distances_buffer[:, :self._num_trees]
+        nu_max_labels[:, :self._num_trees] = self._max_labels_buffer[:, :self._num_trees]
+        self._distances_buffer = nu_distances
+        self._max_labels_buffer = nu_max_labels
+
+    def _tree_distances(self, i) -> cnp.ndarray:
+        # Dijkstra works on float64 labels - when storing float32, hand it a widened copy of the tree's column
+        if self._float32:
+            return self._distances[:, i].astype(float)
+        return self._distances[:, i]
+
+    def _tree_max_labels(self, i) -> cnp.ndarray:
+        if self._float32:
+            return self._max_labels[:, i].astype(float)
+        return self._max_labels[:, i]
+
+    def _set_tree(self, i, distances, max_labels) -> None:
+        if self._float32:
+            self._distances[:, i] = round_down_float32(distances)
+            self._max_labels[:, i] = round_up_float32(max_labels)
+            # Distance labels only ever decrease after a tree is built, so the slack need only track new trees
+            self._slack = max(self._slack, float32_slack(self._distances[:, i]))
+        else:
+            self._distances[:, i] = distances
+            self._max_labels[:, i] = max_labels
 
     def _get_sources(self, graph, source, sources):
         seeds = None
@@ -247,6 +297,10 @@ class ApproximateShortestPathForestUnified:
     def num_trees(self) -> int:
         return self._num_trees
 
+    @property
+    def float32(self) -> bool:
+        return self._float32
+
     @property
     def distances(self) -> cnp.ndarray:
         return self._distances
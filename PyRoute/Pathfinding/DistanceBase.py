@@ -37,5 +37,19 @@ class DistanceBase:
 
         return (abs(dq) + abs(dr) + abs(dq + dr)) // 2
 
+    def csr(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Snapshot the current arcs into compressed-sparse-row form - row pointers, neighbour nodes and arc weights - so
+        read-only pathfinding can walk plain arrays without touching per-node Python objects.
+        """
+        num_nodes = len(self)
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        if 0 == num_nodes:
+            return indptr, np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+        indptr[1:] = np.cumsum([len(self._arcs[u][0]) for u in range(num_nodes)])
+        indices = np.concatenate([self._arcs[u][0] for u in range(num_nodes)]).astype(np.int64)
+        weights = np.concatenate([self._arcs[u][1] for u in range(num_nodes)]).astype(np.float64)
+        return indptr, indices, weights
+
     def _lighten_arc(self, u: int, v: int, weight: float) -> None:
         self._arcs[u][1][self._arcs[u][0] == v] = weight
@@ -26,9 +26,9 @@ class LandmarkAvoidHelper:
         # spin through nodes in bulk, propagating weights upwards
         active_weights = weights[active_nodes]
         while 0 < len(active_nodes):
-            #  Directly iterating in python worked out faster than using nditer
-            for index in range(len(active_nodes)):
-                sizes[active_nodes[index]] += active_weights[index]
+            # Unbuffered add, as siblings share a parent and thus appear repeatedly in active_nodes.  np.add.at
+            # accumulates in index order, so the sums are identical to adding one node at a time.
+            np.add.at(sizes, active_nodes, active_weights)
             keep = tree[active_nodes] != LandmarkAvoidHelper.TREE_ROOT
             active_nodes = active_nodes[keep]
             active_weights = active_weights[keep]
@@ -48,15 +48,17 @@ class LandmarkAvoidHelper:
         active_nodes = np.array(range(len(sizes)))
         if LandmarkAvoidHelper.TREE_ROOT != tree[rootnode]:
             raise AssertionError("Selected root node " + str(rootnode) + " not marked as a tree root")
+        # Group nodes by parent once, so each step down the tree is a slice rather than a full scan of the tree.
+        # The stable sort keeps each node's children in ascending index order, so ties in argmax break as before.
+        by_parent = np.argsort(tree, kind='stable')
+        sorted_parents = tree[by_parent]
         choice = active_nodes[np.argmax(sizes)]
-        kidvec = np.where(choice == tree)
-        kidsizes = sizes[kidvec]
-        maxkid = np.argmax(kidsizes)
-        while 0 < len(kidsizes):
-            choice = active_nodes[kidvec][maxkid]
-            kidvec = np.where(choice == tree)
-            kidsizes = sizes[kidvec]
-            if 0 < len(kidsizes):
-                maxkid = np.argmax(kidsizes)
+        while True:
+            left = np.searchsorted(sorted_parents, choice, side='left')
+            right = np.searchsorted(sorted_parents, choice, side='right')
+            if left == right:
+                break
+            kids = by_parent[left:right]
+            choice = kids[np.argmax(sizes[kids])]
 
         return choice
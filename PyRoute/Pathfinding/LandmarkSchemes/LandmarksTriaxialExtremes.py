@@ -4,6 +4,8 @@ Created on Feb 19, 2024
 @author: CyberiaResurrection
 """
 import math
+from multiprocessing import Pool
+
 import numpy as np
 from collections import defaultdict
 from typing import Any
@@ -17,16 +19,28 @@ except ImportError:
 except AttributeError:
     from PyRoute.Pathfinding.ApproximateShortestPathForestUnifiedFallback import ApproximateShortestPathForestUnified
 from PyRoute.Pathfinding.LandmarkSchemes.LandmarkAvoidHelper import LandmarkAvoidHelper
+from PyRoute.Pathfinding.forest_storage import max_trees_for_budget
 from PyRoute.Pathfinding.single_source_dijkstra import explicit_shortest_path_dijkstra_distance_graph
 
+# Landmark schema shared with forked worker processes during parallel avoid-landmark selection.  As with the
+# trade-mp route finder, the workers inherit the galaxy via fork rather than having it pickled across to them.
+shared_schema: dict = {}
+
+
+def avoid_landmarks_process(job) -> list:
+    return shared_schema['schema'].avoid_landmarks(*job)
+
 
 class LandmarksTriaxialExtremes:
 
     def __init__(self, galaxy):
         self.galaxy = galaxy
         self.route_reuse = galaxy.trade.route_reuse
-        self._set_max_slots()
+        self.pathfinding_memory = galaxy.trade.pathfinding_memory
+        self.forest_float32 = galaxy.trade.forest_float32
         self.graph_len = len(self.galaxy.stars)
+        self.mp_threads = galaxy.trade.mp_threads
+        self._set_max_slots()
         self.distgraph = self.galaxy.trade.star_graph
         self.floatinf = float('+inf')  # pragma: no mutate
 
@@ -40,16 +54,21 @@ class LandmarksTriaxialExtremes:
         else:
             self.max_slots = 15
 
+        # If a pathfinding memory budget is set, cap the slot count so the landmark forest fits inside it
+        if self.pathfinding_memory is not None:
+            budget_slots = max_trees_for_budget(self.graph_len, self.pathfinding_memory, self.forest_float32)
+            self.max_slots = min(self.max_slots, budget_slots)
+
     def get_landmarks(self, btn=None) -> tuple[list[dict], defaultdict[Any, set]]:
         comp = self.galaxy.trade.components
         max_size = max(comp.values(), default=1)  # pragma: no mutate
         num_slots = min(self.max_slots, self._size_to_landmarks(max_size))
         result = []
         component_landmarks = defaultdict(set)
-        all_nodes = list(range(len(self.galaxy.star_mapping)))
 
         for _ in range(num_slots):
             result.append(dict())
+        avoid_jobs = []
 
         for component_id in self.galaxy.trade.components:
             comp_size = self.galaxy.trade.components[component_id]
@@ -114,39 +133,72 @@ class LandmarksTriaxialExtremes:
             slotcount = 4 if btn is not None else 3
             seeds = [{component_id: item[component_id]} for item in result if component_id in item]
             assert slotcount == len(seeds), f"S-t transpose-trigger landmark skipped in component {component_id}"
-            approx = ApproximateShortestPathForestUnified(source.index, self.galaxy.stars, epsilon=self.galaxy.trade.epsilon, sources=seeds)
-            distances = self.galaxy.trade.star_graph.distances_from_target(all_nodes, first_star.index)
-            min_cost = self.galaxy.trade.star_graph.min_cost(first_star.index)
-            static = np.maximum(distances, min_cost)
-
-            while slotcount < slots:
-                lobound = approx.lower_bound_bulk(first_star.index)
-                lobound = np.maximum(lobound, static)
-
-                distance_labels = np.ones(self.graph_len) * float('+inf')  # pragma: no mutate
-                distance_labels[first_star.index] = 0  # pragma: no mutate
-
-                sp_distances, sp_parents, _, _ = explicit_shortest_path_dijkstra_distance_graph(self.distgraph, first_star.index,
-                                                                                          distance_labels)
-                inf_set = self.floatinf == sp_distances
-                sp_distances[inf_set] = 0
-                lobound[inf_set] = 0
-                weights = LandmarkAvoidHelper.calc_weights(sp_distances, lobound)
-                assert (weights[inf_set] == 0).all(), "Inf-set weights must be zero"  # pragma: no mutate
-                sizes = LandmarkAvoidHelper.calc_sizes(weights, sp_parents, component_landmarks[component_id])
-                nu_landmark = LandmarkAvoidHelper.traverse_sizes(sizes, first_star.index, sp_parents)
-                result[slotcount][component_id] = nu_landmark
+            avoid_jobs.append((component_id, source.index, first_star.index, slotcount, slots, seeds,
+                               set(component_landmarks[component_id])))
+
+        # The remaining avoid-powered landmarks for each component depend only on that component's existing landmarks,
+        # so they are selected independently - in parallel if we can - then folded back in component order.
+        for job, nu_landmarks in zip(avoid_jobs, self._run_avoid_jobs(avoid_jobs)):
+            component_id, _, _, slotcount, slots, _, _ = job
+            for offset, nu_landmark in enumerate(nu_landmarks):
+                result[slotcount + offset][component_id] = nu_landmark
                 component_landmarks[component_id].add(nu_landmark)
 
-                reseed = {component_id: nu_landmark}
-                approx.expand_forest(reseed)
-                slotcount += 1  # pragma: no mutate
-
             assert slots == len(component_landmarks[component_id]),\
                 f"Duplicate landmarks detected on component {component_id} avoid-powered segment"
 
         return result, component_landmarks
 
+    def _run_avoid_jobs(self, avoid_jobs) -> list:
+        if 2 > self.mp_threads or 2 > len(avoid_jobs):
+            return [self.avoid_landmarks(*job) for job in avoid_jobs]
+
+        shared_schema['schema'] = self
+        try:
+            with Pool(processes=min(self.mp_threads, len(avoid_jobs))) as pool:
+                # Pool.map hands back results in job order, which keeps selection deterministic
+                return pool.map(avoid_landmarks_process, avoid_jobs, chunksize=1)
+        finally:
+            shared_schema.clear()
+
+    def avoid_landmarks(self, component_id, source_index, first_index, slotcount, slots, seeds, landmarks) -> list:
+        """
+        Select the avoid-powered landmarks for a single component, filling slots slotcount through slots - 1.
+        Returns the new landmarks, in slot order.
+        """
+        nu_landmarks = []
+        all_nodes = list(range(len(self.galaxy.star_mapping)))
+        approx = ApproximateShortestPathForestUnified(source_index, self.galaxy.stars, epsilon=self.galaxy.trade.epsilon, sources=seeds,
+                                                      float32=self.forest_float32)
+        distances = self.galaxy.trade.star_graph.distances_from_target(all_nodes, first_index)
+        min_cost = self.galaxy.trade.star_graph.min_cost(first_index)
+        static = np.maximum(distances, min_cost)
+
+        while slotcount < slots:
+            lobound = approx.lower_bound_bulk(first_index)
+            lobound = np.maximum(lobound, static)
+
+            distance_labels = np.ones(self.graph_len) * float('+inf')  # pragma: no mutate
+            distance_labels[first_index] = 0  # pragma: no mutate
+
+            sp_distances, sp_parents, _, _ = explicit_shortest_path_dijkstra_distance_graph(self.distgraph, first_index,
+                                                                                      distance_labels)
+            inf_set = self.floatinf == sp_distances
+            sp_distances[inf_set] = 0
+            lobound[inf_set] = 0
+            weights = LandmarkAvoidHelper.calc_weights(sp_distances, lobound)
+            assert (weights[inf_set] == 0).all(), "Inf-set weights must be zero"  # pragma: no mutate
+            sizes = LandmarkAvoidHelper.calc_sizes(weights, sp_parents, landmarks)
+            nu_landmark = LandmarkAvoidHelper.traverse_sizes(sizes, first_index, sp_parents)
+            nu_landmarks.append(nu_landmark)
+            landmarks.add(nu_landmark)
+
+            reseed = {component_id: nu_landmark}
+            approx.expand_forest(reseed)
+            slotcount += 1  # pragma: no mutate
+
+        return nu_landmarks
+
     @staticmethod
     def _size_to_landmarks(size):
         return math.ceil(2.5 * math.log10(size))
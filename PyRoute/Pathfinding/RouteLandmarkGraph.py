@@ -11,11 +11,22 @@ from PyRoute.Pathfinding.DistanceBase import DistanceBase
 
 class RouteLandmarkGraph(DistanceBase):
 
+    # Capacity given to a node's neighbour and weight buffers on its first added edge.  After that, capacity doubles
+    # whenever the buffer fills, so appending an edge is amortised O(1) instead of a fresh copy on every add.
+    _initial_capacity = 4
+
     def __init__(self, graph):
         super().__init__(graph)
+        num_nodes = len(self._nodes)
+        # Backing storage - each node's buffers hold _lengths[u] live entries, the remainder being spare capacity
+        self._neighbour_buffers = [np.array([], dtype=int) for _ in range(num_nodes)]
+        self._weight_buffers = [np.array([], dtype=float) for _ in range(num_nodes)]
+        self._lengths = np.zeros(num_nodes, dtype=int)
+        # _arcs holds views onto the live prefix of each node's buffers, so existing consumers (and _lighten_arc)
+        # keep working unmodified - writes through a view land in the backing buffer
         self._arcs = [
-            (np.array([], dtype=int), np.array([], dtype=float), dict())
-            for u in self._nodes
+            (self._neighbour_buffers[u], self._weight_buffers[u], dict())
+            for u in range(num_nodes)
         ]
 
     def __getitem__(self, item):
@@ -28,17 +39,35 @@ class RouteLandmarkGraph(DistanceBase):
         self._extend_arc(u, v, weight)
         self._extend_arc(v, u, weight)
 
+    def capacity(self, u) -> int:
+        self._check_index(u)
+        return len(self._neighbour_buffers[u])
+
     def _extend_arc(self, u, v, weight):
-        arcs = self._arcs[u]
-        u_dict = arcs[2]
+        u_dict = self._arcs[u][2]
         if v not in u_dict:
-            u_dict[v] = len(u_dict)
-            u_first = np.append(arcs[0], [v], 0)
-            u_last = np.append(arcs[1], [weight], 0)
-            self._arcs[u] = (u_first, u_last, u_dict)
+            length = self._lengths[u]
+            if length == len(self._neighbour_buffers[u]):
+                self._grow(u)
+            self._neighbour_buffers[u][length] = v
+            self._weight_buffers[u][length] = weight
+            u_dict[v] = length
+            length += 1
+            self._lengths[u] = length
+            self._arcs[u] = (self._neighbour_buffers[u][:length], self._weight_buffers[u][:length], u_dict)
         else:
             self._lighten_arc(u, v, weight)
 
+    def _grow(self, u):
+        length = self._lengths[u]
+        nu_capacity = max(self._initial_capacity, 2 * length)
+        nu_neighbours = np.zeros(nu_capacity, dtype=int)
+        nu_weights = np.zeros(nu_capacity, dtype=float)
+        nu_neighbours[:length] = self._neighbour_buffers[u][:length]
+        nu_weights[:length] = self._weight_buffers[u][:length]
+        self._neighbour_buffers[u] = nu_neighbours
+        self._weight_buffers[u] = nu_weights
+
     @functools.cache
     def _check_index(self, item):
         if not isinstance(item, int):
@@ -218,3 +218,127 @@ def astar_numpy_core(G_succ: list[tuple[cnp.ndarray[cython.int], cnp.ndarray[cyt
             queue_counter += counter
 
     return path, diag
+
+
+@cython.boundscheck(False)
+@cython.initializedcheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+def astar_path_csr(csr: tuple, source: cython.int, target: cython.int, potentials: cnp.ndarray[cython.double],
+                   upbound: cython.double = float64max) -> tuple[list, dict]:
+    """
+    Counterpart of astar_path_numpy over a compressed-sparse-row snapshot of a graph (as made by DistanceBase.csr) and
+    an already-calculated potentials vector.  As neither the snapshot nor the potentials are written to, the search
+    itself runs with the GIL released, letting multiple threads share one copy of the graph.
+    """
+    indptr_view: cython.long[:] = csr[0]
+    indices_view: cython.long[:] = csr[1]
+    weights_view: cython.double[:] = csr[2]
+    potentials_view: cython.double[:] = potentials
+    num_nodes: cython.long = len(csr[0]) - 1
+    found: cython.bint
+
+    # Traces lowest distance from source node found for each node
+    distances = np.ones(num_nodes, dtype=float) * upbound
+    distances_view: cython.double[:] = distances
+    # Maps explored nodes to parent closest to the source - -2 marks unexplored nodes, -1 the source's parent
+    parents = np.ones(num_nodes, dtype=int) * -2
+    parents_view: cython.long[:] = parents
+
+    with cython.nogil:
+        found = astar_csr_core(indptr_view, indices_view, weights_view, potentials_view, distances_view, parents_view,
+                               source, target, upbound)
+
+    if not found:
+        raise nx.NetworkXNoPath(f"Node {target} not reachable from {source}")
+
+    path: list[cython.int] = []
+    node = target
+    while node != -1:
+        assert len(path) < num_nodes, "Node " + str(node) + " duplicated in discovered path"
+        path.append(node)
+        node = parents_view[node]
+    path.reverse()
+    return path, {}
+
+
+@cython.cfunc
+@cython.nogil
+@cython.exceptval(check=False)
+@cython.infer_types(True)
+@cython.boundscheck(False)
+@cython.initializedcheck(False)
+@cython.nonecheck(False)
+@cython.wraparound(False)
+def astar_csr_core(indptr_view: cython.long[:], indices_view: cython.long[:], weights_view: cython.double[:],
+                   potentials_view: cython.double[:], distances_view: cython.double[:], parents_view: cython.long[:],
+                   source: cython.int, target: cython.int, upbound: cython.double) -> cython.bint:
+    act_nod: cython.int
+    act_wt: cython.double
+    aug_wt: cython.double
+    nu_upbound: cython.double
+    dist: cython.double
+    curnode: cython.int
+    parent: cython.int
+    i: cython.long
+    item = cython.declare(astar_t)
+    result: astar_t
+
+    distances_view[source] = 0.0
+
+    queue: MinMaxHeap[astar_t] = MinMaxHeap[astar_t]()
+    queue.reserve(500)
+    item.augment = potentials_view[source]
+    item.dist = 0.0
+    item.curnode = source
+    item.parent = -1
+    queue.insert(item)
+
+    while 0 < queue.size():
+        # Pop the smallest item from queue.
+        result = queue.popmin()
+        dist = result.dist
+        curnode = result.curnode
+        parent = result.parent
+
+        if curnode == target:
+            parents_view[curnode] = parent
+            return True
+
+        if parents_view[curnode] != -2:
+            # Do not override the parent of starting node
+            if parents_view[curnode] == -1:
+                continue
+
+            # We've found a bad path, just move on
+            if distances_view[curnode] <= dist:
+                continue
+            # If we've found a better path, update
+            distances_view[curnode] = dist
+
+        parents_view[curnode] = parent
+
+        for i in range(indptr_view[curnode], indptr_view[curnode + 1]):
+            if indices_view[i] == target:
+                nu_upbound = dist + weights_view[i]
+                if nu_upbound < upbound:
+                    upbound = nu_upbound
+                    distances_view[target] = upbound
+                break
+
+        for i in range(indptr_view[curnode], indptr_view[curnode + 1]):
+            act_nod = indices_view[i]
+            act_wt = dist + weights_view[i]
+            if act_wt > distances_view[act_nod]:
+                continue
+            aug_wt = act_wt + potentials_view[act_nod]
+            if aug_wt > upbound:
+                continue
+            distances_view[act_nod] = act_wt
+            item.augment = aug_wt
+            item.dist = act_wt
+            item.curnode = act_nod
+            item.parent = curnode
+            queue.insert(item)
+
+    return False
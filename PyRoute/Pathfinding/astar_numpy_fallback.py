@@ -220,3 +220,77 @@ def astar_path_numpy(G, source, target, bulk_heuristic, min_cost=None, upbound=f
                 heappush(queue, (augmented_weights[i], active_weights[i], active_nodes[i], curnode))
 
     raise nx.NetworkXNoPath(f"Node {target} not reachable from {source}")
+
+
+def astar_path_csr(csr, source, target, potentials, upbound=float64max) -> tuple[list, dict]:
+    """
+    Counterpart of astar_path_numpy over a compressed-sparse-row snapshot of a graph (as made by DistanceBase.csr) and
+    an already-calculated potentials vector.  The compiled version runs with the GIL released - this fallback keeps
+    the same search order so both return the same routes.
+    """
+    indptr, indices, weights = csr
+    num_nodes = len(indptr) - 1
+
+    # Traces lowest distance from source node found for each node
+    distances = np.ones(num_nodes, dtype=float) * upbound
+    distances[source] = 0.0
+    # Maps explored nodes to parent closest to the source - -2 marks unexplored nodes, -1 the source's parent
+    parents = np.ones(num_nodes, dtype=int) * -2
+
+    queue = [(potentials[source], 0.0, source, -1)]
+    found = False
+
+    while queue:
+        # Pop the smallest item from queue.
+        _, dist, curnode, parent = heappop(queue)
+
+        if curnode == target:
+            parents[curnode] = parent
+            found = True
+            break
+
+        if parents[curnode] != -2:
+            # Do not override the parent of starting node
+            if parents[curnode] == -1:
+                continue
+
+            # We've found a bad path, just move on
+            if distances[curnode] <= dist:
+                continue
+            # If we've found a better path, update
+            distances[curnode] = dist
+
+        parents[curnode] = parent
+
+        active_nodes = indices[indptr[curnode]:indptr[curnode + 1]]
+        active_weights = dist + weights[indptr[curnode]:indptr[curnode + 1]]
+
+        keep = active_nodes == target
+        if keep.any():
+            nu_upbound = active_weights[keep][0]
+            if nu_upbound < upbound:
+                upbound = nu_upbound
+                distances[target] = upbound
+
+        for i in range(len(active_nodes)):
+            act_nod = active_nodes[i]
+            act_wt = active_weights[i]
+            if act_wt > distances[act_nod]:
+                continue
+            aug_wt = act_wt + potentials[act_nod]
+            if aug_wt > upbound:
+                continue
+            distances[act_nod] = act_wt
+            heappush(queue, (aug_wt, act_wt, act_nod, curnode))
+
+    if not found:
+        raise nx.NetworkXNoPath(f"Node {target} not reachable from {source}")
+
+    path = []
+    node = target
+    while node != -1:
+        assert len(path) < num_nodes, "Node " + str(node) + " duplicated in discovered path"
+        path.append(int(node))
+        node = parents[node]
+    path.reverse()
+    return path, {}
@@ -0,0 +1,53 @@
+"""
+Created on Oct 19, 2026
+
+@author: CyberiaResurrection
+
+Storage helpers for approximate-shortest-path forests.
+
+When a forest stores its distance labels as float32, labels must be rounded _down_ so lower bounds derived from them
+stay admissible, and max-neighbour labels rounded _up_ so they never prune a node that should have been processed.
+"""
+import numpy as np
+
+# Per tree, a forest holds one distance-label column and one max-neighbour-label column, and each bulk lower-bound call
+# materialises one more nodes-by-trees temporary.  Hence each tree costs three node-length columns of storage.
+COLUMNS_PER_TREE = 3
+
+
+def round_down_float32(values: np.ndarray) -> np.ndarray:
+    result = np.asarray(values, dtype=np.float64).astype(np.float32)
+    over = result > values
+    result[over] = np.nextafter(result[over], np.float32('-inf'))
+    return result
+
+
+def round_up_float32(values: np.ndarray) -> np.ndarray:
+    result = np.asarray(values, dtype=np.float64).astype(np.float32)
+    under = result < values
+    result[under] = np.nextafter(result[under], np.float32('+inf'))
+    return result
+
+
+def float32_slack(values: np.ndarray) -> float:
+    """
+    Given a float32 distance-label column, return how much a lower bound calculated from float32 labels can exceed one
+    calculated from the original float64 labels.  Rounding each label down loses up to one ulp, and the float32
+    subtraction can round up by half an ulp, so two ulps of the largest finite label cover both.
+    """
+    finite = values[np.isfinite(values)]
+    if 0 == len(finite):
+        return 0.0
+    return 2 * float(np.spacing(np.max(np.abs(finite)).astype(np.float32)))
+
+
+def max_trees_for_budget(num_nodes: int, budget_mib: int, float32: bool = False) -> int:
+    """
+    Given number of nodes in the pathfinding graph and a memory budget in MiB, return the largest number of
+    landmark trees whose forest storage fits inside that budget.  Always returns at least 1.
+    """
+    if 0 >= num_nodes:
+        return 1
+    itemsize = 4 if float32 else 8
+    tree_bytes = num_nodes * itemsize * COLUMNS_PER_TREE
+    return max(1, (budget_mib * 1024 * 1024) // tree_bytes)
@@ -3,7 +3,7 @@
 
 from libcpp.vector cimport vector
 
-cdef extern from "_minmaxheap.h" namespace "minmaxheap":
+cdef extern from "_minmaxheap.h" namespace "minmaxheap" nogil:
 	cdef struct astar_t:
 		double augment;
 		double dist;
@@ -11,6 +11,7 @@ HexPos: TypeAlias = Tuple[int, int]
 
 
 class Hex(object):
+    __slots__ = 'position', 'row', 'col', 'dx', 'dy', 'q', 'r', '_hash', '_hex_position'
 
     DOWN_RIGHT = 0
     UP_RIGHT = 1
@@ -20,12 +21,12 @@ class Hex(object):
     DOWN = 5
 
     position: str  # Hex location
-    row: int = 0  # Location in the sector.
-    col: int = 0
-    dx: int = 0  # location in the whole space, row/column coordinate
-    dy: int = 0
-    q: int = 0   # location in the whole of space, axial coordinates
-    r: int = 0
+    row: int  # Location in the sector.
+    col: int
+    dx: int  # location in the whole space, row/column coordinate
+    dy: int
+    q: int   # location in the whole of space, axial coordinates
+    r: int
 
     # Hex-side alias constants
     BOTTOM = 1
@@ -49,6 +50,7 @@ class Hex(object):
         self.dy = sector.y * 40 + self.row - 1
         self.q, self.r = Hex.hex_to_axial(self.dx, Hex.dy_offset(self.row, sector.y))
         self._hash = hash((self.position, self.dx, self.dy))
+        self._hex_position = (self.q, self.r)
 
     def __str__(self):
         return f"{self.col:02d}{self.row:02d}"
@@ -94,9 +96,8 @@ class Hex(object):
     def _hex_core(dx: int, dy: int, dz: int) -> int:
         return max(abs(dx), abs(dy), abs(dz))
 
-    @functools.cache
     def hex_position(self) -> HexPos:
-        return self.q, self.r
+        return self._hex_position
 
     def get_neighbour(self, direction: int, distance: int = 1) -> HexPos:
         return Hex.get_neighbor(self.hex_position(), direction, distance)
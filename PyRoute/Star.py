@@ -3,12 +3,11 @@ Created on Mar 5, 2014
 
 @author: tjoneslo
 """
-import functools
 import logging
 import bisect
 import random
 
-from typing import Tuple, Optional
+from typing import Any, Tuple, Optional
 from typing_extensions import TypeAlias
 
 from PyRoute.Position.Hex import Hex
@@ -22,16 +21,40 @@ from PyRoute.SystemData.StarList import StarList
 HexPos: TypeAlias = Tuple[int, int]
 
 
+class StarportRecord(object):
+    """
+    Starport size, budget and population for a single world, split out of Star as most worlds never have them set.
+    """
+    __slots__ = 'size', 'budget', 'pop'
+
+    ZERO: 'StarportRecord'
+
+    def __init__(self, size: Optional[int] = None, budget: Optional[int] = None, pop: Optional[int] = None):
+        self.size = size
+        self.budget = budget
+        self.pop = pop
+
+    def __setattr__(self, key, value):
+        assert self is not getattr(StarportRecord, 'ZERO', None), "Shared zero starport record must not be modified"  # pragma: no mutate
+        super().__setattr__(key, value)
+
+
+StarportRecord.ZERO = StarportRecord(0, 0, 0)
+
+
 class Star(object):
-    __slots__ = '__dict__', 'worlds', 'ggCount', 'belts', 'nobles', 'logger', '_hash', '_key', 'component', 'index',\
+    __slots__ = 'worlds', 'ggCount', 'belts', 'nobles', 'logger', '_hash', '_key', 'component', 'index',\
                 'gwp', 'population', 'perCapita', 'mspr', 'wtn', 'ru', 'ownedBy', 'name', 'sector', 'position', 'uwp',\
-                'popM', 'uwpCodes', 'tradeCode', 'economics', 'social', 'baseCode', 'zone', 'alg_code',\
+                'popM', 'uwpCodes', 'tradeCode', 'economics', 'social', 'baseCode', 'zone', '_alg_code',\
                 'allegiance_base', 'alg_base_code', 'ship_capacity', 'tcs_gwp', 'budget', 'importance', 'eti_cargo',\
                 'eti_passenger', 'raw_be', 'im_be', 'col_be', 'star_list_object', 'routes', 'stars', 'is_enqueued',\
                 'is_target', 'is_landmark', '_pax_btn_mod', 'suppress_soph_percent_warning', 'is_redzone', 'hex',\
                 'deep_space_station', '_oldskool', 'tradeIn', 'tradeOver', 'tradeCount', 'passIn', 'passOver',\
-                'starportSize', 'starportBudget', 'starportPop', 'index', 'trade_cost', 'trade_id', 'eti_cargo_volume',\
-                'eti_worlds', 'eti_pass_volume'
+                '_starport', '_hex_position', '_alg_id', 'trade_cost', 'trade_id', 'eti_cargo_volume', 'eti_worlds',\
+                'eti_pass_volume'
+
+    # Properties that are serialised alongside the slots, as their values live in side records
+    state_properties = ('alg_code', 'starportSize', 'starportBudget', 'starportPop')
 
     def __init__(self):
         self.worlds = None
@@ -97,18 +120,19 @@ class Star(object):
         self.trade_id = ""
         self.passIn = None
         self.passOver = None
-        self.starportSize = None
-        self.starportBudget = None
-        self.starportPop = None
+        # Starport size, budget and population are only filled in for a minority of worlds, so live in a side record
+        self._starport = None
+        self._hex_position = None
 
     def __getstate__(self):
-        state = self.__dict__.copy()
-        for item in Star.__slots__:
-            if item in state:
-                continue
+        state = {}
+        for item in Star.__slots__ + Star.state_properties:
             if item.startswith('_'):
                 continue
             state[item] = self[item]
+        if self.uwpCodes is not None:
+            # Serialised as the plain dict the code record stands in for
+            state['uwpCodes'] = dict(self.uwpCodes)
         del state['sector']
         del state['logger']
         # del state['_hash']
@@ -117,8 +141,8 @@ class Star(object):
         return state
 
     def __deepcopy__(self, memodict: dict = {}):
-        state = self.__dict__.copy()
-        for item in Star.__slots__:
+        state = {}
+        for item in Star.__slots__ + Star.state_properties:
             if item.startswith('_'):
                 continue
             state[item] = self[item]
@@ -251,6 +275,7 @@ class Star(object):
 
     @port.setter
     def port(self, value) -> None:
+        self.uwp = self.uwp.unshared()
         self.uwp.port = str(value)
 
     @property
@@ -287,6 +312,7 @@ class Star(object):
 
     @tl.setter
     def tl(self, value) -> None:
+        self.uwp = self.uwp.unshared()
         self.uwp.tl = value
 
     @property
@@ -309,9 +335,68 @@ class Star(object):
     def oldskool(self) -> bool:
         return self.uwp.oldskool is True
 
-    @functools.cached_property
+    @property
     def hex_position(self) -> HexPos:
-        return self.hex.hex_position()
+        if self._hex_position is None:
+            self._hex_position = self.hex.hex_position()
+        return self._hex_position
+
+    @property
+    def alg_code(self) -> Any:
+        return self._alg_code
+
+    @alg_code.setter
+    def alg_code(self, value) -> None:
+        self._alg_code = value
+        self._alg_id = AllyGen.alg_id(value)
+
+    @property
+    def alg_id(self) -> int:
+        """
+        Integer id of this world's allegiance code, for indexing AllyGen's alliance matrices and columns
+        """
+        return self._alg_id
+
+    @property
+    def starportSize(self) -> Optional[int]:
+        return None if self._starport is None else self._starport.size
+
+    @starportSize.setter
+    def starportSize(self, value: Optional[int]) -> None:
+        self._set_starport('size', value)
+
+    @property
+    def starportBudget(self) -> Optional[int]:
+        return None if self._starport is None else self._starport.budget
+
+    @starportBudget.setter
+    def starportBudget(self, value: Optional[int]) -> None:
+        self._set_starport('budget', value)
+
+    @property
+    def starportPop(self) -> Optional[int]:
+        return None if self._starport is None else self._starport.pop
+
+    @starportPop.setter
+    def starportPop(self, value: Optional[int]) -> None:
+        self._set_starport('pop', value)
+
+    def clear_starport(self) -> None:
+        """
+        Reset starport size, budget and population to zero without allocating a side record per world.
+        """
+        self._starport = StarportRecord.ZERO
+
+    def _set_starport(self, field: str, value: Optional[int]) -> None:
+        if self._starport is None:
+            if value is None:
+                return
+            self._starport = StarportRecord()
+        elif self._starport is StarportRecord.ZERO:
+            if 0 == value:
+                return
+            self._starport = StarportRecord(0, 0, 0)
+        setattr(self._starport, field, value)
 
     def distance(self, star) -> int:
         return Hex.axial_distance(self.hex_position, star.hex_position)
@@ -722,8 +807,7 @@ class Star(object):
         return Utilities.int_to_ehex(value)
 
     def split_stellar_data(self) -> None:
-        self.star_list_object = StarList(self.stars)
-        self.star_list_object.move_biggest_to_primary()
+        self.star_list_object = StarList.intern(self.stars)
 
     def extract_routes(self) -> None:
         str_split = self.stars.split()
@@ -783,6 +867,8 @@ class Star(object):
         self._pax_btn_mod = rich + capital
 
     def canonicalise(self) -> None:
+        self.uwp = self.uwp.unshared()
+        self.star_list_object = self.star_list_object.unshared()
         self.uwp.canonicalise()
         self.tradeCode.canonicalise(self)
         self.fix_tl()
@@ -0,0 +1,278 @@
+"""
+Created on Oct 19, 2026
+
+@author: CyberiaResurrection
+"""
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from PyRoute.Star import Star
+from PyRoute.StatCalculation.ObjectStatistics import ObjectStatistics
+
+
+class StatAggregator(object):
+    """
+    StatCalculation.add_stats and max_tl over every (world, statistics) pair at once, as a group-by over columns of
+    world values rather than one world and one statistics object at a time.
+
+    Pairs are added in the order add_stats would be called, and each statistics object ends up exactly as if it had
+    been - sums are accumulated in world order, ints stay ints, and keyed counts and homeworlds go in in the order
+    they're first seen.
+    """
+    ports = 'ABCDEX?'
+
+    # Sophont population changes: listed sophonts' populations and dieback, and the remainder going to the default
+    # sophont on a world's first pair and on its later pairs
+    ADD = 0
+    DIEBACK = 1
+    FIRST_REST = 2
+    LATER_REST = 3
+
+    # ObjectStatistics field, and the world value summed into it
+    sum_fields = [
+        ('population', lambda star: star.population),
+        ('economy', lambda star: star.gwp),
+        ('sum_ru', lambda star: star.ru),
+        ('shipyards', lambda star: star.ship_capacity),
+        ('tradeVol', lambda star: star.tradeOver + star.tradeIn),
+        ('col_be', lambda star: star.col_be),
+        ('im_be', lambda star: star.im_be),
+        ('passengers', lambda star: star.passIn),
+        ('spa_people', lambda star: star.starportPop),
+        ('worlds', lambda star: star.worlds),
+        ('eti_cargo', lambda star: star.eti_cargo_volume),
+        ('eti_pass', lambda star: star.eti_pass_volume),
+        ('number', lambda star: 1),
+        ('gg_count', lambda star: 1 if star.ggCount else 0),
+        ('eti_worlds', lambda star: 1 if star.eti_cargo_volume > 0 or star.eti_pass_volume > 0 else 0),
+        ('stars', lambda star: len(star.star_list) if star.star_list else 0)
+    ]
+
+    split_bases = {'A': 'NS', 'B': 'NW', 'F': 'KM', 'H': 'CK', 'U': 'TR', 'Z': 'KM'}
+
+    def __init__(self, worlds: list[Star]) -> None:
+        self.worlds = worlds
+        self.buckets: list[ObjectStatistics] = []
+        self.bucket_ids: dict[int, int] = {}
+        self.pair_world: list[int] = []
+        self.pair_bucket: list[int] = []
+        self.pair_max_tl: list[bool] = []
+
+    def add(self, world: int, stats: ObjectStatistics, max_tl: bool) -> None:
+        """
+        Queue add_stats(stats, worlds[world]), and max_tl for the same pair if max_tl is set.
+        """
+        bucket = self.bucket_ids.get(id(stats), None)
+        if bucket is None:
+            bucket = len(self.buckets)
+            self.bucket_ids[id(stats)] = bucket
+            self.buckets.append(stats)
+        self.pair_world.append(world)
+        self.pair_bucket.append(bucket)
+        self.pair_max_tl.append(max_tl)
+
+    def aggregate(self, sophont_breakdown: Callable[[Star], tuple[list, str, float]],
+                  default_sophont: Callable[[Star, float], bool]) -> None:
+        """
+        Apply every queued pair to its statistics.  Each world's sophont populations are split out once, by
+        sophont_breakdown, with default_sophont deciding whether the remainder goes to its default sophont.
+        """
+        if 0 == len(self.pair_world):
+            return
+        world = np.array(self.pair_world, dtype=np.int64)
+        bucket = np.array(self.pair_bucket, dtype=np.int64)
+        worlds = self.worlds
+
+        for name, value in self.sum_fields:
+            self._sum(name, [value(star) for star in worlds], world, bucket)
+
+        homeworld = np.array([bool(star.tradeCode.homeworld) for star in worlds], dtype=bool)
+        for pair in np.flatnonzero(homeworld[world]).tolist():
+            self.buckets[self.pair_bucket[pair]].homeworlds.append(worlds[self.pair_world[pair]])
+
+        self._sophonts(world, bucket, sophont_breakdown, default_sophont)
+
+        self._count('port_size', [[star.starportSize, star.port] for star in worlds], world, bucket)
+        self._count('code_counts', [star.tradeCode.codes for star in worlds], world, bucket)
+        self._count('bases', [self._bases(star) for star in worlds], world, bucket)
+        self._count('star_count', [[len(star.star_list)] if star.star_list else [] for star in worlds], world,
+                    bucket)
+        primaries = [[self._primary_type(star)] if star.star_list else [] for star in worlds]
+        self._count('primary_count', primaries, world, bucket)
+        for bucket_id in np.unique(bucket[np.array([0 < len(primary) for primary in primaries])[world]]).tolist():
+            assert None not in self.buckets[bucket_id].primary_count, "Null primary type will blow up templating"
+
+        max_tl = np.array(self.pair_max_tl, dtype=bool)
+        self._max_tl(world[max_tl], bucket[max_tl])
+
+    @staticmethod
+    def _primary_type(star: Star) -> str:
+        primary_type = star.primary_type
+        assert primary_type is not None, "Null primary type will blow up templating"
+        return primary_type
+
+    def _bases(self, star: Star) -> list[str]:
+        bases = []
+        for code in star.baseCode:
+            if code == '-':
+                continue
+            for base in self.split_bases.get(code, code):
+                bases.append(ObjectStatistics.base_mapping[base])
+        return bases
+
+    def _sum(self, name: str, values: list[Any], world: np.ndarray, bucket: np.ndarray) -> None:
+        """
+        Sum values into field name, in world order, as repeated += would.  Ints stay ints unless a float is added.
+        """
+        num_buckets = len(self.buckets)
+        existing = [stats[name] for stats in self.buckets]
+        is_float = np.array([isinstance(value, float) for value in values], dtype=bool)
+        int_values = np.array([0 if isinstance(value, float) else value for value in values], dtype=np.int64)
+        int_sums = np.zeros(num_buckets, dtype=np.int64)
+        np.add.at(int_sums, bucket, int_values[world])
+        if not is_float.any():
+            for bucket_id, total in enumerate(int_sums.tolist()):
+                self.buckets[bucket_id][name] = existing[bucket_id] + total
+            return
+
+        # Float sums start from what's already there, so each one is added in the same order as repeated += would
+        float_sums = np.array(existing, dtype=np.float64)
+        np.add.at(float_sums, bucket, np.array(values, dtype=np.float64)[world])
+        has_float = np.array([isinstance(value, float) for value in existing], dtype=bool)
+        np.logical_or.at(has_float, bucket, is_float[world])
+        for bucket_id, (total, int_total, floating) in enumerate(zip(float_sums.tolist(), int_sums.tolist(),
+                                                                     has_float.tolist())):
+            self.buckets[bucket_id][name] = total if floating else existing[bucket_id] + int_total
+
+    def _sophonts(self, world: np.ndarray, bucket: np.ndarray,
+                  sophont_breakdown: Callable[[Star], tuple[list, str, float]],
+                  default_sophont: Callable[[Star, float], bool]) -> None:
+        """
+        Add each world's sophont populations to every statistics it's paired with, as add_pop_to_sophont would, but
+        splitting each world's population between its sophonts only once.
+        """
+        worlds = self.worlds
+        num_pairs = len(world)
+        # Worlds are split up in the order they're first paired, so any sophont percentage warnings come out in the
+        # same order as pair by pair
+        used, first_pair = np.unique(world, return_index=True)
+        first_of_world = np.full(len(worlds), -1, dtype=np.int64)
+        first_of_world[used] = first_pair
+
+        code_ids: dict[str, int] = {}
+        flat_code: list[int] = []
+        flat_population: list[int] = []
+        flat_home: list[Optional[Star]] = []
+        flat_kind: list[int] = []
+        starts = np.zeros(len(worlds), dtype=np.int64)
+        lengths = np.zeros(len(worlds), dtype=np.int64)
+        for world_id in used[np.argsort(first_pair)].tolist():
+            star = worlds[world_id]
+            starts[world_id] = len(flat_kind)
+            populations, default_soph, total_pct = sophont_breakdown(star)
+            for soph_code, population, home in populations:
+                flat_code.append(code_ids.setdefault(soph_code, len(code_ids)))
+                flat_population.append(0 if population is None else population)
+                flat_home.append(None if population is None else home)
+                flat_kind.append(self.DIEBACK if population is None else self.ADD)
+            # Only the first default_sophont call for a world can switch off its percentage warnings, so every
+            # call after that gives the same answer as the second
+            for kind in [self.FIRST_REST, self.LATER_REST]:
+                if default_sophont(star, total_pct):
+                    flat_code.append(code_ids.setdefault(default_soph, len(code_ids)))
+                    flat_population.append(int(star.population * (total_pct / 100.0)))
+                    flat_home.append(None)
+                    flat_kind.append(kind)
+            lengths[world_id] = len(flat_kind) - starts[world_id]
+
+        pair_lengths = lengths[world]
+        total = int(pair_lengths.sum())
+        if 0 == total:
+            return
+        pair_starts = np.cumsum(pair_lengths) - pair_lengths
+        rows = np.repeat(np.arange(num_pairs), pair_lengths)
+        flat = starts[world][rows] + np.arange(total) - np.repeat(pair_starts, pair_lengths)
+        kind = np.array(flat_kind, dtype=np.int64)[flat]
+        is_first = (first_of_world[world] == np.arange(num_pairs))[rows]
+        keep = ((kind == self.ADD) | (kind == self.DIEBACK) | ((kind == self.FIRST_REST) & is_first) |
+                ((kind == self.LATER_REST) & ~is_first))
+        rows = rows[keep]
+        flat = flat[keep]
+        kind = kind[keep]
+
+        num_codes = len(code_ids)
+        combined = bucket[rows] * num_codes + np.array(flat_code, dtype=np.int64)[flat]
+        unique, first, group = np.unique(combined, return_index=True, return_inverse=True)
+        num_groups = len(unique)
+        position = np.arange(len(rows))
+        is_dieback = kind == self.DIEBACK
+        # Dieback sets the population to -1, so only what's added after the last one counts
+        last_dieback = np.full(num_groups, -1, dtype=np.int64)
+        np.maximum.at(last_dieback, group, np.where(is_dieback, position, -1))
+        counted = ~is_dieback & (position > last_dieback[group])
+        population = np.zeros(num_groups, dtype=np.int64)
+        np.add.at(population, group, np.where(counted, np.array(flat_population, dtype=np.int64)[flat], 0))
+        count = np.zeros(num_groups, dtype=np.int64)
+        np.add.at(count, group, (~is_dieback).astype(np.int64))
+
+        code_list = list(code_ids)
+        for group_id in np.argsort(first).tolist():
+            pair_key = int(unique[group_id])
+            soph = self.buckets[pair_key // num_codes].populations[code_list[pair_key % num_codes]]
+            if 0 <= last_dieback[group_id]:
+                soph.population = -1 + int(population[group_id])
+            else:
+                soph.population += int(population[group_id])
+            soph.count += int(count[group_id])
+
+        for row, flat_id in zip(rows.tolist(), flat.tolist()):
+            home = flat_home[flat_id]
+            if home:
+                self.buckets[self.pair_bucket[row]].populations[code_list[flat_code[flat_id]]].homeworlds.append(home)
+
+    def _count(self, name: str, keys: list[list[Any]], world: np.ndarray, bucket: np.ndarray) -> None:
+        """
+        Count each world's keys into dict field name, with new keys going in the order they're first seen.
+        """
+        key_ids: dict[Any, int] = {}
+        flat = np.array([key_ids.setdefault(key, len(key_ids)) for world_keys in keys for key in world_keys],
+                        dtype=np.int64)
+        lengths = np.array([len(world_keys) for world_keys in keys], dtype=np.int64)
+        pair_lengths = lengths[world]
+        total = int(pair_lengths.sum())
+        if 0 == total:
+            return
+        starts = np.cumsum(lengths) - lengths
+        pair_starts = np.cumsum(pair_lengths) - pair_lengths
+        rows = np.repeat(np.arange(len(world)), pair_lengths)
+        within = np.arange(total) - np.repeat(pair_starts, pair_lengths)
+        num_keys = len(key_ids)
+        combined = bucket[rows] * num_keys + flat[starts[world][rows] + within]
+
+        unique, first, counts = np.unique(combined, return_index=True, return_counts=True)
+        order = np.argsort(first)
+        key_list = list(key_ids)
+        for pair_key, count in zip(unique[order].tolist(), counts[order].tolist()):
+            self.buckets[pair_key // num_keys][name][key_list[pair_key % num_keys]] += count
+
+    def _max_tl(self, world: np.ndarray, bucket: np.ndarray) -> None:
+        if 0 == len(world):
+            return
+        worlds = self.worlds
+        num_buckets = len(self.buckets)
+        max_tl = np.array([stats.maxTL for stats in self.buckets], dtype=np.int64)
+        np.maximum.at(max_tl, bucket, np.array([star.tl for star in worlds], dtype=np.int64)[world])
+        max_pop = np.array([stats.maxPop for stats in self.buckets], dtype=np.int64)
+        np.maximum.at(max_pop, bucket, np.array([star.popCode for star in worlds], dtype=np.int64)[world])
+        max_port = np.array([self.ports.index(stats.maxPort) for stats in self.buckets], dtype=np.int64)
+        np.minimum.at(max_port, bucket,
+                      np.array([self.ports.index(star.uwpCodes['Starport']) for star in worlds], dtype=np.int64)[world])
+
+        touched = np.zeros(num_buckets, dtype=bool)
+        touched[bucket] = True
+        for bucket_id in np.flatnonzero(touched).tolist():
+            stats = self.buckets[bucket_id]
+            stats.maxTL = int(max_tl[bucket_id])
+            stats.maxPop = int(max_pop[bucket_id])
+            stats.maxPort = self.ports[max_port[bucket_id]]
@@ -5,11 +5,13 @@ Created on Mar 17, 2014
 """
 import logging
 import math
+from typing import Optional
 
 from PyRoute.Star import Star
 from PyRoute.wikistats import WikiStats
 from PyRoute.Allies.AllyGen import AllyGen
 from PyRoute.StatCalculation.ObjectStatistics import ObjectStatistics
+from PyRoute.StatCalculation.StatAggregator import StatAggregator
 from PyRoute.StatCalculation.UWPCollection import UWPCollection
 
 
@@ -35,41 +37,42 @@ class StatCalculation(object):
         self.galaxy.trade.cross_check_totals()
 
         self.logger.info('Calculating statistics for {:d} worlds'.format(len(self.galaxy.stars)))
-        for sector in self.galaxy.sectors.values():
-            for star in sector.worlds:
-                star.starportSize = max(self.trade_to_btn(star.tradeIn + star.tradeOver) - 5, 0)
-                star.uwpCodes['Starport Size'] = star.starportSize
-                # Budget in MCr
-                star.starportBudget = \
-                    ((star.tradeIn // 10000) * 150 + (star.tradeOver // 10000) * 140 +  # pragma: no mutate
-                     (star.passIn) * 500 + (star.passOver) * 460) // 1000000  # pragma: no mutate
-
-                # Population in people employed.
-                star.starportPop = int(star.starportBudget / 0.2)
-
-                self.add_stats(sector.stats, star)
-                self.add_stats(self.galaxy.stats, star)
-                self.add_stats(sector.subsectors[star.subsector()].stats, star)
-
-                self.max_tl(sector.stats, star)
-                self.max_tl(sector.subsectors[star.subsector()].stats, star)
-
-                self.add_alg_stats(self.galaxy, star, star.alg_code)
-                self.add_alg_stats(sector, star, star.alg_code)
-                self.add_alg_stats(sector.subsectors[star.subsector()], star, star.alg_code)
-
-                if star.alg_base_code != star.alg_code:
-                    self.add_alg_stats(self.galaxy, star, star.alg_base_code)
-                    self.add_alg_stats(sector, star, star.alg_base_code)
-                    self.add_alg_stats(sector.subsectors[star.subsector()], star, star.alg_base_code)
+        sector_worlds = [(sector, star) for sector in self.galaxy.sectors.values() for star in sector.worlds]
+        aggregator = StatAggregator([star for _, star in sector_worlds])
+        for index, (sector, star) in enumerate(sector_worlds):
+            star.starportSize = max(self.trade_to_btn(star.tradeIn + star.tradeOver) - 5, 0)
+            star.uwpCodes['Starport Size'] = star.starportSize
+            # Budget in MCr
+            star.starportBudget = \
+                ((star.tradeIn // 10000) * 150 + (star.tradeOver // 10000) * 140 +  # pragma: no mutate
+                 (star.passIn) * 500 + (star.passOver) * 460) // 1000000  # pragma: no mutate
+
+            # Population in people employed.
+            star.starportPop = int(star.starportBudget / 0.2)
+
+            # Queue up the add_stats (and max_tl) calls for each world, to be applied in bulk
+            subsector = sector.subsectors[star.subsector()]
+            aggregator.add(index, sector.stats, True)
+            aggregator.add(index, self.galaxy.stats, False)
+            aggregator.add(index, subsector.stats, True)
+
+            for area in [self.galaxy, sector, subsector]:
+                aggregator.add(index, area.alg[star.alg_code].stats, True)
+
+            if star.alg_base_code != star.alg_code:
+                for area in [self.galaxy, sector, subsector]:
+                    aggregator.add(index, area.alg[star.alg_base_code].stats, True)
+
+            if AllyGen.imperial_align(star.alg_code):
+                for uwpCode, uwpValue in star.uwpCodes.items():
+                    aggregator.add(index, self.imp_uwp.stats(uwpCode, uwpValue), False)
 
-                if AllyGen.imperial_align(star.alg_code):
-                    for uwpCode, uwpValue in star.uwpCodes.items():
-                        self.add_stats(self.imp_uwp.stats(uwpCode, uwpValue), star)
+            for uwpCode, uwpValue in star.uwpCodes.items():
+                aggregator.add(index, self.all_uwp.stats(uwpCode, uwpValue), False)
 
-                for uwpCode, uwpValue in star.uwpCodes.items():
-                    self.add_stats(self.all_uwp.stats(uwpCode, uwpValue), star)
+        aggregator.aggregate(self.sophont_breakdown, self.default_sophont_population)
 
+        for sector in self.galaxy.sectors.values():
             self.per_capita(sector.worlds, sector.stats)  # Per capita sector stats
             sector.alg_sorted = AllyGen.sort_allegiances(sector.alg, ally_match)
             for alg in sector.alg_sorted:
@@ -99,15 +102,29 @@ class StatCalculation(object):
         self.galaxy.trade.is_sector_pass_balanced()
         self.galaxy.trade.is_sector_trade_volume_balanced()
 
-    def add_alg_stats(self, area, star, alg) -> None:
-        algStats = area.alg[alg].stats
-        self.add_stats(algStats, star)
-        self.max_tl(algStats, star)
-
     def add_pop_to_sophont(self, stats, star) -> None:
+        populations, default_soph, total_pct = self.sophont_breakdown(star)
+        for soph_code, population, home in populations:
+            # population is None for dieback or extinct.
+            if population is None:
+                stats.populations[soph_code].population = -1
+            else:
+                stats.populations[soph_code].add_population(population, home)
+
+        if self.default_sophont_population(star, total_pct):
+            stats.populations[default_soph].add_population(int(star.population * (total_pct / 100.0)), None)
+
+    @staticmethod
+    def sophont_breakdown(star) -> tuple[list[tuple[str, Optional[int], Optional[Star]]], str, float]:
+        """
+        Split star's population between its sophonts, as (sophont code, population, homeworld) in the order they're
+        listed, with population None for dieback or extinct sophonts.  Also returns the sophont for the remainder,
+        and the percentage left over for it.
+        """
         total_pct = 100.0
         default_soph = 'Huma'
         home = None
+        populations: list[tuple[str, Optional[int], Optional[Star]]] = []
         for sophont in star.tradeCode.sophonts:
             soph_code = sophont[0:4]
             soph_pct = sophont[4:]
@@ -129,26 +146,33 @@ class StatCalculation(object):
 
             # Soph_pct == 'X' is dieback or extinct.
             if old_soph_pct == 'X':
-                stats.populations[soph_code].population = -1
+                populations.append((soph_code, None, home))
             # skip the empty worlds
             elif not star.tradeCode.barren:
-                stats.populations[soph_code].add_population(int(star.population * (soph_pct / 100.0)), home)
+                populations.append((soph_code, int(star.population * (soph_pct / 100.0)), home))
 
             total_pct -= soph_pct
 
         if not isinstance(home, (Star, type(None))):
             raise ValueError
+        return populations, default_soph, total_pct
+
+    def default_sophont_population(self, star, total_pct) -> bool:
+        """
+        Whether the remainder of star's population, total_pct percent of it, goes to its default sophont.
+        """
         # We don't need to hear umpteen times that a given star has bad sophont percentages - just once will do
         squish = star.suppress_soph_percent_warning is True
 
         if total_pct < -5 and not squish:  # pragma: no mutate
             self.logger.warning("{} has sophont percent over 100%: {}".format(star, total_pct))
             star.suppress_soph_percent_warning = True
+            return False
         elif total_pct < 0 and not squish:
             self.logger.info("{} has a sophont percent just over 100%: {}".format(star, total_pct))
             star.suppress_soph_percent_warning = True
-        elif not star.tradeCode.barren:
-            stats.populations[default_soph].add_population(int(star.population * (total_pct / 100.0)), None)
+            return False
+        return not star.tradeCode.barren
 
     def add_stats(self, stats, star) -> None:
         stats.population += star.population
@@ -249,7 +273,7 @@ class StatCalculation(object):
             if target.position == owner_hex:
                 target.tradeCode.append("C:{}-{}".format(world.sector[0:4], world.position))
 
-    def write_statistics(self, ally_count, ally_match, json_data) -> None:
+    def write_statistics(self, ally_count, ally_match, json_data, mp_threads=1) -> None:
         self.logger.info('Charted star count: ' + str(self.galaxy.stats.number))
         self.logger.info('Charted population {:,d}'.format(self.galaxy.stats.population))
 
@@ -268,10 +292,11 @@ class StatCalculation(object):
 
             self.logger.debug("min count: {}, match: {}".format(ally_count, ally_match))
 
-        self._write_statistics_to_wiki(ally_count, ally_match, json_data)
+        self._write_statistics_to_wiki(ally_count, ally_match, json_data, mp_threads=mp_threads)
 
-    def _write_statistics_to_wiki(self, ally_count, ally_match, json_data):
-        wiki = WikiStats(self.galaxy, self.all_uwp, ally_count, ally_match, json_data)  # pragma: no mutate
+    def _write_statistics_to_wiki(self, ally_count, ally_match, json_data, mp_threads=1):
+        wiki = WikiStats(self.galaxy, self.all_uwp, ally_count, ally_match, json_data,
+                         mp_threads=mp_threads)  # pragma: no mutate
         wiki.write_statistics()  # pragma: no mutate
 
     @staticmethod
@@ -16,7 +16,12 @@ class UWPCollection(object):
             self.uwp[uwpCode] = {}
 
     def stats(self, code, value) -> ObjectStatistics:
-        return self.uwp[code].setdefault(value, ObjectStatistics())
+        # Only build a new ObjectStatistics when there isn't one already - setdefault would build one every time
+        stats = self.uwp[code].get(value, None)
+        if stats is None:
+            stats = ObjectStatistics()
+            self.uwp[code][value] = stats
+        return stats
 
     def __getitem__(self, index):
         return self.uwp[index]
@@ -7,6 +7,7 @@ Along the lines of TradeCodes, pull all the system-star handling, checking, etc
 stars, rather than the multi-concern mashup that is the Star class
 
 """
+import copy
 import re
 from typing import Optional
 
@@ -14,6 +15,7 @@ from PyRoute.SystemData.SystemStar import SystemStar
 
 
 class StarList(object):
+    __slots__ = 'stars_line', 'stars_list', '_shared'
 
     stellar_line = '([OBAFGKM][0-9] ?(?:Ia|Ib|III|II|IV|VII|VI|V|D)|D|NS|PSR|BH|BD)'
     star_line = '^([OBAFGKM])([0-9]) ?(Ia|Ib|III|II|IV|VI|V)'
@@ -45,7 +47,12 @@ class StarList(object):
     }
     max_fill = 8
 
+    # Parsed, primary-first star lists shared between every world with the same stellar string - see StarList.intern
+    interned: dict[str, 'StarList'] = {}
+    _shared: bool
+
     def __init__(self, stars_line, trim_stars=False):
+        object.__setattr__(self, '_shared', False)
         # Count C as a typoed V, given their adjacency on QWERTY keyboards
         stars_line = stars_line.replace(' IC', ' IV')
         stars_line = stars_line.replace(' C', ' V')
@@ -84,6 +91,43 @@ class StarList(object):
                 item = SystemStar(bitz[1], bitz[0][0], int(bitz[0][1]))
             self.stars_list.append(item)
 
+    def __setattr__(self, key, value):
+        assert not self._shared, "Shared star list " + str(self) + " must be unshared before being changed"
+        super().__setattr__(key, value)
+
+    def __getstate__(self):
+        # Copies of a shared star list are private to their new owner
+        return {key: getattr(self, key) for key in StarList.__slots__ if '_shared' != key}
+
+    def __setstate__(self, state):
+        object.__setattr__(self, '_shared', False)
+        for key, value in state.items():
+            setattr(self, key, value)
+
+    @staticmethod
+    def intern(stars_line: str) -> 'StarList':
+        """
+        Return the shared star list parsed from stars_line, with its biggest star moved to primary, parsing it on first
+        request.  Shared star lists are read-only - a world about to change its star list swaps in a private copy via
+        unshared() first.
+        """
+        item = StarList.interned.get(stars_line, None)
+        if item is None:
+            item = StarList(stars_line)
+            item.move_biggest_to_primary()
+            for star in item.stars_list:
+                star._shared = True
+            item._shared = True
+            StarList.interned[stars_line] = item
+        return item
+
+    @property
+    def is_shared(self) -> bool:
+        return self._shared
+
+    def unshared(self) -> 'StarList':
+        return copy.deepcopy(self) if self._shared else self
+
     def __str__(self):
         base = ''
         for item in self.stars_list:
@@ -92,6 +136,7 @@ class StarList(object):
         return base.strip()
 
     def move_biggest_to_primary(self) -> None:
+        assert not self._shared, "Shared star list " + str(self) + " must be unshared before being changed"
         num_stars = len(self.stars_list)
         if 2 > num_stars:  # nothing to do, bail out now
             return
@@ -187,6 +232,7 @@ class StarList(object):
         return 0 == len(msg), msg
 
     def canonicalise(self) -> None:
+        assert not self._shared, "Shared star list " + str(self) + " must be unshared before being changed"
         num_stars = len(self.stars_list)
         if 0 == num_stars:
             return
@@ -8,6 +8,7 @@ from typing import Optional
 
 
 class SystemStar(object):
+    __slots__ = 'size', 'spectral', 'digit', '_shared'
 
     sizes = ["Ia", "Ib", "II", "III", "IV", "V", "VI", "D", "NS", "PSR", "BH", "BD"]
     starsizes = ["Ia", "Ib", "II", "III", "IV", "V", "VI", "D"]
@@ -32,13 +33,30 @@ class SystemStar(object):
               5: 'D', 6: 'VI', 7: 'VI', 8: 'VI'}
     }
 
+    # Set on the stars of a shared StarList - see StarList.intern
+    _shared: bool
+
     def __init__(self, size, spectral=None, digit=None):
+        object.__setattr__(self, '_shared', False)
         self.size = size
         self.spectral = spectral
         self.digit = digit
         if 'VII' == self.size:  # Reclassify archaic degenerate dwarfs as plain dwarfs
             self.size = 'D'
 
+    def __setattr__(self, key, value):
+        assert not self._shared, "Star " + str(self) + " in shared star list must be unshared before being changed"
+        super().__setattr__(key, value)
+
+    def __getstate__(self):
+        # Copies of a shared star are private to their new owner
+        return {key: getattr(self, key) for key in SystemStar.__slots__ if '_shared' != key}
+
+    def __setstate__(self, state):
+        object.__setattr__(self, '_shared', False)
+        for key, value in state.items():
+            setattr(self, key, value)
+
     def __str__(self):
         if self.spectral is None or self.digit is None:
             return self.size
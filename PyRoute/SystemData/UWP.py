@@ -6,12 +6,14 @@ Created on Nov 21, 2023
 Along the lines of TradeCodes, pull all the UWP handling, checking, etc into one single class that _just_ does UWP,
 rather than the multiple concerns the Star class has evolved to embody.
 """
+import copy
 import re
 
 from PyRoute.SystemData.Utilities import Utilities
 
 
 class UWP(object):
+    __slots__ = '_port', '_size', '_atmo', '_hydro', '_pop', '_gov', '_law', '_tl', '_shared'
     # Port code, size, atmo, hydro, pop, gov, law, the all-important hyphen, then TL
     match_string = r'^([A-HXYa-hxy\?])([0-9A-Fa-f\?])([0-9A-Za-z\?])([0-9A-Za-z\?])([0-9A-Fa-f\?])([0-9A-Xa-x\?])([0-9A-Ka-k\?])-([0-9A-Za-z\?])'
 
@@ -26,7 +28,12 @@ class UWP(object):
     law_limit = 18
     tl_limit = 33
 
+    # Parsed instances shared between every world with the same UWP string - see UWP.intern
+    interned: dict[str, 'UWP'] = {}
+    _shared: bool
+
     def __init__(self, uwp_line):
+        object.__setattr__(self, '_shared', False)
         matches = UWP.match.match(uwp_line)
         if not matches:
             raise ValueError('Input UWP malformed')
@@ -42,6 +49,39 @@ class UWP(object):
         self._law = line[6]
         self._tl = line[8]
 
+    def __setattr__(self, key, value):
+        assert not self._shared, "Shared UWP " + self.line + " must be unshared before being changed"
+        super().__setattr__(key, value)
+
+    def __getstate__(self):
+        # Copies of a shared UWP are private to their new owner
+        return {key: getattr(self, key) for key in UWP.__slots__ if '_shared' != key}
+
+    def __setstate__(self, state):
+        object.__setattr__(self, '_shared', False)
+        for key, value in state.items():
+            setattr(self, key, value)
+
+    @staticmethod
+    def intern(uwp_line: str) -> 'UWP':
+        """
+        Return the shared UWP parsed from uwp_line, parsing it on first request.  Shared UWPs are read-only - a world
+        about to change its UWP swaps in a private copy via unshared() first.
+        """
+        item = UWP.interned.get(uwp_line, None)
+        if item is None:
+            item = UWP(uwp_line)
+            item._shared = True
+            UWP.interned[uwp_line] = item
+        return item
+
+    @property
+    def is_shared(self) -> bool:
+        return self._shared
+
+    def unshared(self) -> 'UWP':
+        return copy.copy(self) if self._shared else self
+
     def __str__(self):
         return self.line
 
@@ -22,16 +22,87 @@ class TradeBalance(dict):
         self.star_field = star_field
         self.target_property = target_property
         self.logger = logging.getLogger('PyRoute.TradeBalance')
+        self._reset_totals()
+        # Units handed out to regions' stats as compensation, so running totals of those stats can be kept without
+        # re-summing them
+        self.credited = 0
+
+    # Attributes rebuilt from the balances themselves, rather than pickled
+    _totals = ('_region_balance', '_region_keys', '_sum', '_heavy_keys', '_heavy_regions')
+
+    def _reset_totals(self) -> None:
+        # Running totals, kept up to date as balances change, so nothing has to rescan every key to find imbalances.
+        # Regions go into region_balance in the order single_unit_imbalance would find them, and each region's keys
+        # into region_keys in dict order.
+        self._region_balance: dict[str, int] = {}
+        self._region_keys: dict[str, list[tuple]] = {}
+        self._sum = 0
+        # How many keys have two or more units against them, and how many regions do
+        self._heavy_keys = 0
+        self._heavy_regions = 0
+
+    # Pickle would otherwise put the balances back, through __setitem__, before the running totals exist
+    def __reduce__(self):
+        state = {key: value for key, value in self.__dict__.items() if key not in TradeBalance._totals}
+        return type(self)._restore, (state, dict(self))
+
+    @classmethod
+    def _restore(cls, state: dict, balances: dict) -> 'TradeBalance':
+        result = cls.__new__(cls)
+        result.__dict__.update(state)
+        result._reset_totals()
+        result.update(balances)
+        return result
 
     def update(self, __m, **kwargs) -> None:  # type:ignore[override]
         for key in __m:
             self._check(key, __m[key])
+        for key in __m:
+            self._track(key, __m[key])
         super().update(__m, **kwargs)  # pragma: no mutate
 
+    def __ior__(self, other) -> 'TradeBalance':  # type: ignore[misc]
+        self.update(other)
+        return self
+
     def __setitem__(self, item, value):
         self._check(item, value)
+        self._track(item, value)
         super().__setitem__(item, value)
 
+    def setdefault(self, key, default=0) -> int:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    # Balances are only ever adjusted, never dropped, so the running totals don't support taking keys out
+    def _no_removal(self, *args, **kwargs):
+        raise TypeError("Keys can't be removed from a TradeBalance")
+
+    __delitem__ = pop = popitem = clear = _no_removal
+
+    def _track(self, key: tuple, value: int) -> None:
+        """
+        Bring the running totals up to date with key's balance about to become value.
+        """
+        if key in self:
+            old = self[key]
+        else:
+            old = 0
+            for region in key:
+                if region not in self._region_balance:
+                    self._region_balance[region] = 0
+                    self._region_keys[region] = []
+                self._region_keys[region].append(key)
+
+        delta = value - old
+        self._sum += delta
+        self._heavy_keys += (1 < value) - (1 < old)
+        for region in key:
+            balance = self._region_balance[region]
+            self._region_balance[region] = balance + delta
+            self._heavy_regions += (1 < balance + delta) - (1 < balance)
+
     def log_odd_unit(self, star: Star, target: Star) -> None:
         sector_tuple = self._balance_tuple(
             star[self.star_field][self.target_property],
@@ -43,66 +114,54 @@ class TradeBalance(dict):
         if 1 < self[sector_tuple]:
             star[self.star_field].stats[self.stat_field] += 1
             target[self.star_field].stats[self.stat_field] += 1
+            self.credited += 2
             self[sector_tuple] -= 2
 
     def single_unit_imbalance(self) -> dict[str, int]:
-        sector_balance = dict()
-
-        for key in self:
-            left = key[0]
-            right = key[1]
-            if left not in sector_balance:
-                sector_balance[left] = 0
-            if right not in sector_balance:
-                sector_balance[right] = 0
-
-            balance = self[key]
-            sector_balance[left] += balance
-            sector_balance[right] += balance
-
-        return sector_balance
+        return dict(self._region_balance)
 
     def multilateral_balance(self) -> None:
-        # assemble per-sector imbalances
-        sector_balance = self.single_unit_imbalance()
+        # per-sector imbalances, kept up to date as compensation is handed out
+        sector_balance = self._region_balance
 
         # if no sector has 2 or more half-unit against it, return
-        if 0 == len(sector_balance) or 2 > max(sector_balance.values()):
+        if 0 == self._heavy_regions:
             return
         maxloops = max(sector_balance.values())
         counter = 0
 
-        while 1 < max(sector_balance.values()) and counter <= maxloops:  # pragma: no mutate
+        while 0 < self._heavy_regions and counter <= maxloops:  # pragma: no mutate
             counter += 1
+            # Compensation only changes balances, never which sectors have one, so sector_balance is safe to walk
             for key in sector_balance:
                 if 2 > sector_balance[key]:
                     continue
 
-                comp = [k for k in self.keys() if (k[0] == key or k[1] == key) and self[k] > 0]
+                comp = [k for k in self._region_keys[key] if self[k] > 0][:2]
                 if 2 > len(comp):
                     continue
                 self.region[self.field][key].stats[self.stat_field] += 1
+                self.credited += 1
                 self[comp[0]] -= 1
                 self[comp[1]] -= 1
 
-                sector_balance = self.single_unit_imbalance()
-            self_max = self.maximum
-            if 1 < self_max:  # pragma: no mutate
+            if 0 < self._heavy_keys:  # pragma: no mutate
                 adjkey = max(self, key=self.get)  # type: ignore[arg-type]
                 adjvalue = self[adjkey] // 2
                 left = adjkey[0]
                 right = adjkey[1]
                 self.region[self.field][left].stats[self.stat_field] += adjvalue
                 self.region[self.field][right].stats[self.stat_field] += adjvalue
+                self.credited += 2 * adjvalue
                 self[adjkey] -= (2 * adjvalue)
 
-            sector_balance = self.single_unit_imbalance()
-            self.logger.debug('Iteration ' + str(counter) + ', sector balance ' + str(sector_balance))
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug('Iteration ' + str(counter) + ', sector balance ' + str(sector_balance))
 
     def is_balanced(self) -> None:
         num_sector = len(self.region[self.field])
 
-        assert 2 > self.maximum, "Uncompensated " + str(self.target) + " imbalance present"
+        assert 0 == self._heavy_keys, "Uncompensated " + str(self.target) + " imbalance present"
 
         assert self.sum <= ceil(num_sector / 2), f"Uncompensated multilateral {self.target} imbalance present in {self.field}"
 
@@ -114,9 +173,7 @@ class TradeBalance(dict):
 
     @property
     def sum(self) -> int:
-        if 0 == len(self):
-            return 0
-        return sum(self.values())
+        return self._sum
 
     @staticmethod
     def _check(key: tuple, value: int):
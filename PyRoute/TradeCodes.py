@@ -3,7 +3,7 @@ Created on Oct 3, 2017
 
 @author: tjoneslo
 """
-import functools
+import copy
 import itertools
 import re
 import logging
@@ -72,14 +72,50 @@ class TradeCodes(object):
     sophont = re.compile(r"[A-Za-z\'!]{1}[\w\'!]{2,4}(\d|W|\?)")
     dieback = re.compile(r"[Di]*\([^)]+\)\d?")
 
-    __slots__ = '__dict__', 'codeset', 'pcode', 'dcode', 'xcode', 'logger', 'codes', 'owned', 'homeworld_list',\
-                'sophont_list', 'owner', 'colony', 'ownedBy'
+    # Freshly-parsed prototypes, keyed by their source string - see TradeCodes.intern
+    interned: dict[str, 'TradeCodes'] = {}
+    # Lists that clones of a prototype share with it until first written to
+    shared_lists = ('codes', 'codeset', 'dcode', 'owned', 'homeworld_list', 'owner', 'colony')
+
+    # Bits for the codes the flag properties test, so a world's flags fit in one integer - see TradeCodes.flags.
+    # Codeset codes and dcodes get separate bits, as (eg) Di only counts towards barren when it's in the codeset.
+    codeset_bits = {code: 1 << i for i, code in enumerate(
+        ['Ag', 'As', 'Ba', 'De', 'Di', 'Fl', 'He', 'Hi', 'Ic', 'In', 'Lo', 'Na', 'Ni', 'Oc', 'Po', 'Ri', 'Va', 'Wa'])}
+    dcode_bits = {code: 1 << i for i, code in enumerate(['Cp', 'Cs', 'Cx'], start=len(codeset_bits))}
+
+    AGRICULTURAL = codeset_bits['Ag']
+    ASTEROID = codeset_bits['As']
+    BARREN = codeset_bits['Ba'] | codeset_bits['Di']
+    DESERT = codeset_bits['De']
+    FLUID = codeset_bits['Fl']
+    HIGH = codeset_bits['Hi']
+    ICY_WORLD = codeset_bits['Ic']
+    INDUSTRIAL = codeset_bits['In']
+    LOW = codeset_bits['Lo']
+    NONAGRICULTURAL = codeset_bits['Na']
+    NONINDUSTRIAL = codeset_bits['Ni']
+    POOR = codeset_bits['Po']
+    RICH = codeset_bits['Ri']
+    VACUUM = codeset_bits['Va']
+    WATERWORLD = codeset_bits['Wa'] | codeset_bits['Oc']
+    EXTREME = sum(map(codeset_bits.__getitem__, ex_codes))
+    NEEDS_AGRICULTURAL = NONAGRICULTURAL | EXTREME
+    LOW_PER_CAPITA_GWP = EXTREME | POOR | NONINDUSTRIAL | LOW
+    SUBSECTOR_CAPITAL = dcode_bits['Cp']
+    SECTOR_CAPITAL = dcode_bits['Cs']
+    OTHER_CAPITAL = dcode_bits['Cx']
+    CAPITAL = SUBSECTOR_CAPITAL | SECTOR_CAPITAL | OTHER_CAPITAL
+
+    __slots__ = 'codeset', 'pcode', 'dcode', 'xcode', 'logger', 'codes', 'owned', 'homeworld_list', 'sophont_list',\
+                'owner', 'colony', 'ownedBy', 'flags', '_shared'
 
     def __init__(self, initial_codes):
         """
         Constructor
         """
         self.logger = logging.getLogger('PyRoute.TradeCodes')
+        self._shared = False
+        self.ownedBy = None
         self.codes, initial_codes = self._preprocess_initial_codes(initial_codes.strip())
         code_set = set(self.codes)
         self.pcode = set(TradeCodes.pcodes) & code_set
@@ -107,6 +143,38 @@ class TradeCodes(object):
 
         self.trim_ill_formed_residual_codes()
 
+    @staticmethod
+    def intern(initial_codes: str) -> 'TradeCodes':
+        """
+        Return a TradeCodes for initial_codes, parsing the string only on first request.  Later requests get a clone of
+        that first parse which shares its code lists - the clone copies them the first time it changes one.
+        """
+        proto = TradeCodes.interned.get(initial_codes, None)
+        if proto is None:
+            proto = TradeCodes(initial_codes)
+            TradeCodes.interned[initial_codes] = proto
+        return proto._clone()
+
+    def _clone(self) -> 'TradeCodes':
+        foo = object.__new__(TradeCodes)
+        foo.logger = self.logger
+        foo.pcode = self.pcode
+        foo.xcode = self.xcode
+        foo.flags = self.flags
+        foo.ownedBy = None
+        for key in TradeCodes.shared_lists:
+            setattr(foo, key, getattr(self, key))
+        # Every world appends its own sophont entries once it joins a galaxy, so there's no point sharing this one
+        foo.sophont_list = list(self.sophont_list)
+        foo._shared = True
+        return foo
+
+    def _unshare(self) -> None:
+        if self._shared:
+            self._shared = False
+            for key in TradeCodes.shared_lists:
+                setattr(self, key, list(getattr(self, key)))
+
     def _process_sophonts_and_homeworlds(self, initial_codes):
         self.homeworld_list = []
         self.sophont_list = []
@@ -369,21 +437,29 @@ class TradeCodes(object):
         return " ".join(sorted(self.codes))
 
     def __getstate__(self):
-        state = self.__dict__.copy()
-        del state['logger']
-        del state['ownedBy']
-        return state
+        return {key: getattr(self, key) for key in TradeCodes.__slots__ if key not in ('logger', 'ownedBy', '_shared')}
 
     def __deepcopy__(self, memodict: dict = {}):
-        state = self.__dict__.copy()
+        state = self.__getstate__()
 
         foo = TradeCodes('')
         for key in state:
-            item = state[key]
+            item = copy.deepcopy(state[key], memodict)
             setattr(foo, key, item)
 
         return foo
 
+    def update_flags(self) -> None:
+        """
+        Recalculate the flags bitmask from codeset and dcode.  Needs calling after either is changed.
+        """
+        flags = 0
+        for code in self.codeset:
+            flags |= TradeCodes.codeset_bits.get(code, 0)
+        for code in self.dcode:
+            flags |= TradeCodes.dcode_bits.get(code, 0)
+        self.flags = flags
+
     def planet_codes(self) -> str:
         return " ".join(self.codeset)
 
@@ -398,9 +474,11 @@ class TradeCodes(object):
         code_match = code in self.codeset
         if star_match == code_match:
             if star_match and implied is not None and implied not in self.codes:
+                self._unshare()
                 self.codes.append(implied)
                 if implied not in self.codeset:
                     self.codeset.append(implied)
+                    self.update_flags()
             return True
         msg = None
         if star_match and not code_match:
@@ -437,9 +515,11 @@ class TradeCodes(object):
         code_match = code in self.codeset
         if star_match == code_match:
             if star_match and implied is not None and implied not in self.codes:
+                self._unshare()
                 self.codes.append(implied)
                 if implied not in self.codeset:
                     self.codeset.append(implied)
+                    self.update_flags()
             return True
         msg = None
         if star_match and not code_match:
@@ -530,7 +610,7 @@ class TradeCodes(object):
             return [code if len(code) > 6 else 'C:' + sector_name[0:4] + '-' + code[2:]
                     for code in self.owned if code.startswith('C:')]
 
-    @functools.cached_property
+    @property
     def homeworld(self) -> list[str]:
         return sorted(self.homeworld_list)
 
@@ -538,95 +618,95 @@ class TradeCodes(object):
     def sophonts(self) -> list[str]:
         return sorted(self.sophont_list)
 
-    @functools.cached_property
+    @property
     def rich(self) -> bool:
-        return 'Ri' in self.codeset
+        return 0 != self.flags & TradeCodes.RICH
 
-    @functools.cached_property
+    @property
     def industrial(self) -> bool:
-        return 'In' in self.codeset
+        return 0 != self.flags & TradeCodes.INDUSTRIAL
 
-    @functools.cached_property
+    @property
     def agricultural(self) -> bool:
-        return 'Ag' in self.codeset
+        return 0 != self.flags & TradeCodes.AGRICULTURAL
 
-    @functools.cached_property
+    @property
     def needs_agricultural(self) -> bool:
-        return self.nonagricultural or self.extreme
+        return 0 != self.flags & TradeCodes.NEEDS_AGRICULTURAL
 
-    @functools.cached_property
+    @property
     def poor(self) -> bool:
-        return 'Po' in self.codeset
+        return 0 != self.flags & TradeCodes.POOR
 
-    @functools.cached_property
+    @property
     def nonagricultural(self) -> bool:
-        return 'Na' in self.codeset
+        return 0 != self.flags & TradeCodes.NONAGRICULTURAL
 
-    @functools.cached_property
+    @property
     def barren(self) -> bool:
-        return 'Ba' in self.codeset or 'Di' in self.codeset
+        return 0 != self.flags & TradeCodes.BARREN
 
-    @functools.cached_property
+    @property
     def low(self) -> bool:
-        return 'Lo' in self.codeset
+        return 0 != self.flags & TradeCodes.LOW
 
-    @functools.cached_property
+    @property
     def nonindustrial(self) -> bool:
-        return 'Ni' in self.codeset
+        return 0 != self.flags & TradeCodes.NONINDUSTRIAL
 
-    @functools.cached_property
+    @property
     def high(self) -> bool:
-        return 'Hi' in self.codeset
+        return 0 != self.flags & TradeCodes.HIGH
 
-    @functools.cached_property
+    @property
     def asteroid(self) -> bool:
-        return 'As' in self.codeset
+        return 0 != self.flags & TradeCodes.ASTEROID
 
-    @functools.cached_property
+    @property
     def desert(self) -> bool:
-        return 'De' in self.codeset
+        return 0 != self.flags & TradeCodes.DESERT
 
-    @functools.cached_property
+    @property
     def icy_world(self) -> bool:
-        return 'Ic' in self.codeset
+        return 0 != self.flags & TradeCodes.ICY_WORLD
 
-    @functools.cached_property
+    @property
     def fluid(self) -> bool:
-        return 'Fl' in self.codeset
+        return 0 != self.flags & TradeCodes.FLUID
 
-    @functools.cached_property
+    @property
     def vacuum(self) -> bool:
-        return 'Va' in self.codeset and 'As' not in self.codeset
+        return TradeCodes.VACUUM == self.flags & (TradeCodes.VACUUM | TradeCodes.ASTEROID)
 
-    @functools.cached_property
+    @property
     def waterworld(self) -> bool:
-        return 'Wa' in self.codeset or 'Oc' in self.codeset
+        return 0 != self.flags & TradeCodes.WATERWORLD
 
-    @functools.cached_property
+    @property
     def extreme(self) -> bool:
-        return len(self.ex_codes & set(self.codeset)) > 0
+        return 0 != self.flags & TradeCodes.EXTREME
 
-    @functools.cached_property
+    @property
     def capital(self) -> bool:
-        return 'Cp' in self.dcode or 'Cx' in self.dcode or 'Cs' in self.dcode
+        return 0 != self.flags & TradeCodes.CAPITAL
 
-    @functools.cached_property
+    @property
     def subsector_capital(self) -> bool:
-        return 'Cp' in self.dcode
+        return 0 != self.flags & TradeCodes.SUBSECTOR_CAPITAL
 
-    @functools.cached_property
+    @property
     def sector_capital(self) -> bool:
-        return 'Cs' in self.dcode
+        return 0 != self.flags & TradeCodes.SECTOR_CAPITAL
 
-    @functools.cached_property
+    @property
     def other_capital(self) -> bool:
-        return 'Cx' in self.dcode
+        return 0 != self.flags & TradeCodes.OTHER_CAPITAL
 
-    @functools.cached_property
+    @property
     def research_station(self) -> set:
         return set(self.research.keys()).intersection(self.dcode)
 
-    @functools.cached_property
+    @property
     def research_station_char(self) -> Union[str, None]:
         stations = self.research_station
         if len(stations) == 1:
@@ -635,19 +715,43 @@ class TradeCodes(object):
         else:
             return None
 
-    @functools.cached_property
+    @property
     def pcode_color(self) -> str:
         return self.pcolor.get(self.pcode, '#44ff44')
 
-    @functools.cached_property
+    @property
     def low_per_capita_gwp(self) -> bool:
-        return self.extreme or self.poor or self.nonindustrial or self.low
+        return 0 != self.flags & TradeCodes.LOW_PER_CAPITA_GWP
 
     def match_ag_codes(self, code) -> bool:
-        return (self.agricultural and code.needs_agricultural) or (self.needs_agricultural and code.agricultural)
+        return TradeCodes.match_ag_flags(self.flags, code.flags)
 
     def match_in_codes(self, code) -> bool:
-        return (self.industrial and code.nonindustrial) or (self.nonindustrial and code.industrial)
+        return TradeCodes.match_in_flags(self.flags, code.flags)
+
+    @staticmethod
+    def match_ag_flags(flags1, flags2):
+        """
+        Do two sets of trade code flags make an agricultural match?  Works elementwise on numpy flag columns as well
+        as on single flags values.
+        """
+        ag1 = 0 != flags1 & TradeCodes.AGRICULTURAL
+        ag2 = 0 != flags2 & TradeCodes.AGRICULTURAL
+        needs1 = 0 != flags1 & TradeCodes.NEEDS_AGRICULTURAL
+        needs2 = 0 != flags2 & TradeCodes.NEEDS_AGRICULTURAL
+        return (ag1 & needs2) | (needs1 & ag2)
+
+    @staticmethod
+    def match_in_flags(flags1, flags2):
+        """
+        Do two sets of trade code flags make an industrial match?  Works elementwise on numpy flag columns as well
+        as on single flags values.
+        """
+        in1 = 0 != flags1 & TradeCodes.INDUSTRIAL
+        in2 = 0 != flags2 & TradeCodes.INDUSTRIAL
+        ni1 = 0 != flags1 & TradeCodes.NONINDUSTRIAL
+        ni2 = 0 != flags2 & TradeCodes.NONINDUSTRIAL
+        return (in1 & ni2) | (ni1 & in2)
 
     def is_well_formed(self) -> tuple[bool, str]:
         for code in self.codeset:
@@ -695,6 +799,7 @@ class TradeCodes(object):
             else:
                 nu_set.add(code)
         self.codeset = sorted(list(nu_set))
+        self.update_flags()
 
     def _check_residual_code_well_formed(self, code):
         max_code_len = 12
@@ -798,7 +903,6 @@ class TradeCodes(object):
             self._add_missing_trade_code(code)
 
     def _fix_econ_code(self, star, code, atmo, hydro, pop):
-        mapping = {'In': 'industrial', 'Ri': 'rich', 'Ag': 'agricultural'}
         atmo = '0123456789ABCDEF' if atmo is None else atmo
         hydro = '0123456789A' if hydro is None else hydro
         pop = '0123456789ABCD' if pop is None else pop
@@ -813,13 +917,8 @@ class TradeCodes(object):
             self._drop_invalid_trade_code(code)
         elif phys_match and not code_match:
             self._add_missing_trade_code(code)
-        if code in mapping:
-            mappi = mapping[code]
-            if mappi in self.__dict__:
-                del self.__dict__[mappi]
 
     def _fix_pop_code(self, star, code, pop):
-        mapping = {'Lo': 'low', 'Hi': 'high', 'Ni': 'nonindustrial', 'Ba': 'barren'}
         pop_match = star.pop in pop
         code_match = code in self.codeset
 
@@ -830,10 +929,6 @@ class TradeCodes(object):
             self._drop_invalid_trade_code(code)
         elif pop_match and not code_match:
             self._add_missing_trade_code(code)
-        if code in mapping:
-            mappi = mapping[code]
-            if mappi in self.__dict__:
-                del self.__dict__[mappi]
 
     def _fix_all_pop_codes(self, star):
         self._fix_pop_code(star, 'Ba', '0')
@@ -845,10 +940,13 @@ class TradeCodes(object):
     def _drop_invalid_trade_code(self, targcode):
         self.codes = [code for code in self.codes if code != targcode]
         self.codeset = [code for code in self.codeset if code != targcode]
+        self.update_flags()
 
     def _add_missing_trade_code(self, targcode):
+        self._unshare()
         self.codes.append(targcode)
         self.codeset.append(targcode)
+        self.update_flags()
 
     @staticmethod
     def _is_soph_code_digit(text) -> bool:
@@ -3,7 +3,10 @@ Created on Dec 15, 2025
 
 @author: CyberiaResurrection
 """
+import sys
 from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any
 
 
 class UWPCodes(object):
@@ -25,3 +28,71 @@ class UWPCodes(object):
         self.codes = OrderedDict()
         for uwpCode in UWPCodes.uwpCodes:
             self.codes[uwpCode] = "X"
+
+
+class UWPCodeRecord(MutableMapping):
+    """
+    A world's UWP code values, keyed by the names in UWPCodes.uwpCodes and in that order.  Behaves like the dict it
+    replaces, but keeps each value in a slot, as a per-world dict of thirteen entries costs over three times as much.
+    """
+    __slots__ = 'starport', 'size', 'atmosphere', 'hydrographics', 'population', 'government', 'law_level', \
+                'tech_level', 'pop_code', 'starport_size', 'primary_type', 'importance', 'resources'
+
+    slot_names = dict(zip(UWPCodes.uwpCodes, __slots__))
+    _missing = object()
+
+    def __init__(self, starport, size, atmosphere, hydrographics, population, government, law_level, tech_level,
+                 pop_code, starport_size, primary_type, importance, resources):
+        values = (starport, size, atmosphere, hydrographics, population, government, law_level, tech_level, pop_code,
+                  starport_size, primary_type, importance, resources)
+        for slot, value in zip(UWPCodeRecord.__slots__, values):
+            setattr(self, slot, UWPCodeRecord._shared(value))
+
+    @staticmethod
+    def _shared(value):
+        # UWP hands out a fresh upper-cased string on every read, so share one copy of each code between worlds
+        return sys.intern(value) if isinstance(value, str) else value
+
+    def _slot(self, key) -> str:
+        slot = UWPCodeRecord.slot_names.get(key, None)
+        if slot is None:
+            raise KeyError(key)
+        return slot
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, self._slot(key))
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value) -> None:
+        setattr(self, self._slot(key), UWPCodeRecord._shared(value))
+
+    def __delitem__(self, key) -> None:
+        try:
+            delattr(self, self._slot(key))
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __iter__(self):
+        return (key for key, slot in UWPCodeRecord.slot_names.items() if hasattr(self, slot))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def items(self) -> list[tuple[str, Any]]:  # type: ignore[override]
+        # A plain list rather than a view, as statistics walk every world's codes twice over
+        missing = UWPCodeRecord._missing
+        pairs = ((key, getattr(self, slot, missing)) for key, slot in UWPCodeRecord.slot_names.items())
+        return [(key, value) for key, value in pairs if value is not missing]
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+    # Serialised as the plain dict it stands in for
+    def __getstate__(self) -> dict:
+        return dict(self)
+
+    def __setstate__(self, state: dict) -> None:
+        for key, value in state.items():
+            self[key] = value
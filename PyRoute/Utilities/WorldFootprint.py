@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+"""
+Created on Oct 19, 2026
+
+@author: CyberiaResurrection
+"""
+import argparse
+import logging
+import sys
+
+logger = logging.getLogger('PyRoute')
+
+# Attributes that point back out of the world to objects shared across the whole galaxy
+excluded_attributes = frozenset({'sector', 'logger', 'ownedBy'})
+
+
+def _attributes(item) -> list:
+    values = []
+    for cls in type(item).__mro__:
+        for name in cls.__dict__.get('__slots__', ()):
+            if name in excluded_attributes or name in ('__dict__', '__weakref__'):
+                continue
+            if hasattr(item, name):
+                values.append(getattr(item, name))
+    if hasattr(item, '__dict__'):
+        values.extend(value for key, value in item.__dict__.items() if key not in excluded_attributes)
+    return values
+
+
+def footprint(stars, seen: set = None) -> int:
+    """
+    Total bytes held by the given worlds and everything reachable from them, counting each object only once.
+
+    Objects shared between worlds (such as interned UWPs or star lists) are counted once across the whole set, so
+    dividing by the number of worlds gives the amortised cost per world.
+    """
+    from PyRoute.Star import Star
+    seen = set() if seen is None else seen
+    total = 0
+    pending = list(stars)
+    roots = {id(star) for star in pending}
+    while pending:
+        item = pending.pop()
+        if id(item) in seen or isinstance(item, type):
+            continue
+        if isinstance(item, Star) and id(item) not in roots:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, (str, bytes, int, float, bool)) or item is None:
+            continue
+        if isinstance(item, dict):
+            pending.extend(item.keys())
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            pending.extend(item)
+        else:
+            pending.extend(_attributes(item))
+    return total
+
+
+def bytes_per_world(stars) -> float:
+    stars = list(stars)
+    if 0 == len(stars):
+        return 0.0
+    return footprint(stars) / len(stars)
+
+
+def process() -> None:
+    from PyRoute.AreaItems.Galaxy import Galaxy
+    from PyRoute.DataClasses.ReadSectorOptions import ReadSectorOptions
+    from PyRoute.route import get_sectors
+
+    parser = argparse.ArgumentParser(description='Measure the memory held per world after loading sectors.')
+    parser.add_argument('--input', default='sectors', help='input directory for sectors')
+    parser.add_argument('--sectors', default='sectorlist.txt', help='file with list of sector names to measure')
+    args = parser.parse_args()
+
+    galaxy = Galaxy(8)
+    galaxy.read_sectors(ReadSectorOptions(sectors=get_sectors(args.sectors, args.input)))
+    stars = [star for sector in galaxy.sectors.values() for star in sector.worlds]
+    total = footprint(stars)
+    per_world = total / len(stars) if stars else 0.0
+    logger.info("%s worlds use %s bytes, %.1f bytes per world", len(stars), total, per_world)
+    print(f"{len(stars)} worlds, {total} bytes, {per_world:.1f} bytes per world")
+
+
+if __name__ == '__main__':
+    process()
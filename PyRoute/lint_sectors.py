@@ -0,0 +1,214 @@
+#!/usr/bin/python3
+"""
+Created on Oct 19, 2026
+
+@author: CyberiaResurrection
+
+Check a batch of sector files will load cleanly, without running the rest of the route.py pipeline.  Each sector file
+is checked in its own worker process - star-line grammar, Star.is_well_formed, allegiance declarations and duplicate
+hex positions - then checks spanning files (duplicate sectors, allegiances declared in an earlier file) are run over
+the combined results.  Problems are reported one per line, as JSON, on stdout.
+"""
+import argparse
+import codecs
+import json
+import logging
+import os
+import sys
+from multiprocessing import Pool
+from typing import Optional
+
+from PyRoute.Allies.AllyGen import AllyGen
+from PyRoute.AreaItems.Allegiance import Allegiance
+from PyRoute.AreaItems.Sector import Sector
+from PyRoute.Inputs.ParseSectorInput import ParseSectorInput
+from PyRoute.Inputs.ParseStarInput import ParseStarInput
+from PyRoute.Star import Star
+
+logger = logging.getLogger('PyRoute')
+
+
+class _LineRecords(logging.Handler):
+    """
+    Hang on to warnings logged while parsing a star line, so they can be reported against that line
+    """
+    def __init__(self) -> None:
+        super().__init__(logging.WARNING)
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record) -> None:
+        self.records.append(record)
+
+
+def _problem(filename: str, line: Optional[int], position: Optional[str], check: str, message: str,
+             level: str = 'error') -> dict:
+    return {'file': filename, 'line': line, 'position': position, 'check': check, 'level': level, 'message': message}
+
+
+def lint_sector_file(filename: str) -> dict:
+    """
+    Run the single-file checks over filename.  Returns the problems found, along with what the cross-file checks
+    need: the sector's identity, the allegiance codes it declares and the allegiance codes its stars use without
+    declaring them.
+    """
+    result: dict = {'file': filename, 'sector': None, 'declared': [], 'undeclared': [], 'problems': []}
+    problems = result['problems']
+    headers: list[str] = []
+    starlines: list[tuple[int, str]] = []
+    try:
+        with codecs.open(filename, 'r', encoding='utf-8') as infile:
+            for line_no, line in enumerate(infile, start=1):
+                if line[0].isdigit():
+                    starlines.append((line_no, line))
+                else:
+                    headers.append(line)
+    except (OSError, IOError, UnicodeDecodeError) as e:
+        problems.append(_problem(filename, None, None, 'file', "sector file can not be read: " + str(e)))
+        return result
+
+    try:
+        sec = Sector(headers[3], headers[4])
+    except (IndexError, ValueError) as e:
+        problems.append(_problem(filename, None, None, 'file', "sector name and position headers bad: " + str(e)))
+        return result
+    result['sector'] = str(sec)
+
+    algs: dict[str, Allegiance] = {}
+    for line in headers:
+        if line.startswith('# Alleg:'):
+            try:
+                ParseSectorInput.parse_allegiance([line], algs)
+            except IndexError:
+                problems.append(_problem(filename, None, None, 'allegiance', "malformed allegiance header " +
+                                         line.strip()))
+    for code, allegiance in algs.items():
+        well_formed, msg = allegiance.is_well_formed()
+        if not well_formed:
+            problems.append(_problem(filename, None, None, 'allegiance', code + ": " + msg))
+    result['declared'] = sorted(algs)
+    ParseSectorInput.parse_subsectors(headers, sec.name, sec)
+
+    handler = _LineRecords()
+    propagate = logger.propagate
+    # Reading a sector into a SectorDictionary (ParseSectorInput.read_parsed_sector_to_sector_dict) leaves warnings
+    # disabled process-wide, which would hide every parse warning from the handler
+    disable = logging.root.manager.disable
+    logger.addHandler(handler)
+    logger.propagate = False
+    logging.disable(logging.NOTSET)
+    ParseStarInput.defer_derived_values = True
+    try:
+        _lint_starlines(filename, sec, starlines, algs, handler, result)
+    finally:
+        ParseStarInput.defer_derived_values = False
+        ParseStarInput.clear_interned()
+        logger.removeHandler(handler)
+        logger.propagate = propagate
+        logging.disable(disable)
+
+    return result
+
+
+def _lint_starlines(filename: str, sec: Sector, starlines: list[tuple[int, str]], algs: dict[str, Allegiance],
+                    handler: _LineRecords, result: dict) -> None:
+    problems = result['problems']
+    seen_positions: dict[str, int] = {}
+    for index, (line_no, line) in enumerate(starlines):
+        position = line[0:4]
+        handler.records = []
+        try:
+            star = Star.parse_line_into_star(line, sec, 'scaled', 'scaled')
+        except Exception as e:  # Anything the parser throws is a problem with the line, so report it and move on
+            problems.append(_problem(filename, line_no, position, 'grammar', type(e).__name__ + ": " + str(e)))
+            continue
+        for record in handler.records:
+            problems.append(_problem(filename, line_no, position, 'parse', record.getMessage(), 'warning'))
+        if not star:
+            # Anomalies, outside deep space, are skipped on load rather than being errors
+            if '{Anomaly}' not in line:
+                problems.append(_problem(filename, line_no, position, 'grammar', "star line does not parse"))
+            continue
+
+        if star.position in seen_positions:
+            problems.append(_problem(filename, line_no, star.position, 'duplicate-position',
+                                     "hex already used on line " + str(seen_positions[star.position])))
+        else:
+            seen_positions[star.position] = line_no
+
+        star.index = index
+        star.alg_base_code = AllyGen.same_align(star.alg_code)
+        if star.alg_code not in algs:
+            result['undeclared'].append((line_no, star.position, star.alg_code))
+        star.allegiance_base = algs.get(star.alg_base_code, star.alg_base_code)
+        try:
+            star.is_well_formed()
+        except (AssertionError, AttributeError) as e:
+            problems.append(_problem(filename, line_no, star.position, 'well-formed', str(e)))
+
+
+def lint_sectors(sectors: list[str], mp_threads: int = 1) -> list[dict]:
+    """
+    Lint every sector file in sectors, using up to mp_threads worker processes, and return the problems found, in
+    sector list then line order.
+    """
+    if 1 < mp_threads and 1 < len(sectors):
+        with Pool(processes=min(mp_threads, len(sectors))) as pool:
+            results = pool.map(lint_sector_file, sectors)
+    else:
+        results = [lint_sector_file(sector) for sector in sectors]
+
+    # Now the checks that span files, in the order route.py would load them
+    problems = []
+    loaded_sectors: dict[str, str] = {}
+    declared: set[str] = set()
+    for result in results:
+        filename = result['file']
+        problems.extend(result['problems'])
+        sector = result['sector']
+        if sector is None:
+            continue
+        if sector in loaded_sectors:
+            problems.append(_problem(filename, None, None, 'duplicate-sector',
+                                     "sector " + sector + " already loaded from " + loaded_sectors[sector]))
+            continue
+        loaded_sectors[sector] = filename
+        declared.update(result['declared'])
+        for line_no, position, code in result['undeclared']:
+            if code not in declared:
+                problems.append(_problem(filename, line_no, position, 'allegiance',
+                                         "allegiance " + str(code) + " not declared in this or an earlier sector"))
+
+    order = {sector: i for i, sector in enumerate(sectors)}
+    problems.sort(key=lambda item: (order[item['file']], item['line'] or 0))
+    return problems
+
+
+def process() -> None:
+    cpucount: int = 1 if os.cpu_count() is None else max(1, os.cpu_count() - 1)  # type:ignore[operator]
+    parser = argparse.ArgumentParser(description='Check sector files load cleanly, without generating routes.')
+    parser.add_argument('--input', default='sectors', help='input directory for sectors')
+    parser.add_argument('--sectors', default=None, help='file with list of sector names to check')
+    parser.add_argument('--mp-threads', dest='mp_threads', default=cpucount, type=int,
+                        help=f"Number of processes to check sectors with, default {cpucount}")
+    parser.add_argument('--log-level', default='WARNING')
+    parser.add_argument('sector', nargs='*', help='T5SS sector file(s) to check')
+    args = parser.parse_args()
+    logger.setLevel(args.log_level)
+
+    sectors = list(args.sector)
+    if args.sectors is not None:
+        from PyRoute.route import get_sectors
+        sectors.extend(get_sectors(args.sectors, args.input))
+    sectors = list(dict.fromkeys(sectors))
+
+    problems = lint_sectors(sectors, args.mp_threads)
+    for item in problems:
+        print(json.dumps(item))
+    errors = sum(1 for item in problems if 'error' == item['level'])
+    print("{} sector files checked, {} errors, {} warnings".format(len(sectors), errors, len(problems) - errors),
+          file=sys.stderr)
+    sys.exit(1 if 0 < errors else 0)
+
+
+if __name__ == '__main__':
+    process()
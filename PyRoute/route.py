@@ -11,6 +11,7 @@ import codecs
 import os
 
 from PyRoute.AreaItems.Galaxy import Galaxy
+from PyRoute.DataExport import DataExport
 from PyRoute.DataClasses.ReadSectorOptions import ReadSectorOptions
 from PyRoute.SpeculativeTrade import SpeculativeTrade
 from PyRoute.Outputs.ClassicModePDFSectorMap import ClassicModePDFSectorMap
@@ -27,10 +28,14 @@ def process() -> None:
     parser = argparse.ArgumentParser(description='Traveller trade route generator.', fromfile_prefix_chars='@')
 
     alleg = parser.add_argument_group('Allegiance', 'Alter processing of allegiances')
-    alleg.add_argument('--borders', choices=['none', 'range', 'allygen', 'erode'], default='range',
+    alleg.add_argument('--borders', choices=['none', 'range', 'allygen', 'erode', 'erode-raster'],
+                       default='range',
                        help='Allegiance border generation, default [range]')
     alleg.add_argument('--ally-match', choices=['collapse', 'separate'], default='collapse',
                        help='Allegiance matching for borders, default [collapse]')
+    alleg.add_argument('--border-cache', dest='border_cache', default=None,
+                       help='Directory to keep generated borders in, reused while the worlds and border options are '
+                            'unchanged, default [no cache]')
 
     route = parser.add_argument_group('Routes', 'Route generation options')
     route.add_argument('--routes', dest='routes',
@@ -52,7 +57,12 @@ def process() -> None:
                        help='version of the speculative trade calculations, default [CT]')
     cpucount: int = 1 if os.cpu_count() is None else max(1, os.cpu_count() - 1)  # type:ignore[operator]
     route.add_argument('--mp-threads', default=cpucount, type=int,
-                       help=f"Number of processes to use for trade-mp processing, default {cpucount}")
+                       help=f"Number of processes to use for trade-mp processing and landmark selection, default {cpucount}")
+    route.add_argument('--pathfinding-memory', dest='pathfinding_memory', default=None, type=int,
+                       help='Memory budget in MiB for pathfinding landmark storage, landmark count is capped to fit, default [no budget]')
+    route.add_argument('--pathfinding-float32', dest='pathfinding_float32', default=False,
+                       action=argparse.BooleanOptionalAction,
+                       help='Store pathfinding landmark distances as float32, halving their memory use')
 
     output = parser.add_argument_group('Output', 'Output options')
 
@@ -71,6 +81,8 @@ def process() -> None:
                         help='Minimum number of worlds in an allegiance for output, default [10]')
     output.add_argument('--json-data', dest='json_data', default=False, action='store_true',
                         help='Dump internal data structures as json for later further processing ')
+    output.add_argument('--export-data', dest='export_data', default=False, action='store_true',
+                        help='Export stars, routes, areas and their statistics as flat records, one file per sector')
 
     source = parser.add_argument_group('Input', 'Source of data options')
     source.add_argument('--input', default='sectors', help='input directory for sectors')
@@ -83,6 +95,9 @@ def process() -> None:
                            help="Turn on trade-route debugging")
     debugging.add_argument('--fix-pop', dest="fix_pop", default=False, action=argparse.BooleanOptionalAction,
                            help="Fix incorrect pop codes when loading stars")
+    debugging.add_argument('--validate', dest="validate", default='full', choices=['none', 'load', 'full'],
+                           help="Consistency checks to run: none, once per object when loaded, or full repeated checks "
+                                "at every stage, default full")
 
     parser.add_argument('--version', action='version', version='%(prog)s 0.4')
     parser.add_argument('--log-level', default='INFO')
@@ -129,7 +144,9 @@ def process() -> None:
     readparms = ReadSectorOptions(sectors=sectors_list, pop_code=args.pop_code, ru_calc=args.ru_calc,
                                   route_reuse=args.route_reuse, trade_choice=args.routes, route_btn=args.route_btn,
                                   mp_threads=args.mp_threads, debug_flag=args.debug_flag, fix_pop=args.fix_pop,
-                                  deep_space=deep_space, map_type=args.map_type)
+                                  deep_space=deep_space, map_type=args.map_type,
+                                  pathfinding_memory=args.pathfinding_memory,
+                                  pathfinding_float32=args.pathfinding_float32, validate=args.validate)
     galaxy.read_sectors(readparms)
 
     # galaxy.read_sectors(sectors_list, args.pop_code, args.ru_calc,
@@ -140,7 +157,7 @@ def process() -> None:
 
     galaxy.generate_routes()
 
-    galaxy.set_borders(args.borders, args.ally_match)
+    galaxy.set_borders(args.borders, args.ally_match, mp_threads=args.mp_threads, cache_dir=args.border_cache)
 
     if args.owned:
         galaxy.process_owned_worlds()
@@ -156,7 +173,10 @@ def process() -> None:
 
     stats = StatCalculation(galaxy)
     stats.calculate_statistics(args.ally_match)
-    stats.write_statistics(args.ally_count, args.ally_match, args.json_data)
+    stats.write_statistics(args.ally_count, args.ally_match, args.json_data, mp_threads=args.mp_threads)
+
+    if args.export_data:
+        DataExport(galaxy, mp_threads=args.mp_threads).write()
 
     if args.maps:
         maptype = args.map_type
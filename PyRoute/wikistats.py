@@ -7,11 +7,25 @@ import os
 
 import logging
 import codecs
+from multiprocessing import Pool
+
 import inflect
 import jsonpickle  # type:ignore[import-untyped]
 from networkx.readwrite import json_graph
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 
+# A page to render: template name, output file name, and template parameters
+Page = tuple[str, str, dict]
+
+# The WikiStats and pages a process pool is rendering.  Forked workers inherit these, along with the templates
+# already compiled, instead of having the galaxy pickled across to them.
+wikiStats = None
+wikiPages: list[Page] = []
+
+
+def render_page(index: int) -> None:
+    wikiStats.output_template(*wikiPages[index])  # type: ignore[union-attr]
+
 
 class WikiStats(object):
     """
@@ -23,7 +37,8 @@ class WikiStats(object):
                   '!! RU !! Shipyard Capacity (MTons) !! Colonial Army (BEs) ' + \
                   '!! Travellers (M / year) !! SPA Pop !! ETI worlds !! ETI Cargo (tons / year) !! ETI passengers (per year)\n'
 
-    def __init__(self, galaxy, uwp, min_alg_count=10, match_alg='collapse', json_data=False, routes_generated=False):
+    def __init__(self, galaxy, uwp, min_alg_count=10, match_alg='collapse', json_data=False, routes_generated=False,
+                 mp_threads=1):
         """
         Constructor
         """
@@ -33,6 +48,7 @@ class WikiStats(object):
         self.plural = inflect.engine()
         self.match_alg = match_alg == 'collapse'
         self.json_data = json_data
+        self.mp_threads = mp_threads
         self.logger = logging.getLogger('PyRoute.WikiStats')
 
         cwd = os.path.dirname(__file__)
@@ -45,11 +61,9 @@ class WikiStats(object):
             )
 
     def write_statistics(self) -> None:
-        self.summary_statistics_template()
-        self.sector_statistics_template()
-        self.subsector_statistics_template()
-        self.sector_data_template()
-        self.allegiance_statistics_template()
+        self.write_pages(self.summary_statistics_template() + self.sector_statistics_template() +
+                         self.subsector_statistics_template() + self.sector_data_template() +
+                         self.allegiance_statistics_template())
 
         # self.top_summary()
         # self.tcs_statistics()
@@ -63,46 +77,78 @@ class WikiStats(object):
         if self.json_data:
             self.write_json()
 
+    def write_pages(self, pages: list[Page]) -> None:
+        """
+        Render pages, over a process pool if there are threads to spare.  Each page is rendered the same way either
+        way, so the output doesn't depend on how many processes rendered it.
+        """
+        # Compile each template once, up front, so pool workers all start with it compiled
+        for template in dict.fromkeys(page[0] for page in pages):
+            self.env.get_template(template)
+
+        if 2 > self.mp_threads or 2 > len(pages):
+            for page in pages:
+                self.output_template(*page)
+            return
+
+        global wikiStats, wikiPages
+        wikiStats = self
+        wikiPages = pages
+        processes = min(self.mp_threads, len(pages))
+        self.logger.info('Rendering {} statistics pages over {} processes'.format(len(pages), processes))
+        try:
+            with Pool(processes=processes) as pool:
+                # One page at a time, as pages vary a lot in size
+                for _ in pool.imap_unordered(render_page, range(len(pages)), chunksize=1):
+                    pass
+        finally:
+            wikiStats = None
+            wikiPages = []
+
     def output_template(self, template, filename, parameters) -> None:
         template = self.env.get_template(template)
         path = os.path.join(self.galaxy.output_path, filename)
-        with open(path, 'w+', encoding='utf-8') as f:
+        # Write to one side, then move into place, so nothing ever sees a half-written page
+        with open(path + '.tmp', 'w+', encoding='utf-8') as f:
             f.write(template.render(parameters))
-
-    def summary_statistics_template(self) -> None:
-        self.output_template('summary.wiki', 'summary.wiki',
-                             {'global_stats': self.galaxy.stats,
-                              'sectors': self.galaxy.sectors,
-                              'uwp': self.uwp,
-                              'plural': self.plural,
-                              'global_alg': self.galaxy.alg_sorted})
-
-    def sector_statistics_template(self) -> None:
-        self.output_template('sectors.wiki', 'sectors.wiki',
-                             {'sectors': self.galaxy.sectors,
-                              'global_stats': self.galaxy.stats,
-                              'im_stats': self.galaxy.alg.get('Im', None),
-                              'plural': self.plural})
-
-    def subsector_statistics_template(self) -> None:
-        self.output_template('subsectors.wiki', 'subsectors.wiki',
-                             {'sectors': self.galaxy.sectors,
-                              'plural': self.plural})
-
-    def sector_data_template(self) -> None:
+        os.replace(path + '.tmp', path)
+
+    def summary_statistics_template(self) -> list[Page]:
+        return [('summary.wiki', 'summary.wiki',
+                 {'global_stats': self.galaxy.stats,
+                  'sectors': self.galaxy.sectors,
+                  'uwp': self.uwp,
+                  'plural': self.plural,
+                  'global_alg': self.galaxy.alg_sorted})]
+
+    def sector_statistics_template(self) -> list[Page]:
+        return [('sectors.wiki', 'sectors.wiki',
+                 {'sectors': self.galaxy.sectors,
+                  'global_stats': self.galaxy.stats,
+                  'im_stats': self.galaxy.alg.get('Im', None),
+                  'plural': self.plural})]
+
+    def subsector_statistics_template(self) -> list[Page]:
+        return [('subsectors.wiki', 'subsectors.wiki',
+                 {'sectors': self.galaxy.sectors,
+                  'plural': self.plural})]
+
+    def sector_data_template(self) -> list[Page]:
+        pages: list[Page] = []
         for sector in self.galaxy.sectors.values():
-            self.output_template('sector_data.wiki', sector.sector_name() + " Sector.sector.wiki",
-                                  {"sector": sector})
-            self.output_template('sector_econ.wiki', sector.sector_name() + " Sector.economic.wiki",
-                                 {'sector': sector})
-
-    def allegiance_statistics_template(self) -> None:
-        self.output_template('allegiances.wiki', 'allegiances.wiki',
-                             {"global_alg": self.galaxy.alg_sorted,
-                              "global_stats": self.galaxy.stats,
-                              "plural": self.plural,
-                              "area": self.galaxy,
-                              "min_alg_count": self.min_alg_count})
+            pages.append(('sector_data.wiki', sector.sector_name() + " Sector.sector.wiki",
+                          {"sector": sector}))
+            pages.append(('sector_econ.wiki', sector.sector_name() + " Sector.economic.wiki",
+                          {'sector': sector}))
+        return pages
+
+    def allegiance_statistics_template(self) -> list[Page]:
+        return [('allegiances.wiki', 'allegiances.wiki',
+                 {"global_alg": self.galaxy.alg_sorted,
+                  "global_stats": self.galaxy.stats,
+                  "plural": self.plural,
+                  "area": self.galaxy,
+                  "min_alg_count": self.min_alg_count})]
 
     def write_json(self) -> None:
         path = os.path.join(self.galaxy.output_path, 'galaxy.json')
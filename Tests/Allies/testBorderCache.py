@@ -0,0 +1,114 @@
+"""
+Created on Oct 19, 2026
+
+@author: CyberiaResurrection
+"""
+import os
+import tempfile
+from unittest.mock import patch
+
+from PyRoute.Allies.BorderCache import BorderCache
+from PyRoute.Allies.Borders import Borders
+from PyRoute.DeltaDebug.DeltaDictionary import DeltaDictionary, SectorDictionary
+from PyRoute.DeltaDebug.DeltaGalaxy import DeltaGalaxy
+from PyRoute.Inputs.ParseStarInput import ParseStarInput
+from Tests.Mapping.testAllyGenBase import TestAllyGenBase
+
+
+class testBorderCache(TestAllyGenBase):
+
+    def _load_galaxy(self) -> DeltaGalaxy:
+        ParseStarInput.deep_space = {}
+        sector = SectorDictionary.load_traveller_map_file(self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec'))
+        delta = DeltaDictionary()
+        delta[sector.name] = sector
+
+        args = self._make_args()
+        galaxy = DeltaGalaxy(args.btn, args.max_jump)
+        galaxy.read_sectors(delta, args.pop_code, args.ru_calc,
+                            args.route_reuse, args.routes, args.route_btn, args.mp_threads, args.debug_flag)
+        return galaxy
+
+    def test_digest_follows_border_inputs(self) -> None:
+        galaxy = self._load_galaxy()
+        cache = BorderCache('cache')
+        base = cache.digest(galaxy, 'erode', 'collapse', True)
+        self.assertEqual(base, cache.digest(galaxy, 'erode', 'collapse', True))
+
+        self.assertNotEqual(base, cache.digest(galaxy, 'range', 'collapse', True))
+        self.assertNotEqual(base, cache.digest(galaxy, 'erode', 'separate', True))
+        self.assertNotEqual(base, cache.digest(galaxy, 'erode', 'collapse', False))
+
+        # Route options don't matter to borders
+        galaxy.max_jump = 2
+        galaxy.min_btn = 8
+        self.assertEqual(base, cache.digest(galaxy, 'erode', 'collapse', True))
+
+        star = list(galaxy.star_mapping.values())[0]
+        cases = [('port', 'X'), ('alg_code', 'Zh')]
+        for field, value in cases:
+            with self.subTest(field):
+                old_value = getattr(star, field)
+                setattr(star, field, value)
+                self.assertNotEqual(base, cache.digest(galaxy, 'erode', 'collapse', True))
+                setattr(star, field, old_value)
+                self.assertEqual(base, cache.digest(galaxy, 'erode', 'collapse', True))
+
+    def test_save_and_load(self) -> None:
+        borders = Borders(None)
+        borders.allyMap = {(3, -1): 'ImDs', (1, 2): None, (0, 0): 'Zh'}
+        borders.borders = {(3, 0): [None, 'red', 'red'], (1, 2): ['white', None, None]}
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = BorderCache(os.path.join(cache_dir, 'borders'))
+            self.assertFalse(cache.load('abc123', Borders(None)))
+            cache.save('abc123', borders)
+            self.assertEqual(['borders-abc123.json'], os.listdir(cache.cache_dir))
+
+            loaded = Borders(None)
+            self.assertTrue(cache.load('abc123', loaded))
+            self.assertEqual(list(borders.allyMap.items()), list(loaded.allyMap.items()))
+            self.assertEqual(list(borders.borders.items()), list(loaded.borders.items()))
+
+    def test_load_unreadable_entry(self) -> None:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = BorderCache(cache_dir)
+            with open(os.path.join(cache_dir, 'borders-abc123.json'), 'w', encoding='utf-8') as f:
+                f.write('{"allyMap": [')
+            cache.logger.manager.disable = 0
+            with self.assertLogs(cache.logger, 'WARNING') as logs:
+                self.assertFalse(cache.load('abc123', Borders(None)))
+            self.assertEqual(1, len(logs.output))
+            self.assertIn('Ignoring unreadable border cache file', logs.output[0])
+
+    def test_set_borders_reuses_cached_borders(self) -> None:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            galaxy = self._load_galaxy()
+            galaxy.set_borders('erode', 'separate', cache_dir=cache_dir)
+            exp_map = list(galaxy.borders.allyMap.items())
+            exp_borders = list(galaxy.borders.borders.items())
+            self.assertEqual(1, len(os.listdir(cache_dir)))
+
+            galaxy = self._load_galaxy()
+            logger = galaxy.logger
+            logger.manager.disable = 0
+            with patch.object(galaxy.borders, 'create_erode_border') as mock_method, \
+                    self.assertLogs(logger, 'INFO') as logs:
+                galaxy.set_borders('erode', 'separate', cache_dir=cache_dir)
+            mock_method.assert_not_called()
+            self.assertEqual(['INFO:PyRoute.Galaxy:setting borders...', 'INFO:PyRoute.Galaxy:borders loaded from cache'],
+                             logs.output)
+            self.assertEqual(exp_map, list(galaxy.borders.allyMap.items()))
+            self.assertEqual(exp_borders, list(galaxy.borders.borders.items()))
+
+            # Another algorithm is another cache entry
+            with patch.object(galaxy.borders, 'create_borders') as mock_method:
+                galaxy.set_borders('range', 'separate', cache_dir=cache_dir)
+            mock_method.assert_called_once_with('separate', True)
+            self.assertEqual(2, len(os.listdir(cache_dir)))
+
+    def test_set_borders_none_is_not_cached(self) -> None:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            galaxy = self._load_galaxy()
+            galaxy.set_borders('none', 'separate', cache_dir=cache_dir)
+            self.assertEqual([], os.listdir(cache_dir))
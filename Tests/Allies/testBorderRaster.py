@@ -0,0 +1,116 @@
+"""
+Created on Oct 19, 2026
+
+@author: CyberiaResurrection
+"""
+from unittest.mock import patch
+
+from PyRoute.Allies.BorderRaster import BorderRaster, ErodeStars
+from PyRoute.AreaItems.Galaxy import Galaxy
+from PyRoute.DeltaDebug.DeltaDictionary import DeltaDictionary, SectorDictionary
+from PyRoute.DeltaDebug.DeltaGalaxy import DeltaGalaxy
+from PyRoute.Inputs.ParseStarInput import ParseStarInput
+from Tests.Mapping.testAllyGenBase import TestAllyGenBase
+
+
+class testBorderRaster(TestAllyGenBase):
+
+    def _load_galaxy(self, sourcefile: str) -> DeltaGalaxy:
+        sector = SectorDictionary.load_traveller_map_file(sourcefile)
+        delta = DeltaDictionary()
+        delta[sector.name] = sector
+
+        args = self._make_args()
+        galaxy = DeltaGalaxy(args.btn, args.max_jump)
+        galaxy.read_sectors(delta, args.pop_code, args.ru_calc,
+                            args.route_reuse, args.routes, args.route_btn, args.mp_threads, args.debug_flag)
+        return galaxy
+
+    def test_empty_galaxy(self) -> None:
+        galaxy = Galaxy(0)
+        galaxy.borders.create_erode_border('separate', raster=True)
+        self.assertEqual({}, galaxy.borders.allyMap)
+        self.assertEqual({}, galaxy.borders.borders)
+
+    def test_raster_matches_dict_erode_border(self) -> None:
+        cases = [
+            ('BorderGeneration/Far Frontiers.sec', 'separate', 'BorderGeneration/Far Frontiers-erode-allymap.json',
+             'BorderGeneration/Far Frontiers-erode-border.json'),
+            ('BorderGeneration/Far Frontiers.sec', 'collapse', None, None),
+            ('BorderGeneration/Vanguard Reaches.sec', 'separate',
+             'BorderGeneration/Vanguard Reaches-erode-allymap.json',
+             'BorderGeneration/Vanguard Reaches-erode-border.json'),
+            ('BorderGeneration/Vanguard Reaches.sec', 'collapse', None, None),
+            ('DeltaFiles/Zarushagar-Ibara.sec', 'separate', None, None)
+        ]
+
+        for filename, match, mapfile, borderfile in cases:
+            with self.subTest(filename + ' ' + match):
+                ParseStarInput.deep_space = {}
+                sourcefile = self.unpack_filename(filename)
+                outputs = []
+                for raster in [False, True]:
+                    galaxy = self._load_galaxy(sourcefile)
+                    logger = galaxy.borders.logger
+                    logger.manager.disable = 0
+                    with self.assertLogs(logger, 'DEBUG') as logs:
+                        galaxy.borders.create_erode_border(match, True, raster=raster)
+                    # Hex order in the ally map decides which colour wins on shared edges, so it has to match too
+                    outputs.append((list(galaxy.borders.allyMap.items()), list(galaxy.borders.borders.items()),
+                                    logs.output))
+
+                self.assertEqual(outputs[0][2], outputs[1][2], "Unexpected log output")
+                self.assertEqual(outputs[0][0], outputs[1][0], "Raster ally map differs from dict ally map")
+                self.assertEqual(outputs[0][1], outputs[1][1], "Raster borders differ from dict borders")
+                if mapfile is not None:
+                    self.assertEqual(self.load_dict_from_json(self.unpack_filename(mapfile)), dict(outputs[1][0]))
+                    self.assertEqual(self.load_dict_from_json(self.unpack_filename(borderfile)), dict(outputs[1][1]))
+
+    def test_raster_matches_dict_on_small_maps(self) -> None:
+        cases = [
+            ('One world', [("0503", "ImDs")]),
+            ('Client state', [("0503", "CsIm")]),
+            ('Two worlds one hex apart', [("0603", "ImDs"), ("0605", "ImDs")]),
+            ('Two polities', [("0603", "ImDs"), ("0606", "Zh"), ("0803", "ImDs"), ("0806", "Zh")])
+        ]
+
+        for msg, worlds in cases:
+            with self.subTest(msg):
+                outputs = []
+                for raster in [False, True]:
+                    self.setUp()
+                    for counter, (loc, alg) in enumerate(worlds):
+                        self.setupOneWorldCoreSector(loc, counter, alg)
+                    self.borders.create_erode_border('separate', False, raster=raster)
+                    outputs.append((list(self.borders.allyMap.items()), list(self.borders.borders.items())))
+                self.assertEqual(outputs[0], outputs[1])
+
+    def test_erode_too_much_change(self) -> None:
+        self.setupOneWorldCoreSector("0503", 0, "ImDs")
+        logger = self.borders.logger
+        logger.manager.disable = 0
+
+        with patch.object(BorderRaster, 'erode', return_value=True) as mock_method, \
+                self.assertLogs(logger, 'DEBUG') as logs:
+            self.borders.create_erode_border('separate', False, raster=True)
+            self.assertEqual(100, mock_method.call_count)
+        exp_output = [
+            'INFO:PyRoute.Borders:Processing worlds for erode map drawing',
+            'ERROR:PyRoute.Borders:Change count for map processing exceeded expected value of 100',
+            'DEBUG:PyRoute.Borders:Change Count: 100'
+        ]
+        self.assertEqual(exp_output, logs.output)
+
+    def test_erode_stars_subset(self) -> None:
+        star_map = {(0, 0): 'ImDs', (5, 0): 'Zh', (9, 9): 'ImDs'}
+        stars = ErodeStars([0, 5, 0, 9], [0, 0, 0, 9], ['ImDs', 'Zh', 'ImDd', 'ImDs'], [3, 2, 3, 5], star_map,
+                           [0, 1, 2, 3], [0, 1, 2], 4, 5)
+
+        subset = stars.subset([True, False, True, True])
+        self.assertEqual([0, 0, 9], subset.q)
+        self.assertEqual(['ImDs', 'ImDd', 'ImDs'], subset.own_algs)
+        self.assertEqual([3, 3, 5], subset.ranges)
+        self.assertEqual({(0, 0): 'ImDs', (9, 9): 'ImDs'}, subset.star_map)
+        self.assertEqual([0, 2, 3], subset.index)
+        self.assertEqual([0, 2], subset.key_index)
+        self.assertEqual((4, 5), (subset.num_stars, subset.max_range))
@@ -0,0 +1,92 @@
+"""
+Created on Oct 19, 2026
+
+@author: CyberiaResurrection
+"""
+from unittest.mock import patch
+
+from PyRoute.Allies.BorderTiles import BorderTiles
+from PyRoute.DeltaDebug.DeltaDictionary import DeltaDictionary, SectorDictionary
+from PyRoute.DeltaDebug.DeltaGalaxy import DeltaGalaxy
+from PyRoute.Inputs.ParseStarInput import ParseStarInput
+from Tests.Mapping.testAllyGenBase import TestAllyGenBase
+
+
+class testBorderTiles(TestAllyGenBase):
+
+    def _load_galaxy(self) -> DeltaGalaxy:
+        ParseStarInput.deep_space = {}
+        delta = DeltaDictionary()
+        for filename in ['DeltaFiles/Zarushagar.sec', 'DeltaFiles/Dagudashaag.sec']:
+            sector = SectorDictionary.load_traveller_map_file(self.unpack_filename(filename))
+            delta[sector.name] = sector
+
+        args = self._make_args()
+        galaxy = DeltaGalaxy(args.btn, args.max_jump)
+        galaxy.read_sectors(delta, args.pop_code, args.ru_calc,
+                            args.route_reuse, args.routes, args.route_btn, args.mp_threads, args.debug_flag)
+        return galaxy
+
+    def test_tiles_match_single_run(self) -> None:
+        galaxy = self._load_galaxy()
+        borders = galaxy.borders
+
+        for match in ['separate', 'collapse']:
+            with self.subTest(match):
+                borders.borders = {}
+                borders.create_erode_border(match, False, raster=True)
+                exp_map = list(borders.allyMap.items())
+                exp_borders = list(borders.borders.items())
+                stars = borders._erode_stars(match)
+
+                for tile_size in [1, 2]:
+                    tiles = BorderTiles(borders.logger, borders._alg_sizes(), 2, tile_size)
+                    borders.logger.manager.disable = 0
+                    with self.assertLogs(borders.logger, 'INFO') as logs:
+                        ally_map = tiles.erode_border(stars)
+                    self.assertEqual(exp_map, list(ally_map.items()), "Tiled ally map differs from single run")
+                    self.assertNotIn('WARNING', ' '.join(logs.output))
+
+                borders.borders = {}
+                borders.create_erode_border(match, False, raster=True, mp_threads=2)
+                self.assertEqual(exp_map, list(borders.allyMap.items()))
+                self.assertEqual(exp_borders, list(borders.borders.items()))
+
+    def test_seam_disagreement_erodes_in_one_piece(self) -> None:
+        galaxy = self._load_galaxy()
+        borders = galaxy.borders
+        borders.create_erode_border('separate', False, raster=True)
+        expected = list(borders.allyMap.items())
+
+        # Without a halo, tiles can't see each other's worlds
+        tiles = BorderTiles(borders.logger, borders._alg_sizes(), 2, 1)
+        borders.logger.manager.disable = 0
+        with patch.object(BorderTiles, 'halo', 0), self.assertLogs(borders.logger, 'WARNING') as logs:
+            ally_map = tiles.erode_border(borders._erode_stars('separate'))
+        self.assertEqual(
+            ['WARNING:PyRoute.Borders:Border tiles disagree at their seams, eroding the galaxy in one piece'],
+            logs.output)
+        self.assertEqual(expected, list(ally_map.items()))
+
+    def test_one_tile_runs_in_one_piece(self) -> None:
+        self.setupOneWorldCoreSector("0503", 0, "ImDs")
+        logger = self.borders.logger
+        logger.manager.disable = 0
+
+        with self.assertLogs(logger, 'DEBUG') as logs:
+            self.borders.create_erode_border('separate', False, raster=True, mp_threads=4)
+        self.assertEqual(['INFO:PyRoute.Borders:Processing worlds for erode map drawing',
+                          'DEBUG:PyRoute.Borders:Change Count: 1'], logs.output)
+        self.assertIn('ImDs', self.borders.allyMap.values())
+
+    def test_stitch(self) -> None:
+        tiles = BorderTiles(self.borders.logger, {}, 2, 1)
+        cores = [(0, 31, 0, 39), (32, 63, 0, 39)]
+        results = [([(31, -16, 'ImDs', 5), (30, -15, 'ImDs', 2)], {(32, -16): 'Zh'}),
+                   ([(32, -16, 'Zh', 3)], {(31, -16): 'ImDs', (30, -15): 'ImDs'})]
+
+        self.assertEqual([(30, -15), (32, -16), (31, -16)], list(tiles.stitch(cores, results)))
+        results[1] = ([(32, -16, 'Zh', 3)], {(31, -16): 'Zh', (30, -15): 'ImDs'})
+        self.assertIsNone(tiles.stitch(cores, results))
+        results[1] = ([(32, -16, 'Zh', 3)], {(31, -16): 'ImDs'})
+        self.assertIsNone(tiles.stitch(cores, results))
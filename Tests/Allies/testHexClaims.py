@@ -0,0 +1,68 @@
+"""
+Created on Oct 19, 2026
+
+@author: CyberiaResurrection
+"""
+import numpy as np
+
+from PyRoute.Allies.HexClaims import HexClaims
+from PyRoute.Position.Hex import Hex
+from Tests.baseTest import baseTest
+
+
+class testHexClaims(baseTest):
+
+    def test_stencil_matches_ring_walk(self) -> None:
+        cand_hex = (0, 0)
+        expected = []
+        for dist in range(1, 5):
+            neighbour = Hex.get_neighbor(cand_hex, 4, dist)
+            for side in range(6):
+                for _ in range(dist):
+                    expected.append((neighbour[0], neighbour[1], Hex.axial_distance(cand_hex, neighbour)))
+                    neighbour = Hex.get_neighbor(neighbour, side)
+
+        self.assertEqual(tuple(expected), HexClaims.stencil(4))
+        self.assertEqual(tuple(expected[:6]), HexClaims.stencil(1))
+        self.assertEqual((), HexClaims.stencil(0))
+
+    def test_claims(self) -> None:
+        width = 10
+        cells = np.array([22, 25], dtype=np.int64)
+        own_ids = np.array([1, 2], dtype=np.int64)
+        ring_ids = np.array([3, 4], dtype=np.int64)
+        ranges = np.array([2, 1], dtype=np.int64)
+
+        cell, dist, alg, rank = HexClaims.claims(cells, width, own_ids, ring_ids, ranges)
+        ring = [dq * width + dr for dq, dr, _ in HexClaims.stencil(1)]
+        self.assertEqual([22, 25] + [22 + offset for offset in ring], cell.tolist())
+        self.assertEqual([0, 0] + [1] * 6, dist.tolist())
+        self.assertEqual([1, 2] + [3] * 6, alg.tolist())
+        self.assertEqual([0, 1, 2, 3, 4, 5, 6, 7], rank.tolist())
+
+    def test_claims_for_part_of_galaxy(self) -> None:
+        # The second world on its own, as the fourth of five worlds in a galaxy with ranges up to 3
+        width = 10
+        cells = np.array([25], dtype=np.int64)
+        ids = np.array([2], dtype=np.int64)
+        ranges = np.array([2], dtype=np.int64)
+
+        cell, dist, alg, rank = HexClaims.claims(cells, width, ids, ids, ranges, index=np.array([3], dtype=np.int64),
+                                                 num_stars=5, max_range=3)
+        ring_size = len(HexClaims.stencil(2))
+        self.assertEqual(7, len(cell))
+        self.assertEqual([3] + [5 + 3 * ring_size + k for k in range(6)], rank.tolist())
+
+    def test_resolve(self) -> None:
+        # cell 7 - one allegiance, claimed twice; cell 5 - closest claim wins; cell 3 - tie at distance 1
+        cell = np.array([7, 5, 3, 7, 5, 3, 3], dtype=np.int64)
+        dist = np.array([1, 2, 1, 1, 1, 1, 2], dtype=np.int64)
+        alg = np.array([4, 4, 6, 4, 2, 5, 1], dtype=np.int64)
+        rank = np.array([0, 1, 2, 3, 4, 5, 6], dtype=np.int64)
+
+        cells, min_dist, algs, tied, first_rank = HexClaims.resolve(cell, dist, alg, rank)
+        self.assertEqual([7, 5, 3], cells.tolist())
+        self.assertEqual([0, 1, 2], first_rank.tolist())
+        self.assertEqual([1, 1, 1], min_dist.tolist())
+        self.assertEqual([4, 2, -1], algs.tolist())
+        self.assertEqual({2: [5, 6]}, tied)
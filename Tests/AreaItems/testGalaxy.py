@@ -143,17 +143,76 @@ class testGalaxy(baseTest):
     def test_is_well_formed_8(self) -> None:
         galaxy = Galaxy(0)
         star = Star()
-        star.is_well_formed = MagicMock(side_effect=AssertionError('Dummy message'))
 
         msg = None
-        try:
+        # Star is fully slotted, so the mock has to go on the class rather than the instance
+        with patch.object(Star, 'is_well_formed', side_effect=AssertionError('Dummy message')) as mock_method:
+            try:
+                galaxy.stars.add_node(0, star=star)
+                galaxy.star_mapping[0] = star
+                galaxy.is_well_formed()
+            except AssertionError as e:
+                msg = str(e)
+        self.assertEqual('Dummy message', msg)
+        mock_method.assert_called()
+
+    def test_is_well_formed_skipped_when_validation_off(self) -> None:
+        galaxy = Galaxy(0)
+        galaxy.validate = 'none'
+        star = Star()
+
+        with patch.object(Star, 'is_well_formed', side_effect=AssertionError('Dummy message')) as mock_method:
             galaxy.stars.add_node(0, star=star)
             galaxy.star_mapping[0] = star
             galaxy.is_well_formed()
-        except AssertionError as e:
-            msg = str(e)
-        self.assertEqual('Dummy message', msg)
-        star.is_well_formed.assert_called()
+        mock_method.assert_not_called()
+
+    def test_validate_levels_on_read(self) -> None:
+        sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
+        # level, star checks during read, recorded as validated, star checks on a later is_well_formed call
+        cases = [
+            ('none', 0, False, 0),
+            ('load', 1, True, 0),
+            ('full', 1, False, 1)
+        ]
+
+        for validate, load_checks, validated, later_checks in cases:
+            with self.subTest(validate):
+                readparms = ReadSectorOptions(sectors=[sourcefile], pop_code='scaled', ru_calc='scaled',
+                                              route_reuse=10, trade_choice='trade', route_btn=8, mp_threads=1,
+                                              debug_flag=False, fix_pop=False, deep_space={}, map_type='classic',
+                                              validate=validate)
+                galaxy = Galaxy(min_btn=8, max_jump=4)
+                with patch.object(Star, 'is_well_formed', return_value=True) as mock_method:
+                    galaxy.read_sectors(readparms)
+                    num_stars = len(galaxy.star_mapping)
+                    self.assertEqual(load_checks * num_stars, mock_method.call_count)
+                self.assertEqual(validated, galaxy.validated)
+
+                for index, star in galaxy.star_mapping.items():
+                    galaxy.stars.add_node(index, star=star)
+                with patch.object(Star, 'is_well_formed', return_value=True) as mock_method:
+                    galaxy.is_well_formed()
+                    galaxy.is_well_formed()
+                    self.assertEqual(2 * later_checks * num_stars, mock_method.call_count)
+
+    def test_read_sectors_drops_intern_tables(self) -> None:
+        sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
+        readparms = ReadSectorOptions(sectors=[sourcefile], pop_code='scaled', ru_calc='scaled',
+                                      route_reuse=10, trade_choice='trade', route_btn=8, mp_threads=1,
+                                      debug_flag=False, fix_pop=False, deep_space={}, map_type='classic')
+        galaxy = Galaxy(min_btn=8, max_jump=4)
+        galaxy.read_sectors(readparms)
+
+        self.assertEqual({}, UWP.interned)
+        self.assertEqual({}, TradeCodes.interned)
+        self.assertEqual({}, StarList.interned)
+        # Worlds loaded together still share parses of the same stellar string
+        star_lists: dict[str, StarList] = {}
+        for star in galaxy.star_mapping.values():
+            first = star_lists.setdefault(star.star_list_object.stars_line, star.star_list_object)
+            self.assertIs(first, star.star_list_object)
+        self.assertLess(len(star_lists), len(galaxy.star_mapping))
 
     """
     A very simple, barebones test to check that Verge and Reft end up in their correct relative positions
@@ -353,6 +412,50 @@ class testGalaxy(baseTest):
                 elif 'trade' == routes:
                     self.assertEqual(8, galaxy.trade.min_btn)
 
+    def test_trade_code_flags_column(self) -> None:
+        sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
+        readparms = ReadSectorOptions(sectors=[sourcefile], pop_code='scaled', ru_calc='scaled', route_reuse=10,
+                                      trade_choice='trade', route_btn=8, mp_threads=1, debug_flag=False, fix_pop=False,
+                                      deep_space={}, map_type='classic')
+
+        galaxy = Galaxy(min_btn=8, max_jump=4)
+        galaxy.read_sectors(readparms)
+        flags = galaxy.trade_code_flags()
+
+        self.assertEqual(len(galaxy.star_mapping), len(flags))
+        for index, star in galaxy.star_mapping.items():
+            self.assertEqual(star.tradeCode.flags, flags[index])
+        agricultural = 0 != flags & TradeCodes.AGRICULTURAL
+        self.assertEqual(sum(star.tradeCode.agricultural for star in galaxy.star_mapping.values()), agricultural.sum())
+
+    def test_hex_index(self) -> None:
+        sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
+        readparms = ReadSectorOptions(sectors=[sourcefile], pop_code='scaled', ru_calc='scaled', route_reuse=10,
+                                      trade_choice='trade', route_btn=8, mp_threads=1, debug_flag=False, fix_pop=False,
+                                      deep_space={}, map_type='classic')
+
+        galaxy = Galaxy(min_btn=8, max_jump=4)
+        galaxy.read_sectors(readparms)
+
+        self.assertEqual(len(galaxy.star_mapping), len(galaxy.hex_index))
+        for index, star in galaxy.star_mapping.items():
+            self.assertEqual(index, galaxy.hex_index[star.hex_position])
+            self.assertTrue(star is galaxy.star_at(star.hex_position))
+
+        centre = galaxy.star_mapping[0]
+        for radius in [0, 1, 4]:
+            with self.subTest(radius=radius):
+                expected = {star.index for star in galaxy.star_mapping.values() if centre.distance(star) <= radius}
+                actual = {star.index for star in galaxy.stars_within(centre.hex_position, radius)}
+                self.assertEqual(expected, actual)
+
+        sector = centre.sector
+        galaxy.remove_star_from_galaxy(centre)
+        self.assertIsNone(galaxy.star_at(centre.hex_position))
+        self.assertIsNone(sector.find_world_by_pos(centre.position))
+        self.assertNotIn(centre.index, galaxy.star_mapping)
+        self.assertNotIn(centre, galaxy.alg[centre.alg_base_code].worlds)
+
     def test_process_owned_worlds_1(self) -> None:
         sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
 
@@ -732,6 +835,23 @@ class testGalaxy(baseTest):
                 else:
                     mock_method.assert_not_called()
 
+    def test_set_borders_erode_raster(self) -> None:
+        cases = [
+            ('collapse', True),
+            ('separate', False)
+        ]
+
+        for match, enforce in cases:
+            with self.subTest(match):
+                galaxy = Galaxy(min_btn=15, max_jump=4)
+                with patch.object(galaxy.borders, 'create_erode_border') as mock_method:
+                    galaxy.set_borders('erode-raster', match, enforce)
+                mock_method.assert_called_with(match, enforce, raster=True, mp_threads=1)
+
+                with patch.object(galaxy.borders, 'create_erode_border') as mock_method:
+                    galaxy.set_borders('erode-raster', match, enforce, mp_threads=4)
+                mock_method.assert_called_with(match, enforce, raster=True, mp_threads=4)
+
     def test_check_allegiance_counts_well_formed_1(self) -> None:
         galaxy = Galaxy(min_btn=15, max_jump=4)
         galaxy.sectors['Core'] = Sector('# Core', '# 0, 0')
@@ -8,6 +8,7 @@ from PyRoute.AreaItems.Allegiance import Allegiance
 from PyRoute.AreaItems.Sector import Sector
 from PyRoute.StatCalculation.ObjectStatistics import ObjectStatistics
 from PyRoute.AreaItems.Subsector import Subsector
+from PyRoute.Star import Star
 from Tests.baseTest import baseTest
 
 
@@ -360,6 +361,34 @@ class testSector(baseTest):
         sector = Sector(name, position)
         self.assertIsNone(sector.find_world_by_pos('0101'))
 
+    def test_find_world_by_pos_indexed(self) -> None:
+        sector = Sector('# Core', '# 0, 0')
+        star1 = Star.parse_line_into_star(
+            "0103 Irkigkhan            C9C4733-9 Fl                   { 0 }  (E69+0) [4726] B     - - 123 8  Im M2 V           ",
+            sector, 'fixed', 'fixed')
+        star2 = Star.parse_line_into_star(
+            "0104 Shana Ma             E551112-7 Lo Po                { -3 } (301-3) [1113] B     - - 913 9  Im K2 IV M7 V     ",
+            sector, 'fixed', 'fixed')
+        dupe = Star.parse_line_into_star(
+            "0104 Shana Mb             E551112-7 Lo Po                { -3 } (301-3) [1113] B     - - 913 9  Im K2 IV M7 V     ",
+            sector, 'fixed', 'fixed')
+
+        sector.add_world(star1)
+        sector.add_world(star2)
+        sector.add_world(dupe)
+        self.assertTrue(star1 is sector.find_world_by_pos('0103'))
+        self.assertTrue(star2 is sector.find_world_by_pos('0104'), "First world at a position should be found")
+        self.assertIsNone(sector.find_world_by_pos('0105'))
+
+        sector.remove_world(star2)
+        self.assertTrue(dupe is sector.find_world_by_pos('0104'), "Remaining world at position should be found")
+        sector.remove_world(dupe)
+        self.assertIsNone(sector.find_world_by_pos('0104'))
+
+        # Worlds added directly to the list still get found
+        sector.worlds.append(star2)
+        self.assertTrue(star2 is sector.find_world_by_pos('0104'))
+
     def test_eq_1(self) -> None:
         name = "# Fnordia"
         position = "# -5, 4"
@@ -8,6 +8,7 @@ from unittest.mock import patch
 
 from PyRoute.AreaItems.Galaxy import Galaxy
 from PyRoute.AreaItems.Sector import Sector
+from PyRoute.Calculation.RouteCalculation import RouteCalculation
 from PyRoute.Calculation.XRouteCalculation import XRouteCalculation
 from PyRoute.DataClasses.ReadSectorOptions import ReadSectorOptions
 from PyRoute.Pathfinding.ApproximateShortestPathForestUnified import ApproximateShortestPathForestUnified
@@ -33,6 +34,22 @@ class testXRouteCalculation(baseTest):
         self.assertEqual([], calc.secCapitals)
         self.assertEqual([], calc.subCapitals)
 
+    def test_raw_ranges_within_jump_match_all_pairs(self) -> None:
+        sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
+        readparms = ReadSectorOptions(sectors=[sourcefile], pop_code='scaled', ru_calc='scaled', route_reuse=10,
+                                      trade_choice='xroute', route_btn=8, mp_threads=1, debug_flag=False,
+                                      fix_pop=False, deep_space={}, map_type='classic')
+        galaxy = Galaxy(min_btn=8, max_jump=4)
+        galaxy.read_sectors(readparms)
+        calc = galaxy.trade
+        self.assertIsInstance(calc, XRouteCalculation)
+
+        expected = [(star, neighbour) for (star, neighbour) in RouteCalculation._raw_ranges(calc)
+                    if star.distance(neighbour) <= galaxy.max_jump_range]
+        actual = list(calc._raw_ranges())
+        self.assertEqual(len(expected), len(actual))
+        self.assertEqual(expected, actual, "Hex-index ranges should come out in the same order as the full scan")
+
     def find_sector_capital_1(self) -> None:
         galaxy = Galaxy(8)
         calc = XRouteCalculation(galaxy)
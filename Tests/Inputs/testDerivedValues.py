@@ -0,0 +1,75 @@
+"""
+Created on Oct 19, 2026
+
+@author: CyberiaResurrection
+"""
+from PyRoute.AreaItems.Galaxy import Galaxy
+from PyRoute.DataClasses.ReadSectorOptions import ReadSectorOptions
+from PyRoute.Inputs.DerivedValues import DerivedValues
+from Tests.baseTest import baseTest
+
+
+class testDerivedValues(baseTest):
+
+    derived = ['wtn', 'mspr', 'population', 'perCapita', 'gwp', 'ship_capacity', 'tcs_gwp', 'budget', 'raw_be',
+               'col_be', 'im_be', 'ru', 'eti_cargo', 'eti_passenger']
+
+    def _load(self, pop_code: str, ru_calc: str) -> Galaxy:
+        sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
+        readparms = ReadSectorOptions(sectors=[sourcefile], pop_code=pop_code, ru_calc=ru_calc, route_reuse=10,
+                                      trade_choice='trade', route_btn=8, mp_threads=1, debug_flag=False,
+                                      fix_pop=False, deep_space={}, map_type='classic')
+        galaxy = Galaxy(min_btn=8, max_jump=4)
+        galaxy.read_sectors(readparms)
+        return galaxy
+
+    def _snapshot(self, star) -> list:
+        values = [(getattr(star, name), type(getattr(star, name))) for name in self.derived]
+        values.append(star.uwpCodes['Pop Code'])
+        return values
+
+    def test_bulk_matches_scalar_methods(self) -> None:
+        cases = [
+            ('scaled', 'scaled'),
+            ('scaled', 'negative'),
+            ('fixed', 'scaled'),
+            ('fixed', 'negative')
+        ]
+
+        for pop_code, ru_calc in cases:
+            with self.subTest(pop_code + ' ' + ru_calc):
+                galaxy = self._load(pop_code, ru_calc)
+                self.assertLess(0, len(galaxy.star_mapping))
+                for star in galaxy.star_mapping.values():
+                    bulk = self._snapshot(star)
+                    star.calculate_wtn()
+                    star.calculate_mspr()
+                    star.calculate_gwp(pop_code)
+                    star.calculate_TCS()
+                    star.calculate_army()
+                    star.calculate_ru(ru_calc)
+                    star.calculate_eti()
+                    self.assertEqual(self._snapshot(star), bulk, "Bulk values differ from scalar for " + str(star))
+
+    def test_benford_is_seeded(self) -> None:
+        first = self._load('benford', 'scaled')
+        second = self._load('benford', 'scaled')
+
+        drawn = 0
+        for index, star in first.star_mapping.items():
+            other = second.star_mapping[index]
+            self.assertEqual(self._snapshot(star), self._snapshot(other), "Benford draws not repeatable for " + str(star))
+            if 1 <= star.popM <= 6:
+                self.assertEqual(DerivedValues.pop_code_m[star.popM] / 10, float(star.uwpCodes['Pop Code']))
+            else:
+                drawn += 1
+                self.assertIn(star.uwpCodes['Pop Code'], ['4.0', '5.0', '6.0', '7.0', '8.0', '9.0'])
+        self.assertLess(0, drawn, "Test data should include worlds needing a benford draw")
+
+        stars = list(first.star_mapping.values())
+        DerivedValues.calculate(stars, 'benford', 'scaled', seed=DerivedValues.benford_seed + 1)
+        reseeded = [star.uwpCodes['Pop Code'] for star in stars]
+        self.assertNotEqual([star.uwpCodes['Pop Code'] for star in second.star_mapping.values()], reseeded)
+
+    def test_empty_star_list(self) -> None:
+        DerivedValues.calculate([], 'scaled', 'scaled')
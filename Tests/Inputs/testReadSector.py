@@ -3,7 +3,14 @@ Created on May 18, 2025
 
 @author: CyberiaResurrection
 """
+import logging
+from typing import Optional
+from unittest.mock import MagicMock, patch
+
+from PyRoute.AreaItems.Galaxy import Galaxy
 from PyRoute.DeltaDebug.DeltaDictionary import SectorDictionary
+from PyRoute.Inputs.ParseSectorInput import ParseSectorInput
+from PyRoute.Inputs.ParseStarInput import ParseStarInput
 from Tests.baseTest import baseTest
 
 
@@ -14,3 +21,92 @@ class testReadSector(baseTest):
 
         sector = SectorDictionary.load_traveller_map_file(sourcefile)
         self.assertEqual(518, len(sector.lines), "Unexpected # of lines")
+
+    def _read_sector(self, sourcefile: str, chunk_size: Optional[int]) -> tuple[list, list[str]]:
+        galaxy = Galaxy(8)
+        galaxy._set_trade_object(10, 'none', 8, 1, False)
+        ParseStarInput.deep_space = {}
+        logger = galaxy.logger
+        # Reading a sector into a SectorDictionary switches warnings off, so switch them back on
+        logging.disable(logging.NOTSET)
+        with self.assertLogs('PyRoute', level='WARNING') as logs:
+            # Make sure there's always at least one log record, so assertLogs doesn't fail on a clean sector
+            logger.warning('start')
+            if chunk_size is None:
+                headers, starlines = ParseSectorInput.read_sector_file(sourcefile, logger)
+                sec, counter = ParseSectorInput.read_parsed_sector_to_sector_object(False, headers, set(), logger,
+                                                                                    'scaled', 'scaled', sourcefile,
+                                                                                    0, starlines, galaxy)
+            else:
+                sec, counter = ParseSectorInput.stream_sector_file_to_sector_object(False, set(), logger, 'scaled',
+                                                                                    'scaled', sourcefile, 0, galaxy,
+                                                                                    chunk_size)
+        stars = [(star.index, star.position, str(star), str(star.uwp), star.alg_code, str(star.tradeCode))
+                 for star in sec.worlds]
+        return [stars, counter, sorted(galaxy.alg), sorted(sec.subsectors)], logs.output
+
+    def test_stream_matches_batch_read(self) -> None:
+        cases = [
+            'DeltaFiles/read_kilong_sector/Kilong.sec',
+            'DeltaFiles/Zarushagar-Ibara.sec'
+        ]
+
+        for filename in cases:
+            sourcefile = self.unpack_filename(filename)
+            expected, expected_logs = self._read_sector(sourcefile, None)
+            self.assertLess(0, len(expected[0]))
+            for chunk_size in [1, 7, 1000]:
+                with self.subTest(filename + ' ' + str(chunk_size)):
+                    actual, actual_logs = self._read_sector(sourcefile, chunk_size)
+                    self.assertEqual(expected, actual)
+                    self.assertEqual(expected_logs, actual_logs)
+
+    def test_stream_missing_file(self) -> None:
+        galaxy = Galaxy(8)
+        with self.assertLogs('PyRoute.Galaxy', level='ERROR') as logs:
+            sec, counter = ParseSectorInput.stream_sector_file_to_sector_object(False, set(), galaxy.logger, 'scaled',
+                                                                                'scaled', 'no_such_file.sec', 0,
+                                                                                galaxy)
+        self.assertIsNone(sec)
+        self.assertIsNone(counter)
+        self.assertEqual(['ERROR:PyRoute.Galaxy:sector file no_such_file.sec not found'], logs.output)
+
+    def test_stream_duplicate_sector(self) -> None:
+        sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
+        galaxy = Galaxy(8)
+        galaxy._set_trade_object(10, 'none', 8, 1, False)
+        loaded_sectors: set[str] = set()
+        sec, counter = ParseSectorInput.stream_sector_file_to_sector_object(False, loaded_sectors, galaxy.logger,
+                                                                            'scaled', 'scaled', sourcefile, 0, galaxy)
+        self.assertIsNotNone(sec)
+        with self.assertLogs('PyRoute.Galaxy', level='ERROR'):
+            nu_sec, nu_counter = ParseSectorInput.stream_sector_file_to_sector_object(False, loaded_sectors,
+                                                                                      galaxy.logger, 'scaled',
+                                                                                      'scaled', sourcefile, counter,
+                                                                                      galaxy)
+        self.assertIsNone(nu_sec)
+        self.assertEqual(counter, len(galaxy.star_mapping))
+
+    def test_stream_read_failure_backs_out_stars(self) -> None:
+        sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
+        with open(sourcefile, 'r', encoding='utf-8') as infile:
+            lines = infile.readlines()
+
+        def broken_read():
+            yield from lines[0:-3]
+            raise OSError('Disk on fire')
+
+        handle = MagicMock()
+        handle.__enter__.return_value = broken_read()
+        galaxy = Galaxy(8)
+        galaxy._set_trade_object(10, 'none', 8, 1, False)
+        loaded_sectors: set[str] = set()
+        with patch('PyRoute.Inputs.ParseSectorInput.codecs.open', return_value=handle), \
+                self.assertLogs('PyRoute.Galaxy', level='ERROR'):
+            sec, counter = ParseSectorInput.stream_sector_file_to_sector_object(False, loaded_sectors, galaxy.logger,
+                                                                                'scaled', 'scaled', sourcefile, 0,
+                                                                                galaxy, 2)
+        self.assertIsNone(sec)
+        self.assertIsNone(counter)
+        self.assertEqual({}, galaxy.star_mapping)
+        self.assertEqual(set(), loaded_sectors)
@@ -226,6 +226,45 @@ class testLandmarksExtremes(baseTest):
         self.assertEqual(expected_components, actual)
         self.assertEqual(expected_landmarks, landmarks)
 
+    def test_parallel_landmarks_match_serial(self) -> None:
+        source1 = self.unpack_filename('../DeltaFiles/Dagudashaag.sec')
+        source2 = self.unpack_filename('../DeltaFiles/Zarushagar.sec')
+
+        delta = DeltaDictionary()
+        sector = SectorDictionary.load_traveller_map_file(source1)
+        self.assertIsNotNone(sector, "Sector file not loaded from " + source1)
+        delta[sector.name] = sector
+        sector = SectorDictionary.load_traveller_map_file(source2)
+        self.assertIsNotNone(sector, "Sector file not loaded from " + source2)
+        delta[sector.name] = sector
+
+        args = self._make_args()
+        args.max_jump = 1
+
+        galaxy = DeltaGalaxy(args.btn, args.max_jump)
+        galaxy.read_sectors(delta, args.pop_code, args.ru_calc,
+                            args.route_reuse, args.routes, args.route_btn, args.mp_threads, args.debug_flag)
+        galaxy.output_path = args.output
+
+        galaxy.generate_routes()
+        galaxy.trade.calculate_components()
+
+        btn = [(s, n, d) for (s, n, d) in galaxy.ranges.edges(data=True) if s.component == n.component]
+        btn.sort(key=lambda tn: tn[2]['btn'], reverse=True)
+
+        serial = LandmarksTriaxialExtremes(galaxy)
+        self.assertEqual(1, serial.mp_threads)
+        expected_landmarks, expected_components = serial.get_landmarks(btn=btn)
+
+        parallel = LandmarksTriaxialExtremes(galaxy)
+        parallel.mp_threads = 2
+        actual_landmarks, actual_components = parallel.get_landmarks(btn=btn)
+
+        self.assertEqual(expected_components, actual_components)
+        self.assertEqual(expected_landmarks, actual_landmarks)
+        multi_landmark = [comp for comp in expected_components if 4 < len(expected_components[comp])]
+        self.assertLess(1, len(multi_landmark), "Need multiple components with avoid-powered landmarks")
+
     def test_max_slots(self) -> None:
         cases = [
             (501, 10),
@@ -250,6 +289,32 @@ class testLandmarksExtremes(baseTest):
             foo = LandmarksTriaxialExtremes(galaxy)
             self.assertEqual(expected, foo.max_slots)
 
+    def test_max_slots_with_memory_budget(self) -> None:
+        sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
+
+        sector = SectorDictionary.load_traveller_map_file(sourcefile)
+        delta = DeltaDictionary()
+        delta[sector.name] = sector
+
+        cases = [
+            ('No budget', None, False, 15),
+            ('Ample budget', 1024, False, 15),
+            ('Tiny budget', 0, False, 1),
+            ('Tiny budget, float32', 0, True, 1),
+        ]
+
+        for msg, budget, float32, expected in cases:
+            with self.subTest(msg):
+                args = self._make_args()
+                galaxy = DeltaGalaxy(args.btn, args.max_jump)
+                galaxy.read_sectors(delta, args.pop_code, args.ru_calc,
+                                    args.route_reuse, args.routes, args.route_btn, args.mp_threads, args.debug_flag)
+                galaxy.trade.pathfinding_memory = budget
+                galaxy.trade.forest_float32 = float32
+
+                foo = LandmarksTriaxialExtremes(galaxy)
+                self.assertEqual(expected, foo.max_slots)
+
     def test_landmarks_on_ibara_subsector_single_component(self) -> None:
         sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
 
@@ -191,6 +191,68 @@ class testApproximateShortestPathForest(baseTest):
         delta = nubound - oldbound
         self.assertGreater(max(delta), 0, "At least one heuristic value should be improved by extra tree")
 
+    def test_expand_forest_repeatedly(self) -> None:
+        sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
+
+        sector = SectorDictionary.load_traveller_map_file(sourcefile)
+        delta = DeltaDictionary()
+        delta[sector.name] = sector
+
+        args = self._make_args()
+
+        galaxy = DeltaGalaxy(args.btn, args.max_jump)
+        galaxy.read_sectors(delta, args.pop_code, args.ru_calc,
+                            args.route_reuse, args.routes, args.route_btn, 1, False)
+        galaxy.output_path = args.output
+
+        galaxy.generate_routes()
+        galaxy.trade.calculate_components()
+
+        graph = galaxy.stars
+        stars = list(graph.nodes)
+        source = stars[0]
+
+        seeds = [{0: 1}]
+        approx = ApproximateShortestPathForestUnified(source, graph, epsilon=0.1, sources=seeds)
+        first_tree = approx.distances[:, 0].copy()
+
+        for seed in [2, 3, 4, 5]:
+            approx.expand_forest({0: seed})
+
+        self.assertEqual(5, approx.num_trees)
+        self.assertEqual((len(stars), 5), approx.distances.shape)
+        np.testing.assert_array_equal(first_tree, approx.distances[:, 0], "Expansion should not disturb existing trees")
+
+        for i, seed in enumerate([1, 2, 3, 4, 5]):
+            self.assertEqual(0, approx.distances[seed, i], "Seed " + str(seed) + " should be zero in its own tree")
+
+    def test_float32_forest_bounds_stay_admissible(self) -> None:
+        galaxy = self.set_up_zarushagar_sector()
+
+        graph = galaxy.stars
+        source = 0
+        seeds = [{0: 1}, {0: 20}, {0: 40}]
+
+        approx64 = ApproximateShortestPathForestUnified(source, graph, epsilon=0.1, sources=seeds)
+        approx32 = ApproximateShortestPathForestUnified(source, graph, epsilon=0.1, sources=seeds, float32=True)
+        self.assertFalse(approx64.float32)
+        self.assertTrue(approx32.float32)
+        self.assertEqual(np.float32, approx32.distances.dtype)
+
+        approx64.expand_forest({0: 60})
+        approx32.expand_forest({0: 60})
+        self.assertEqual(np.float32, approx32.distances.dtype)
+
+        for target in [0, 11, 37]:
+            bound64 = approx64.lower_bound_bulk(target)
+            bound32 = approx32.lower_bound_bulk(target)
+            self.assertEqual(np.float64, bound32.dtype, "Bulk lower bound must stay float64 for pathfinding")
+            self.assertTrue((bound32 <= bound64).all(), "float32 lower bounds must not exceed float64 bounds")
+            np.testing.assert_allclose(bound64, bound32, atol=0.1)
+            for src in [3, 29]:
+                self.assertLessEqual(approx32.lower_bound(src, target), approx64.lower_bound(src, target))
+                self.assertGreaterEqual(approx32.triangle_upbound(src, target), approx64.triangle_upbound(src, target))
+
     def set_up_zarushagar_sector(self) -> DeltaGalaxy:
         sourcefile = self.unpack_filename('DeltaFiles/Zarushagar.sec')
         sector = SectorDictionary.load_traveller_map_file(sourcefile)
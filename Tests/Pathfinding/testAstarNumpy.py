@@ -3,7 +3,10 @@ Created on Sep 21, 2023
 
 @author: CyberiaResurrection
 """
+from concurrent.futures import ThreadPoolExecutor
+
 from PyRoute.Pathfinding.DistanceGraph import DistanceGraph
+from PyRoute.Pathfinding.astar_numpy_fallback import astar_path_csr as astar_path_csr_fallback
 from PyRoute.DeltaDebug.DeltaDictionary import SectorDictionary, DeltaDictionary
 from PyRoute.DeltaDebug.DeltaGalaxy import DeltaGalaxy
 from PyRoute.Inputs.ParseStarInput import ParseStarInput
@@ -21,15 +24,15 @@ except AttributeError:
     from PyRoute.Pathfinding.ApproximateShortestPathForestUnifiedFallback import ApproximateShortestPathForestUnified
     goodimport = False
 try:
-    from PyRoute.Pathfinding.astar_numpy import astar_path_numpy
+    from PyRoute.Pathfinding.astar_numpy import astar_path_numpy, astar_path_csr
 except ModuleNotFoundError:
-    from PyRoute.Pathfinding.astar_numpy_fallback import astar_path_numpy
+    from PyRoute.Pathfinding.astar_numpy_fallback import astar_path_numpy, astar_path_csr
     goodimport = False
 except ImportError:
-    from PyRoute.Pathfinding.astar_numpy_fallback import astar_path_numpy
+    from PyRoute.Pathfinding.astar_numpy_fallback import astar_path_numpy, astar_path_csr
     goodimport = False
 except AttributeError:
-    from PyRoute.Pathfinding.astar_numpy_fallback import astar_path_numpy
+    from PyRoute.Pathfinding.astar_numpy_fallback import astar_path_numpy, astar_path_csr
     goodimport = False
 
 
@@ -79,3 +82,46 @@ class testAStarNumpy(baseTest):
                                                   diagnostics=True)
         self.assertEqual(exp_route, act_route)
         self.assertEqual(exp_diagnostics, diagnostics)
+
+    def testAStarCsrMatchesAStarNumpy(self) -> None:
+        sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
+
+        sector = SectorDictionary.load_traveller_map_file(sourcefile)
+        delta = DeltaDictionary()
+        delta[sector.name] = sector
+
+        args = self._make_args()
+
+        galaxy = DeltaGalaxy(args.btn, args.max_jump)
+        galaxy.read_sectors(delta, args.pop_code, args.ru_calc,
+                            args.route_reuse, args.routes, args.route_btn, args.mp_threads, args.debug_flag)
+        galaxy.output_path = args.output
+
+        galaxy.generate_routes()
+        galaxy.trade.calculate_components()
+        dist_graph = DistanceGraph(galaxy.stars)
+        galaxy.trade.star_graph = dist_graph
+        galaxy.trade.shortest_path_tree = ApproximateShortestPathForestUnified(0, galaxy.stars, 0)
+        heuristic = galaxy.heuristic_distance_bulk
+        csr = dist_graph.csr()
+
+        pairs = [(0, 36), (36, 0), (1, 30), (19, 25), (8, 9)]
+        upbounds = [galaxy.trade.shortest_path_tree.triangle_upbound(source, target) * 1.005 for source, target in pairs]
+        expected = []
+        for (source, target), upbound in zip(pairs, upbounds):
+            exp_route, _ = astar_path_numpy(dist_graph, source, target, heuristic, upbound=upbound)
+            act_route, diagnostics = astar_path_csr(csr, source, target, heuristic(target), upbound=upbound)
+            fallback_route, _ = astar_path_csr_fallback(csr, source, target, heuristic(target), upbound=upbound)
+            expected.append(exp_route)
+            with self.subTest(f"{source} to {target}"):
+                self.assertEqual(exp_route, act_route)
+                self.assertEqual(exp_route, fallback_route)
+                self.assertEqual({}, diagnostics)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(astar_path_csr, csr, source, target, heuristic(target), upbound)
+                for (source, target), upbound in zip(pairs, upbounds)
+            ]
+            threaded = [future.result()[0] for future in futures]
+        self.assertEqual(expected, threaded, "Threaded searches should match serial ones")
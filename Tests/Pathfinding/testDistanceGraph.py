@@ -91,6 +91,23 @@ class testDistanceGraph(baseTest):
         actual = distgraph.min_cost(0, indirect=True)
         self.assertEqual(expected, list(actual), 'Unexpected indirect min-cost vector')
 
+    def test_csr_matches_arcs(self) -> None:
+        sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
+        galaxy, graph, _, _ = self._setup_graph(sourcefile)
+
+        distgraph = DistanceGraph(graph)
+        distgraph.lighten_edge(1, 11, 40)
+        indptr, indices, weights = distgraph.csr()
+
+        self.assertEqual(len(distgraph) + 1, len(indptr))
+        self.assertEqual(0, indptr[0])
+        self.assertEqual(len(indices), indptr[-1])
+        self.assertEqual(len(indices), len(weights))
+        for u in range(len(distgraph)):
+            with self.subTest(u):
+                self.assertEqual(list(distgraph._arcs[u][0]), list(indices[indptr[u]:indptr[u + 1]]))
+                self.assertEqual(list(distgraph._arcs[u][1]), list(weights[indptr[u]:indptr[u + 1]]))
+
     def _setup_graph(self, sourcefile):
         sector = SectorDictionary.load_traveller_map_file(sourcefile)
         delta = DeltaDictionary()
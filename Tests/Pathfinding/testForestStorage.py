@@ -0,0 +1,54 @@
+"""
+Created on Oct 19, 2026
+
+@author: CyberiaResurrection
+"""
+import numpy as np
+
+from PyRoute.Pathfinding.forest_storage import round_down_float32, round_up_float32, float32_slack, \
+    max_trees_for_budget
+from Tests.baseTest import baseTest
+
+
+class testForestStorage(baseTest):
+
+    def test_round_down_float32(self) -> None:
+        values = np.array([0.0, 0.1, 1.0 / 3, 12345.678901, 1e7 + 0.3, float('+inf')])
+        actual = round_down_float32(values)
+
+        self.assertEqual(np.float32, actual.dtype)
+        self.assertTrue((actual <= values).all(), "Rounded-down values must not exceed originals")
+        self.assertEqual(float('+inf'), actual[-1], "Infinity should survive rounding")
+        self.assertEqual(0.0, actual[0], "Zero should survive rounding")
+        spacing = np.spacing(actual[:-1].astype(np.float32))
+        self.assertTrue((values[:-1] - actual[:-1] <= spacing).all(), "Rounding should lose at most one ulp")
+
+    def test_round_up_float32(self) -> None:
+        values = np.array([0.0, 0.1, 1.0 / 3, 12345.678901, 1e7 + 0.3, float('+inf')])
+        actual = round_up_float32(values)
+
+        self.assertEqual(np.float32, actual.dtype)
+        self.assertTrue((actual >= values).all(), "Rounded-up values must not be less than originals")
+
+    def test_float32_slack(self) -> None:
+        cases = [
+            ('Empty', np.array([], dtype=np.float32), 0.0),
+            ('All infinite', np.array([float('+inf')], dtype=np.float32), 0.0),
+            ('Finite', np.array([0, 1024, float('+inf')], dtype=np.float32), 2 * float(np.spacing(np.float32(1024))))
+        ]
+
+        for msg, values, expected in cases:
+            with self.subTest(msg):
+                self.assertEqual(expected, float32_slack(values))
+
+    def test_max_trees_for_budget(self) -> None:
+        cases = [
+            ('Empty graph', 0, 1, False, 1),
+            ('Tiny budget', 100000, 1, False, 1),
+            ('float64', 10000, 10, False, 43),
+            ('float32', 10000, 10, True, 87),
+        ]
+
+        for msg, num_nodes, budget, float32, expected in cases:
+            with self.subTest(msg):
+                self.assertEqual(expected, max_trees_for_budget(num_nodes, budget, float32))
@@ -103,6 +103,32 @@ class testRouteLandmarkGraph(baseTest):
         self.assertEqual([1], actual[0], "v - index nodelist not updated")
         self.assertEqual([7.5], actual[1], "v - value list not updated")
 
+    def test_add_many_edges_grows_capacity_geometrically(self) -> None:
+        sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
+        graph, _, stars = self._setup_graph(sourcefile)
+        num_stars = len(stars)
+
+        rlg = RouteLandmarkGraph(graph)
+        self.assertEqual(num_stars, len(rlg))
+        self.assertEqual(0, rlg.capacity(0), "Capacity should not be allocated before first edge")
+
+        neighbours = list(range(1, 10))
+        for v in neighbours:
+            rlg.add_edge(0, v, 10 + v)
+
+        actual = rlg[0]
+        self.assertEqual(neighbours, list(actual[0]), "u - index nodelist not updated")
+        self.assertEqual([10 + v for v in neighbours], list(actual[1]), "u - value list not updated")
+        self.assertEqual({v: k for (k, v) in enumerate(neighbours)}, actual[2], "u - index dict not updated")
+        self.assertEqual(16, rlg.capacity(0), "Capacity should double each time it fills")
+        self.assertEqual(4, rlg.capacity(1), "Single-edge node should have initial capacity")
+
+        # lightening an edge must write through to the backing buffers
+        rlg.lighten_edge(0, 5, 2.5)
+        self.assertEqual(2.5, rlg[0][1][4])
+        self.assertEqual([2.5], list(rlg[5][1]))
+        self.assertEqual(9, len(rlg[0][0]), "Lightening an edge should not change neighbour count")
+
     def test_verify_position_creation(self) -> None:
         sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
         graph, _, stars = self._setup_graph(sourcefile)
@@ -3,7 +3,10 @@ Created on Aug 08, 2024
 
 @author: CyberiaResurrection
 """
+from unittest.mock import patch
+
 from PyRoute.AreaItems.Galaxy import Galaxy
+from PyRoute.Calculation.TradeCalculation import TradeCalculation
 from PyRoute.DataClasses.ReadSectorOptions import ReadSectorOptions
 from PyRoute.Pathfinding.DistanceGraph import DistanceGraph
 from Tests.baseTest import baseTest
@@ -157,6 +160,53 @@ class testTradeCalculation(baseTest):
         self.assertEqual(16, data['actual distance'], "Unexpected route distance")
         self.assertEqual(5, data['jumps'], "Unexpected # of jumps")
 
+    def test_historic_route_cost_cache(self) -> None:
+        sourcefile = self.unpack_filename('DeltaFiles/duplicate_node_blowup/Trojan Reach.sec')
+        args = self._make_args()
+        args.route_btn = 8
+        args.route_reuse = 10
+        readparms = ReadSectorOptions(sectors=[sourcefile], pop_code=args.pop_code, ru_calc=args.ru_calc,
+                                      route_reuse=args.route_reuse, trade_choice=args.routes, route_btn=args.route_btn,
+                                      mp_threads=args.mp_threads, debug_flag=args.debug_flag, fix_pop=False,
+                                      deep_space={}, map_type=args.map_type)
+
+        galaxy = Galaxy(min_btn=15, max_jump=4)
+        galaxy.read_sectors(readparms)
+        galaxy.output_path = args.output
+
+        galaxy.generate_routes()
+        galaxy.trade.calculate_components()
+        galaxy.trade.star_graph = DistanceGraph(galaxy.stars)
+        galaxy.trade.shortest_path_tree = ApproximateShortestPathForestUnified(1, galaxy.stars, 0.1, sources=[[1]])
+
+        rawroute = [9, 4, 6, 5, 11, 13]
+        route = [galaxy.star_mapping[item] for item in rawroute]
+        galaxy.trade.route_update_simple(route, True)
+
+        trade = galaxy.trade
+        self.assertEqual({(9, 13)}, trade.historic_edge_routes[(4, 6)], "Historic route not registered against edge")
+        self.assertEqual(5, trade.historic_route_versions[(9, 13)], "Each lightened edge should bump route version")
+
+        expected = galaxy.route_cost(route)
+        self.assertEqual(expected, trade.historic_route_cost(13, 9, route))
+        self.assertEqual(0, trade.historic_cost_hits, "First lookup should miss")
+        self.assertEqual(expected, trade.historic_route_cost(9, 13, route))
+        self.assertEqual(1, trade.historic_cost_hits, "Second lookup should hit")
+        self.assertEqual(50.0, trade.historic_cost_hit_rate)
+
+        # Lighten an edge on the route - the cached cost must be stale
+        data = galaxy.stars[4][6]
+        data['weight'] -= 10
+        trade._invalidate_historic_routes(6, 4)
+        self.assertEqual(expected - 10, trade.historic_route_cost(9, 13, route))
+        self.assertEqual(1, trade.historic_cost_hits, "Lookup after lightening should miss")
+        self.assertEqual(3, trade.historic_cost_lookups)
+
+        # Lightening an edge not on the route should leave the cached cost alone
+        trade._invalidate_historic_routes(0, 1)
+        self.assertEqual(expected - 10, trade.historic_route_cost(9, 13, route))
+        self.assertEqual(2, trade.historic_cost_hits, "Unrelated lightening should not stale cache")
+
     def test_sufficient_exhaust_value(self) -> None:
         sourcefile = self.unpack_filename('DeltaFiles/insufficient_exhaust_value/Core.sec')
         args = self._make_args()
@@ -171,3 +221,41 @@ class testTradeCalculation(baseTest):
         galaxy.read_sectors(readparms)
         galaxy.output_path = args.output
         galaxy.generate_routes()
+
+    def test_running_totals_follow_route_calculation(self) -> None:
+        sourcefiles = [self.unpack_filename('DeltaFiles/quadripoint_trade_write/' + name + '.sec')
+                       for name in ['Tuglikki', 'Provence', 'Deneb', 'Corridor']]
+
+        args = self._make_args()
+        args.route_btn = 8
+
+        readparms = ReadSectorOptions(sectors=sourcefiles, pop_code=args.pop_code, ru_calc=args.ru_calc,
+                                      route_reuse=args.route_reuse, trade_choice=args.routes, route_btn=args.route_btn,
+                                      mp_threads=args.mp_threads, debug_flag=False, fix_pop=False,
+                                      deep_space={}, map_type=args.map_type)
+
+        galaxy = Galaxy(min_btn=13, max_jump=4)
+        galaxy.read_sectors(readparms)
+        galaxy.generate_routes()
+        trade = galaxy.trade
+
+        with patch.object(TradeCalculation, '_summed_totals', wraps=trade._summed_totals) as mock_method:
+            trade.calculate_routes()
+            # Only the first periodic cross check sums up every sector and allegiance, to seed the running totals
+            self.assertEqual(1, mock_method.call_count)
+
+        self.assertEqual(trade._summed_totals(), trade._running_totals())
+
+        # Odd units, between sectors, between allegiances, and within a sector
+        stars = list(galaxy.star_mapping.values())
+        pairs = [(stars[0], next(star for star in stars if star.sector != stars[0].sector)),
+                 (stars[0], next(star for star in stars if star.alg_base_code != stars[0].alg_base_code)),
+                 (stars[0], next(star for star in stars[1:] if star.sector == stars[0].sector))]
+        for star, target in pairs:
+            for _ in range(3):
+                trade.update_statistics(star, target, 1001, 51, 7)
+
+        self.assertLess(0, trade.sector_passenger_balance.credited)
+        self.assertLess(0, trade.allegiance_trade_balance.credited)
+        self.assertEqual(trade._summed_totals(), trade._running_totals())
+        trade.cross_check_totals()
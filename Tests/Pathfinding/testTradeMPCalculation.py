@@ -52,3 +52,29 @@ class testTradeMPCalculation(baseTest):
         galaxy.generate_routes()
         galaxy.set_borders(args.borders, args.ally_match)
         galaxy.trade.calculate_routes()
+
+    def test_long_routes_independent_of_thread_count(self) -> None:
+        sourcefile = self.unpack_filename('DeltaFiles/Zarushagar.sec')
+
+        results = []
+        for mp_threads in [1, 3]:
+            args = self._make_args()
+            args.mp_threads = mp_threads
+            args.routes = "trade-mp"
+
+            readparms = ReadSectorOptions(sectors=[sourcefile], pop_code=args.pop_code, ru_calc=args.ru_calc,
+                                          route_reuse=args.route_reuse, trade_choice=args.routes,
+                                          route_btn=args.route_btn, mp_threads=args.mp_threads,
+                                          debug_flag=args.debug_flag, fix_pop=False, deep_space={},
+                                          map_type=args.map_type)
+
+            galaxy = Galaxy(min_btn=8, max_jump=4)
+            galaxy.read_sectors(readparms)
+            galaxy.output_path = args.output
+
+            galaxy.generate_routes()
+            galaxy.set_borders(args.borders, args.ally_match)
+            galaxy.trade.calculate_routes()
+            results.append([(star.index, star.tradeIn, star.tradeOver) for star in galaxy.star_mapping.values()])
+
+        self.assertEqual(results[0], results[1], "Long-route results should not depend on worker thread count")
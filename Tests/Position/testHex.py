@@ -370,6 +370,11 @@ class testHex(unittest.TestCase):
 
                 self.assertEqual(exp_msg, act_msg)
 
+    def test_hex_is_slotted(self) -> None:
+        hex1 = Hex(self.coreSector, "0101")
+        self.assertFalse(hasattr(hex1, '__dict__'), "Hex should be fully slotted")
+        self.assertEqual((hex1.q, hex1.r), hex1.hex_position())
+
     def _generate_corner_hexes(self, sector: Sector) -> list[Hex]:
         pos = [
             Hex(sector, "0101"),
@@ -0,0 +1,130 @@
+"""
+Created on Oct 19, 2026
+
+@author: CyberiaResurrection
+"""
+import logging
+
+from PyRoute import ObjectStatistics, Star
+from PyRoute.AreaItems.Galaxy import Galaxy
+from PyRoute.AreaItems.Sector import Sector
+from PyRoute.StatCalculation.StatAggregator import StatAggregator
+from PyRoute.StatCalculation.StatCalculation import StatCalculation
+from Tests.baseTest import baseTest
+
+
+class testStatAggregator(baseTest):
+
+    def _make_stars(self) -> list[Star]:
+        sector = Sector('# Core', '# 0, 0')
+        lines = [
+            "0103 Irkigkhan            B9C4733-9 Fl (Zoid)             { 0 }  (E69+0) [4726]  B    - - 423 8  Im M2 V           ",
+            "0104 Shana Ma             E551112-7 Lo Po                { -3 } (301-3) [1113] H     - - 913 9  Im K2 IV M7 V     ",
+            "0105 Kegl                 A788899-C Ri Pa Ph An Cp        { 3 }  (D7E+3) [9C6D] BcCeF NS - 510 5  ImDd G4 V         ",
+            "0106 Irkigkhan            C9C4733-9 Fl                   { 0 }  (E69+0) [4726]  -    - - 403 8  ImDd             "
+        ]
+        stars = []
+        for counter, line in enumerate(lines):
+            star = Star.parse_line_into_star(line, sector, 'fixed', 'fixed')
+            star.tradeIn = 200 * counter
+            star.tradeOver = 100
+            star.passIn = counter
+            star.eti_cargo_volume = counter % 2
+            star.eti_pass_volume = 0
+            star.starportSize = counter
+            star.starportPop = 10 * counter
+            stars.append(star)
+        return stars
+
+    def _fields(self, stats: ObjectStatistics) -> list:
+        fields = []
+        for slot in ObjectStatistics.__slots__:
+            if '__dict__' == slot:
+                continue
+            value = stats[slot]
+            if isinstance(value, dict):
+                value = [(key, type(item).__name__, item if isinstance(item, int) else
+                          (item.count, item.population, item.homeworlds)) for key, item in value.items()]
+            fields.append((slot, type(value).__name__, value))
+        return fields
+
+    def test_aggregate_matches_add_stats(self) -> None:
+        stars = self._make_stars()
+        calc = StatCalculation(Galaxy(8, 4))
+        # (world, bucket, max_tl) in call order - bucket 1 gets every world, bucket 2 has prior values
+        pairs = [(0, 0, True), (0, 1, False), (1, 1, False), (1, 2, True), (2, 0, True), (2, 1, False), (3, 2, True),
+                 (3, 1, False)]
+
+        expected = [ObjectStatistics() for _ in range(3)]
+        actual = [ObjectStatistics() for _ in range(3)]
+        for stats in [expected[2], actual[2]]:
+            stats.passengers = 7
+            stats.im_be = 0.25
+            stats.bases['Naval base'] = 2
+        for world, bucket, max_tl in pairs:
+            calc.add_stats(expected[bucket], stars[world])
+            if max_tl:
+                calc.max_tl(expected[bucket], stars[world])
+
+        aggregator = StatAggregator(stars)
+        for world, bucket, max_tl in pairs:
+            aggregator.add(world, actual[bucket], max_tl)
+        aggregator.aggregate(calc.sophont_breakdown, calc.default_sophont_population)
+
+        for bucket in range(3):
+            with self.subTest(bucket):
+                self.assertEqual(self._fields(expected[bucket]), self._fields(actual[bucket]))
+
+    def test_aggregate_nothing(self) -> None:
+        calc = StatCalculation(Galaxy(8, 4))
+        aggregator = StatAggregator(self._make_stars())
+        aggregator.aggregate(calc.sophont_breakdown, calc.default_sophont_population)
+        self.assertEqual([], aggregator.buckets)
+
+    def test_null_primary_type(self) -> None:
+        star = self._make_stars()[0]
+        star.star_list_object = star.star_list_object.unshared()
+        star.star_list[0].spectral = None
+        star.star_list[0].size = None
+        calc = StatCalculation(Galaxy(8, 4))
+
+        aggregator = StatAggregator([star])
+        aggregator.add(0, ObjectStatistics(), False)
+        with self.assertRaises(AssertionError) as context:
+            aggregator.aggregate(calc.sophont_breakdown, calc.default_sophont_population)
+        self.assertEqual('Null primary type will blow up templating', str(context.exception))
+
+    def test_aggregate_sophonts_match_add_pop_to_sophont(self) -> None:
+        sector = Sector('# Core', '# 0, 0')
+        lines = [
+            "0103 Irkigkhan            C9C4833-9 Dolp4 Asla6  FoobX   { 0 }  (E69+0) [4726] B     - - 123 8  Im M2 V           ",
+            "0104 Shana Ma             C9C4833-9 [VargW]         { 0 }  (E69+0) [4726] B     - - 123 8  Im M2 V           ",
+            "0105 Kegl                 C9C4833-9 Geon? Zoid0 VargA { 0 }  (E69+0) [4726] B     - - 123 8  Im M2 V           ",
+            "0106 Woop Woop            C9C4733-9 Fl Huma9 Dolp1 Asla1             { 0 }  (E69+0) [4726] B     - - 123 8  Im M2 V           ",
+            "0107 Bar Bar              C9C4733-9 Fl Huma9 Dolp1 Asla0             { 0 }  (E69+0) [4726] B     - - 123 8  Im M2 V           ",
+            "0108 Foo Foo              C9C4733-9 Fl Dolp4 FoobX Foob2             { 0 }  (E69+0) [4726] B     - - 123 8  Im M2 V           "
+        ]
+        logger = logging.getLogger('PyRoute.StatCalculation')
+        logger.manager.disable = 0
+        logger.setLevel(10)
+        # (world, bucket) in call order - bucket 1 gets every world, twice over for some
+        pairs = [(0, 0), (3, 1), (0, 1), (1, 1), (4, 0), (3, 0), (2, 1), (5, 1), (4, 1), (0, 0), (5, 0), (2, 0)]
+
+        results = []
+        for bulk in [False, True]:
+            stars = [Star.parse_line_into_star(line, sector, 'fixed', 'fixed') for line in lines]
+            calc = StatCalculation(Galaxy(8, 4))
+            buckets = [ObjectStatistics() for _ in range(2)]
+            aggregator = StatAggregator(stars)
+            with self.assertLogs(logger, 'DEBUG') as logs:
+                for world, bucket in pairs:
+                    if bulk:
+                        aggregator.add(world, buckets[bucket], False)
+                    else:
+                        calc.add_stats(buckets[bucket], stars[world])
+                aggregator.aggregate(calc.sophont_breakdown, calc.default_sophont_population)
+            results.append(([[(code, soph.count, soph.population, [str(home) for home in soph.homeworlds])
+                              for code, soph in stats.populations.items()] for stats in buckets], logs.output))
+
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(2, len(results[1][1]))
@@ -118,6 +118,26 @@ class testStatCalculation(baseTest):
         self.assertTrue(star1.suppress_soph_percent_warning)
         self.assertTrue(star2.suppress_soph_percent_warning)
 
+    def test_sophont_breakdown(self) -> None:
+        sector = Sector('# Core', '# 0, 0')
+        star1 = Star.parse_line_into_star(
+            "0104 Irkigkhan            C9C4833-9 Dolp4 Asla6  FoobX   { 0 }  (E69+0) [4726] B     - - 123 8  Im M2 V           ",
+            sector, 'fixed', 'fixed')
+        star2 = Star.parse_line_into_star(
+            "0106 Irkigkhan            C9C4833-9 Geon? (Zoid)0       { 0 }  (E69+0) [4726] B     - - 123 8  Im M2 V           ",
+            sector, 'fixed', 'fixed')
+
+        cases = [
+            (star1, [('Asla', 60, None), ('Dolp', 40, None), ('Foob', None, star1)], 'Huma', 0.0),
+            (star2, [('Geon', 0, None), ('Zoid', 5, star2)], 'Huma', 95.0)
+        ]
+        for star, exp_populations, exp_default, exp_pct in cases:
+            with self.subTest(str(star)):
+                populations, default_soph, total_pct = StatCalculation.sophont_breakdown(star)
+                self.assertEqual(exp_populations, populations)
+                self.assertEqual(exp_default, default_soph)
+                self.assertEqual(exp_pct, total_pct)
+
     def test_add_stats_1(self) -> None:
         galaxy = Galaxy(8, 4)
 
@@ -243,6 +263,7 @@ class testStatCalculation(baseTest):
         star1 = Star.parse_line_into_star(
             "0103 Irkigkhan            B9C4733-9 Fl                   { 0 }  (E69+0) [4726]  B    - - 423 8  Im M2 V           ",
             sector, 'fixed', 'fixed')
+        star1.star_list_object = star1.star_list_object.unshared()
         star1.star_list[0].spectral = None
         star1.star_list[0].size = None
 
@@ -391,7 +412,7 @@ class testStatCalculation(baseTest):
 
             output = copy.deepcopy(outer_logs.output)
             self.assertEqual(exp_logs, output)
-            statcalc._write_statistics_to_wiki.assert_called_once_with(0, 0, {})
+            statcalc._write_statistics_to_wiki.assert_called_once_with(0, 0, {}, mp_threads=1)
 
     def test_calculate_statistics(self) -> None:
         filename = 'DeltaFiles/Zarushagar-Ibara.sec'
@@ -3,6 +3,7 @@ Created on Nov 17, 2025
 
 @author: CyberiaResurrection
 """
+import copy
 import unittest
 
 from PyRoute.SystemData.StarList import StarList
@@ -11,6 +12,35 @@ from PyRoute.SystemData.SystemStar import SystemStar
 
 class testStarList(unittest.TestCase):
 
+    def test_intern_shares_primary_first_list(self) -> None:
+        star_list = StarList.intern('M2 V K2 V')
+        self.assertTrue(star_list is StarList.intern('M2 V K2 V'), "Same stellar string should give same star list")
+        self.assertTrue(star_list.is_shared)
+        self.assertEqual('K2 V M2 V', str(star_list))
+
+    def test_shared_star_list_copies_on_write(self) -> None:
+        star_list = StarList.intern('F7 V K7 III')
+        with self.assertRaises(AssertionError):
+            star_list.canonicalise()
+        with self.assertRaises(AssertionError):
+            star_list.stars_list = []
+        with self.assertRaises(AssertionError):
+            star_list.primary.size = 'II'
+
+        private = star_list.unshared()
+        self.assertFalse(private.is_shared)
+        self.assertFalse(private.stars_list[0] is star_list.stars_list[0], "Private copy should not share its stars")
+        private.canonicalise()
+        private.stars_list = [private.stars_list[0]]
+        self.assertEqual('K7 III F7 V', str(star_list))
+
+    def test_star_list_is_slotted(self) -> None:
+        star_list = StarList('G2 V M3 V')
+        self.assertFalse(hasattr(star_list, '__dict__'), "StarList should be fully slotted")
+        copied = copy.deepcopy(StarList.intern('G2 V M3 V'))
+        self.assertFalse(copied.is_shared)
+        self.assertEqual(str(star_list), str(copied))
+
     def test_9_stars_none_trim(self) -> None:
         star_line = "G1 V G2 V G3 V G4 V G5 V G6 V G7 V G8 V G9 V"
         msg = None
@@ -1,3 +1,4 @@
+import copy
 import unittest
 
 from PyRoute.SystemData.SystemStar import SystemStar
@@ -11,6 +12,19 @@ class testSystemStar(unittest.TestCase):
         self.assertEqual('M', star.spectral)
         self.assertEqual(1, star.digit)
 
+    def test_slotted_copy_is_private(self) -> None:
+        star = SystemStar('V', 'G', 2)
+        self.assertFalse(hasattr(star, '__dict__'), "SystemStar should be fully slotted")
+        object.__setattr__(star, '_shared', True)
+        with self.assertRaises(AssertionError):
+            star.size = 'IV'
+
+        for nu_star in [copy.copy(star), copy.deepcopy(star)]:
+            with self.subTest(nu_star):
+                nu_star.size = 'IV'
+                self.assertEqual('G2 IV', str(nu_star))
+        self.assertEqual('G2 V', str(star))
+
     def test_str_1(self) -> None:
         star = SystemStar('PSR')
         self.assertEqual('PSR', str(star))
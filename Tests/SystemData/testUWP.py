@@ -1,9 +1,37 @@
+import pickle
 import unittest
 
 from PyRoute.SystemData.UWP import UWP
 
 
 class testUWP(unittest.TestCase):
+    def test_intern_shares_instance(self) -> None:
+        uwp = UWP.intern('A867A69-F')
+        self.assertTrue(uwp is UWP.intern('A867A69-F'), "Same UWP string should give same shared UWP")
+        self.assertTrue(uwp.is_shared)
+        self.assertEqual('A867A69-F', str(uwp))
+
+    def test_shared_uwp_copies_on_write(self) -> None:
+        uwp = UWP.intern('A867A69-F')
+        with self.assertRaises(AssertionError):
+            uwp.law = 'J'
+
+        private = uwp.unshared()
+        self.assertFalse(private is uwp)
+        self.assertFalse(private.is_shared)
+        self.assertTrue(private is private.unshared(), "Unshared UWP should not be copied again")
+        private.law = 'J'
+        self.assertEqual('A867A6J-F', str(private))
+        self.assertEqual('A867A69-F', str(uwp))
+
+    def test_pickled_shared_uwp_is_private(self) -> None:
+        uwp = UWP.intern('A867A69-F')
+        self.assertFalse(hasattr(uwp, '__dict__'), "UWP should be fully slotted")
+
+        private = pickle.loads(pickle.dumps(uwp))
+        self.assertFalse(private.is_shared)
+        self.assertEqual('A867A69-F', str(private))
+
     def test_all_question_marks(self) -> None:
         uwp = UWP('???????-?')
         self.assertEqual('???????-?', str(uwp))
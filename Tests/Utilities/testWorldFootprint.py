@@ -0,0 +1,46 @@
+"""
+Created on Oct 19, 2026
+
+@author: CyberiaResurrection
+"""
+import sys
+import unittest
+
+from PyRoute.AreaItems.Sector import Sector
+from PyRoute.Star import Star
+from PyRoute.Utilities.WorldFootprint import bytes_per_world, footprint
+
+
+class testWorldFootprint(unittest.TestCase):
+    def test_empty_world_list(self) -> None:
+        self.assertEqual(0.0, bytes_per_world([]))
+
+    def test_shared_objects_counted_once(self) -> None:
+        sector = Sector('# Core', '# 0, 0')
+        star1 = Star.parse_line_into_star(
+            "0103 Irkigkhan            C9C4733-9 Fl                   { 0 }  (E69+0) [4726] B     - - 123 8  Im M2 V           ",
+            sector, 'fixed', 'fixed')
+        star2 = Star.parse_line_into_star(
+            "0104 Irkigkhan Alpha      C9C4733-9 Fl                   { 0 }  (E69+0) [4726] B     - - 123 8  Im M2 V           ",
+            sector, 'fixed', 'fixed')
+        self.assertTrue(star1.uwp is star2.uwp)
+
+        single = footprint([star1])
+        both = footprint([star1, star2])
+        self.assertLess(both, 2 * single, "Shared UWP and star list should only be counted once")
+        self.assertGreater(both, single)
+        self.assertGreaterEqual(single, sys.getsizeof(star1) + sys.getsizeof(star1.hex))
+        self.assertEqual(both / 2, bytes_per_world([star1, star2]))
+
+    def test_sector_not_counted(self) -> None:
+        sector = Sector('# Core', '# 0, 0')
+        star1 = Star.parse_line_into_star(
+            "0103 Irkigkhan            C9C4733-9 Fl                   { 0 }  (E69+0) [4726] B     - - 123 8  Im M2 V           ",
+            sector, 'fixed', 'fixed')
+        before = footprint([star1])
+        sector.worlds.extend([star1] * 100)
+        self.assertEqual(before, footprint([star1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
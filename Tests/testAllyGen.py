@@ -1,5 +1,7 @@
 import unittest
 
+import numpy as np
+
 from PyRoute.Allies.AllyGen import AllyGen
 
 
@@ -56,6 +58,57 @@ class testAllyGen(unittest.TestCase):
         actual = AllyGen.is_client_state('a')
         self.assertEqual(expected, actual)
 
+    def test_alliance_matrix_matches_code_scans(self) -> None:
+        codes = [None, '', '--', '??', 'Na', 'NaHu', 'CsIm', 'Wild', 'Im', 'ImDd', 'ImLu', 'As', 'AsT3', 'ZhAx', 'ZhCa',
+                 'Zh', 'HvFd', 'K1', 'K2', 'Kk', 'KO', 'Xy', 'XyZz']
+        for alg1 in codes:
+            for alg2 in codes:
+                with self.subTest(alg1=alg1, alg2=alg2):
+                    id1 = AllyGen.alg_id(alg1)
+                    id2 = AllyGen.alg_id(alg2)
+                    self.assertEqual(AllyGen._are_allies_core(alg1, alg2), AllyGen.alliance_matrix[id1, id2])
+                    self.assertEqual(AllyGen._are_owned_allies_core(alg1, alg2), AllyGen.owned_alliance_matrix[id1, id2])
+            with self.subTest(alg=alg1):
+                alg_id = AllyGen.alg_id(alg1)
+                self.assertEqual(alg1, AllyGen.alg_id_codes[alg_id])
+                self.assertEqual(AllyGen.same_align(alg1), AllyGen.alg_id_codes[AllyGen.same_align_ids[alg_id]])
+                self.assertEqual(alg1 in AllyGen.nonAligned, AllyGen.is_nonaligned(alg1, True))
+                self.assertEqual(alg1 in AllyGen.nonAligned or alg1 in AllyGen.noOne, AllyGen.is_nonaligned(alg1))
+
+    def test_alg_ids_survive_capacity_growth(self) -> None:
+        im_id = AllyGen.alg_id('ImDd')
+        capacity = len(AllyGen.same_align_ids)
+        new_codes = ['Zq' + str(i) for i in range(capacity + 1)]
+        new_ids = [AllyGen.alg_id(code) for code in new_codes]
+
+        self.assertLess(capacity, len(AllyGen.same_align_ids))
+        self.assertEqual(im_id, AllyGen.alg_id('ImDd'))
+        self.assertEqual(len(set(new_ids)), len(new_ids))
+        self.assertTrue(AllyGen.are_allies('ImDd', 'Im'))
+        self.assertTrue(AllyGen.are_allies(new_codes[-1], new_codes[-1]))
+        self.assertFalse(AllyGen.are_allies(new_codes[0], new_codes[-1]))
+
+    def test_helpers_register_unseen_codes_across_capacity_growth(self) -> None:
+        helpers = {
+            'is_nonaligned': lambda code: AllyGen.is_nonaligned(code),
+            'is_nonaligned_strict': lambda code: AllyGen.is_nonaligned(code, True),
+            'are_allies': lambda code: AllyGen.are_allies(code, code + 'x'),
+            'are_owned_allies': lambda code: AllyGen.are_owned_allies(code, code + 'x')
+        }
+        for name, helper in helpers.items():
+            with self.subTest(helper=name):
+                # Enough codes never seen before to force at least one capacity growth from inside the helper
+                capacity = len(AllyGen.same_align_ids)
+                for i in range(capacity + 1):
+                    self.assertFalse(helper('Yq' + name + str(i)))
+                self.assertLess(capacity, len(AllyGen.same_align_ids))
+
+    def test_vectorised_alliance_lookup(self) -> None:
+        left = np.array([AllyGen.alg_id(alg) for alg in ['ImDd', 'ZhAx', 'NaHu', 'As']])
+        right = np.array([AllyGen.alg_id(alg) for alg in ['ImLu', 'HvFd', 'NaHu', 'AsT3']])
+        expected = np.array([True, False, False, True])
+        np.testing.assert_array_equal(expected, AllyGen.alliance_matrix[left, right])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,120 @@
+"""
+Created on Oct 19, 2026
+
+@author: CyberiaResurrection
+"""
+import json
+import os
+import shutil
+import tempfile
+
+from PyRoute.DataExport import DataExport
+from PyRoute.DeltaDebug.DeltaDictionary import DeltaDictionary, SectorDictionary
+from PyRoute.DeltaDebug.DeltaGalaxy import DeltaGalaxy
+from PyRoute.Inputs.ParseStarInput import ParseStarInput
+from PyRoute.StatCalculation.StatCalculation import StatCalculation
+from Tests.baseTest import baseTest
+
+
+class testDataExport(baseTest):
+
+    def setUp(self) -> None:
+        ParseStarInput.deep_space = {}
+
+    def _make_galaxy(self) -> DeltaGalaxy:
+        delta = DeltaDictionary()
+        for filename in ['DeltaFiles/Zarushagar-Ibara.sec', 'DeltaFiles/Dagudashaag-Bolivar.sec']:
+            sector = SectorDictionary.load_traveller_map_file(self.unpack_filename(filename))
+            delta[sector.name] = sector
+
+        args = self._make_args()
+        galaxy = DeltaGalaxy(args.btn, args.max_jump)
+        galaxy.read_sectors(delta, args.pop_code, args.ru_calc,
+                            args.route_reuse, args.routes, args.route_btn, args.mp_threads, args.debug_flag)
+        galaxy.generate_routes()
+        galaxy.trade.calculate_routes()
+        stats = StatCalculation(galaxy)
+        stats.calculate_statistics(args.ally_match)
+        return galaxy
+
+    def _read_files(self, output_path: str) -> dict[str, bytes]:
+        files = {}
+        for filename in sorted(os.listdir(output_path)):
+            with open(os.path.join(output_path, filename), 'rb') as f:
+                files[filename] = f.read()
+        return files
+
+    def test_pool_export_matches_serial_export(self) -> None:
+        galaxy = self._make_galaxy()
+
+        outputs = []
+        for mp_threads in [1, 2]:
+            with tempfile.TemporaryDirectory() as output_path:
+                galaxy.output_path = output_path
+                DataExport(galaxy, mp_threads=mp_threads).write()
+                outputs.append(self._read_files(output_path))
+
+        expected = ['Dagudashaag Sector.records.jsonl', 'Zarushagar Sector.records.jsonl', 'galaxy.records.jsonl',
+                    'schema.json']
+        self.assertEqual(expected, list(outputs[0]))
+        self.assertEqual(outputs[0], outputs[1])
+        schema = json.loads(outputs[0]['schema.json'])
+        self.assertEqual(DataExport.version, schema['version'])
+
+    def test_load_round_trips_export(self) -> None:
+        galaxy = self._make_galaxy()
+
+        with tempfile.TemporaryDirectory() as output_path:
+            galaxy.output_path = output_path
+            DataExport(galaxy).write()
+            records = DataExport.load(output_path)
+            routes = DataExport.load(output_path, ['route'])
+
+        self.assertEqual(1, len(records['galaxy']))
+        self.assertEqual(galaxy.stats.tradeVol, records['galaxy'][0]['tradeVol'])
+        self.assertEqual(sorted(galaxy.sectors), sorted(item['name'] for item in records['sector']))
+        self.assertEqual(32, len(records['subsector']))
+        self.assertEqual(len(galaxy.alg) + sum(len(sector.alg) for sector in galaxy.sectors.values()),
+                         len(records['allegiance']))
+
+        stars = {(item['sector'], item['position']): item for item in records['star']}
+        self.assertEqual(len(galaxy.star_mapping), len(stars))
+        for star in galaxy.star_mapping.values():
+            with self.subTest(star=str(star)):
+                record = stars[(star.sector.name, star.position)]
+                self.assertEqual(star.name, record['name'])
+                self.assertEqual(str(star.uwp), record['uwp'])
+                self.assertEqual(star.alg_code, record['alg_code'])
+                self.assertEqual(star.tradeIn, record['tradeIn'])
+                self.assertEqual(star.passIn, record['passIn'])
+
+        # Each route is exported once, from whichever end has the lower index
+        self.assertEqual(galaxy.stars.number_of_edges(), len(records['route']))
+        self.assertEqual(sum(data['trade'] for _, _, data in galaxy.stars.edges(data=True)),
+                         sum(item['trade'] for item in records['route']))
+        self.assertEqual({'route': records['route']}, routes)
+
+    def test_load_ignores_files_from_earlier_exports(self) -> None:
+        galaxy = self._make_galaxy()
+
+        with tempfile.TemporaryDirectory() as output_path:
+            galaxy.output_path = output_path
+            DataExport(galaxy).write()
+            # A sector file left behind by an earlier run, with a bigger sector list, into the same directory
+            shutil.copy(os.path.join(output_path, 'Zarushagar Sector.records.jsonl'),
+                        os.path.join(output_path, 'Stale Sector.records.jsonl'))
+            with open(os.path.join(output_path, DataExport.schema_file), 'r', encoding='utf-8') as f:
+                files = json.load(f)['files']
+            records = DataExport.load(output_path, ['sector', 'star'])
+
+        expected = ['galaxy.records.jsonl', 'Zarushagar Sector.records.jsonl', 'Dagudashaag Sector.records.jsonl']
+        self.assertEqual(expected, files)
+        self.assertEqual(['Zarushagar', 'Dagudashaag'], [item['name'] for item in records['sector']])
+        self.assertEqual(len(galaxy.star_mapping), len(records['star']))
+
+    def test_load_rejects_other_version(self) -> None:
+        with tempfile.TemporaryDirectory() as output_path:
+            with open(os.path.join(output_path, DataExport.schema_file), 'w', encoding='utf-8') as f:
+                json.dump({'version': DataExport.version + 1, 'records': DataExport.schema, 'files': []}, f)
+            with self.assertRaises(ValueError):
+                DataExport.load(output_path)
@@ -0,0 +1,128 @@
+"""
+Created on Oct 19, 2026
+
+@author: CyberiaResurrection
+"""
+import codecs
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+from contextlib import redirect_stderr, redirect_stdout
+from unittest.mock import patch
+
+from PyRoute.lint_sectors import lint_sector_file, lint_sectors, process
+from Tests.baseTest import baseTest
+
+
+class testLintSectors(baseTest):
+
+    def setUp(self) -> None:
+        logger = logging.getLogger('PyRoute')
+        logger.manager.disable = 0
+
+    def _spiked_sector(self, tmpdir: str) -> str:
+        # Take a clean sector and damage it: a repeated hex, an undeclared allegiance and a line that won't parse
+        sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
+        with codecs.open(sourcefile, 'r', encoding='utf-8') as infile:
+            lines = [line for line in infile]
+        starts = [i for i, line in enumerate(lines) if line[0].isdigit()]
+        first = starts[0]
+        lines[starts[1]] = lines[starts[1]].replace(' ImDi ', ' XxXx ')
+        lines.insert(starts[2], "0201 Not a star line\n")
+        lines.append(lines[first])
+
+        spiked = os.path.join(tmpdir, 'Zarushagar-spiked.sec')
+        with codecs.open(spiked, 'w', encoding='utf-8') as outfile:
+            outfile.writelines(lines)
+        return spiked
+
+    def test_clean_sector_has_no_errors(self) -> None:
+        sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
+
+        result = lint_sector_file(sourcefile)
+        self.assertEqual('Zarushagar (-1,-1)', result['sector'])
+        self.assertEqual(['CsIm', 'Im', 'ImDi', 'NaHu'], result['declared'])
+        self.assertEqual([], result['undeclared'])
+        self.assertEqual([], [item for item in result['problems'] if 'error' == item['level']])
+
+    def test_warnings_reported_against_their_line(self) -> None:
+        sourcefile = self.unpack_filename('DeltaFiles/read_kilong_sector/Kilong.sec')
+
+        problems = lint_sectors([sourcefile])
+        self.assertLess(0, len(problems))
+        for item in problems:
+            self.assertEqual('warning', item['level'])
+            self.assertEqual('parse', item['check'])
+            self.assertIsNotNone(item['line'])
+            self.assertIn('Kilong', item['message'])
+
+    def test_warnings_reported_with_logging_disabled(self) -> None:
+        sourcefile = self.unpack_filename('DeltaFiles/read_kilong_sector/Kilong.sec')
+
+        logging.disable(logging.WARNING)
+        try:
+            problems = lint_sector_file(sourcefile)['problems']
+            self.assertEqual(logging.WARNING, logging.root.manager.disable)
+        finally:
+            logging.disable(logging.NOTSET)
+        self.assertLess(0, len([item for item in problems if 'parse' == item['check']]))
+
+    def test_spiked_sector_problems(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            spiked = self._spiked_sector(tmpdir)
+            problems = [item for item in lint_sectors([spiked]) if 'error' == item['level']]
+
+        checks = sorted(item['check'] for item in problems)
+        self.assertEqual(['allegiance', 'duplicate-position', 'grammar'], checks)
+        lines = [item['line'] for item in problems]
+        self.assertEqual(sorted(lines), lines, "Problems should be in line order")
+        for item in problems:
+            self.assertEqual(spiked, item['file'])
+            json.dumps(item)
+        dupe = [item for item in problems if 'duplicate-position' == item['check']][0]
+        self.assertEqual('0101', dupe['position'])
+        alleg = [item for item in problems if 'allegiance' == item['check']][0]
+        self.assertIn('XxXx', alleg['message'])
+
+    def test_cross_file_checks(self) -> None:
+        sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
+        missing = os.path.join(os.path.dirname(sourcefile), 'no such sector.sec')
+
+        cases = [
+            ('Serial', 1),
+            ('Pooled', 2)
+        ]
+
+        for msg, mp_threads in cases:
+            with self.subTest(msg):
+                problems = lint_sectors([sourcefile, missing, sourcefile], mp_threads)
+                errors = [item for item in problems if 'error' == item['level']]
+                self.assertEqual(2, len(errors))
+                self.assertEqual('file', errors[0]['check'])
+                self.assertEqual(missing, errors[0]['file'])
+                self.assertEqual('duplicate-sector', errors[1]['check'])
+                self.assertIn('Zarushagar (-1,-1)', errors[1]['message'])
+
+    def test_process_exit_code(self) -> None:
+        sourcefile = self.unpack_filename('DeltaFiles/Zarushagar-Ibara.sec')
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            spiked = self._spiked_sector(tmpdir)
+            cases = [
+                ('Clean', [sourcefile], 0),
+                ('Spiked', [spiked], 1)
+            ]
+
+            for msg, sectors, returncode in cases:
+                with self.subTest(msg):
+                    stdout = io.StringIO()
+                    with patch.object(sys, 'argv', ['lint_sectors.py', '--mp-threads', '1'] + sectors), \
+                            redirect_stdout(stdout), redirect_stderr(io.StringIO()), \
+                            self.assertRaises(SystemExit) as exit_code:
+                        process()
+                    self.assertEqual(returncode, exit_code.exception.code)
+                    for line in stdout.getvalue().splitlines():
+                        self.assertEqual(sectors[0], json.loads(line)['file'])
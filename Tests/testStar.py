@@ -7,6 +7,7 @@ import logging
 import copy
 import unittest
 
+from PyRoute.Allies.AllyGen import AllyGen
 from PyRoute.AreaItems.Allegiance import Allegiance
 from PyRoute.Inputs.ParseStarInput import ParseStarInput
 from PyRoute.Position.Hex import Hex
@@ -64,6 +65,46 @@ class TestStar(baseTest):
         state = star.__getstate__()
         self.assertNotIn('ownedBy', state)
 
+    def test_star_is_slotted(self) -> None:
+        star = Star()
+        self.assertFalse(hasattr(star, '__dict__'), "Star should be fully slotted")
+        self.assertFalse(hasattr(star.nobles, '__dict__'))
+
+    def test_alg_id_follows_alg_code(self) -> None:
+        star = Star()
+        star.alg_code = 'ImDd'
+        self.assertEqual(AllyGen.alg_id('ImDd'), star.alg_id)
+        star.alg_code = 'ZhCa'
+        self.assertEqual(AllyGen.alg_id('ZhCa'), star.alg_id)
+
+    def test_starport_side_record(self) -> None:
+        sector = Sector('# Core', '# 0, 0')
+        star1 = Star.parse_line_into_star(
+            "0103 Irkigkhan            C9C4733-9 Fl                   { 0 }  (E69+0) [4726] B     - - 123 8  Im M2 V           ",
+            sector, 'fixed', 'fixed')
+        star2 = Star.parse_line_into_star(
+            "0104 Shana Ma             E551112-7 Lo Po                { -3 } (301-3) [1113] B     - - 913 9  Im K2 IV M7 V     ",
+            sector, 'fixed', 'fixed')
+        self.assertTrue(star1._starport is star2._starport, "Freshly-parsed stars should share the zero starport record")
+        self.assertEqual((0, 0, 0), (star1.starportSize, star1.starportBudget, star1.starportPop))
+
+        star1.starportSize = 0
+        self.assertTrue(star1._starport is star2._starport, "Writing zero should not split off a private record")
+
+        star1.starportSize = 3
+        star1.starportBudget = 1200
+        self.assertFalse(star1._starport is star2._starport)
+        self.assertEqual((3, 1200, 0), (star1.starportSize, star1.starportBudget, star1.starportPop))
+        self.assertEqual((0, 0, 0), (star2.starportSize, star2.starportBudget, star2.starportPop))
+
+        starcopy = copy.deepcopy(star1)
+        self.assertFalse(starcopy._starport is star1._starport)
+        self.assertEqual((3, 1200, 0), (starcopy.starportSize, starcopy.starportBudget, starcopy.starportPop))
+
+        blank = Star()
+        blank.starportPop = None
+        self.assertIsNone(blank._starport, "Writing None to a blank star should not allocate a starport record")
+
     def testParseIrkigkhan(self) -> None:
         sector = Sector('# Core', '# 0, 0')
         star1 = Star.parse_line_into_star(
@@ -1,3 +1,6 @@
+import copy
+import pickle
+
 from PyRoute.AreaItems.Galaxy import Galaxy
 from PyRoute.AreaItems.Sector import Sector
 from PyRoute.Star import Star
@@ -67,6 +70,7 @@ class testTradeBalance(baseTest):
         self.assertEqual(0, sum(foo.values()), 'TradeBalance should have zero sum')
         self.assertEqual(1, core.stats.tradeExt, 'Core sector should have unit external trade')
         self.assertEqual(1, dagu.stats.tradeExt, 'Dagudashaag sector should have unit external trade')
+        self.assertEqual(2, foo.credited, 'TradeBalance should have credited both sectors')
 
     def test_single_unit_imbalance(self) -> None:
         core = Sector('# Core', '# 0, 0')
@@ -203,6 +207,7 @@ class testTradeBalance(baseTest):
         self.assertEqual(0, forn.stats.tradeExt)
         self.assertEqual(2, mass.stats.tradeExt)
         self.assertEqual(0, delp.stats.tradeExt)
+        self.assertEqual(3, foo.credited)
 
         foo.is_balanced()
 
@@ -315,3 +320,62 @@ class testTradeBalance(baseTest):
         foo.update(update_dict)
 
         foo.is_balanced()
+
+    def test_running_totals_follow_changes(self) -> None:
+        foo = TradeBalance(stat_field='tradeExt', region=Galaxy(8))
+        foo.update({('Core', 'Fornast'): 1, ('Delphi', 'Core'): 2})
+        foo[('Core', 'Fornast')] += 2
+        foo[('Fornast', 'Delphi')] = 1
+        foo[('Delphi', 'Core')] = 0
+
+        exp_imbal = {'Core': 3, 'Fornast': 4, 'Delphi': 1}
+        self.assertEqual(exp_imbal, foo.single_unit_imbalance())
+        self.assertEqual(list(exp_imbal), list(foo.single_unit_imbalance()), "Sector order should follow key order")
+        self.assertEqual(4, foo.sum)
+
+        with self.assertRaises(AssertionError) as context:
+            foo.is_balanced()
+        self.assertEqual('Uncompensated passenger imbalance present', str(context.exception))
+
+        foo[('Core', 'Fornast')] = 1
+        self.assertEqual({'Core': 1, 'Fornast': 2, 'Delphi': 1}, foo.single_unit_imbalance())
+        self.assertEqual(2, foo.sum)
+        with self.assertRaises(AssertionError) as context:
+            foo.is_balanced()
+        self.assertEqual('Uncompensated multilateral passenger imbalance present in sectors', str(context.exception))
+
+    def test_running_totals_survive_pickling(self) -> None:
+        foo = TradeBalance(stat_field='tradeExt', region=Galaxy(8))
+        foo.update({('Core', 'Fornast'): 1, ('Delphi', 'Core'): 2})
+        foo[('Fornast', 'Delphi')] = 3
+        foo.credited = 4
+
+        for copied in [pickle.loads(pickle.dumps(foo)), copy.deepcopy(foo)]:
+            with self.subTest(copied=type(copied)):
+                self.assertIsInstance(copied, TradeBalance)
+                self.assertEqual(dict(foo), dict(copied))
+                self.assertEqual('tradeExt', copied.stat_field)
+                self.assertEqual(4, copied.credited)
+                self.assertEqual(foo.single_unit_imbalance(), copied.single_unit_imbalance())
+                self.assertEqual(list(foo.single_unit_imbalance()), list(copied.single_unit_imbalance()))
+                self.assertEqual(6, copied.sum)
+
+                copied[('Delphi', 'Core')] = 0
+                self.assertEqual({'Core': 1, 'Fornast': 4, 'Delphi': 3}, copied.single_unit_imbalance())
+                self.assertEqual(4, copied.sum)
+
+    def test_other_mutators_keep_running_totals(self) -> None:
+        foo = TradeBalance(stat_field='tradeExt', region=Galaxy(8))
+        self.assertEqual(0, foo.setdefault(('Core', 'Fornast')))
+        self.assertEqual(2, foo.setdefault(('Delphi', 'Core'), 2))
+        self.assertEqual(2, foo.setdefault(('Delphi', 'Core'), 5))
+        foo |= {('Core', 'Fornast'): 1}
+        self.assertEqual({'Core': 3, 'Fornast': 1, 'Delphi': 2}, foo.single_unit_imbalance())
+        self.assertEqual(3, foo.sum)
+
+        key = ('Core', 'Fornast')
+        for remove in [lambda: foo.pop(key), foo.popitem, foo.clear, lambda: foo.__delitem__(key)]:
+            with self.assertRaises(TypeError):
+                remove()
+        self.assertEqual({('Core', 'Fornast'): 1, ('Delphi', 'Core'): 2}, dict(foo))
+        self.assertEqual(3, foo.sum)
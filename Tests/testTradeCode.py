@@ -2,6 +2,8 @@ import copy
 import unittest
 import logging
 
+import numpy as np
+
 from PyRoute.AreaItems.Sector import Sector
 from PyRoute.Errors.MultipleWPopError import MultipleWPopError
 from PyRoute.Inputs.ParseStarInput import ParseStarInput
@@ -1013,6 +1015,89 @@ class TestTradeCode(unittest.TestCase):
                 self.assertEqual(soph_list, code.sophont_list)
                 self.assertEqual(home_list, code.homeworld_list)
 
+    def test_intern_clones_share_until_written(self) -> None:
+        first = TradeCodes.intern('In Na Va Pi')
+        second = TradeCodes.intern('In Na Va Pi')
+        fresh = TradeCodes('In Na Va Pi')
+
+        self.assertFalse(first is second, "Each world should get its own TradeCodes")
+        self.assertTrue(first.codes is second.codes, "Clones should share code lists until written")
+        self.assertFalse(first.sophont_list is second.sophont_list, "Clones should not share sophont lists")
+        for attr in ['codes', 'codeset', 'dcode', 'pcode', 'xcode', 'owned', 'sophont_list', 'homeworld_list']:
+            with self.subTest(attr):
+                self.assertEqual(getattr(fresh, attr), getattr(first, attr))
+
+        first._add_missing_trade_code('Hi')
+        self.assertIn('Hi', first.codes)
+        self.assertNotIn('Hi', second.codes, "Writing one clone's codes should not touch the other clone")
+        self.assertNotIn('Hi', TradeCodes.intern('In Na Va Pi').codes)
+
+    def test_intern_parse_failures_not_cached(self) -> None:
+        line = '[Foo]W (Bar)W'
+        with self.assertRaises(MultipleWPopError):
+            TradeCodes.intern(line)
+        self.assertNotIn(line, TradeCodes.interned)
+
+    def test_flags_match_codeset_checks(self) -> None:
+        cases = ['', 'Ag Ri', 'In Hi', 'Na Po', 'Ba Di', 'Ni Lo', 'As Va', 'Va', 'De He', 'Ic Wa', 'Oc Fl', 'Cp Ri',
+                 'Cs In', 'Cx Ag', 'Ag Ni Pr', 'RsA Na', 'In Ri Cp Cx']
+        for line in cases:
+            with self.subTest(line):
+                code = TradeCodes(line)
+                codeset = set(code.codeset)
+                self.assertFalse(hasattr(code, '__dict__'), "TradeCodes should be fully slotted")
+                self.assertEqual('Ri' in codeset, code.rich)
+                self.assertEqual('In' in codeset, code.industrial)
+                self.assertEqual('Ag' in codeset, code.agricultural)
+                self.assertEqual('Po' in codeset, code.poor)
+                self.assertEqual('Na' in codeset, code.nonagricultural)
+                self.assertEqual('Ba' in codeset or 'Di' in codeset, code.barren)
+                self.assertEqual('Lo' in codeset, code.low)
+                self.assertEqual('Ni' in codeset, code.nonindustrial)
+                self.assertEqual('Hi' in codeset, code.high)
+                self.assertEqual('Va' in codeset and 'As' not in codeset, code.vacuum)
+                self.assertEqual('Wa' in codeset or 'Oc' in codeset, code.waterworld)
+                self.assertEqual(0 < len(TradeCodes.ex_codes & codeset), code.extreme)
+                self.assertEqual(code.nonagricultural or code.extreme, code.needs_agricultural)
+                self.assertEqual(code.extreme or code.poor or code.nonindustrial or code.low, code.low_per_capita_gwp)
+                self.assertEqual('Cp' in code.dcode, code.subsector_capital)
+                self.assertEqual('Cs' in code.dcode, code.sector_capital)
+                self.assertEqual('Cx' in code.dcode, code.other_capital)
+                self.assertEqual(bool({'Cp', 'Cs', 'Cx'} & set(code.dcode)), code.capital)
+
+    def test_flags_follow_code_fixes(self) -> None:
+        code = TradeCodes('Ni Ag')
+        self.assertTrue(code.nonindustrial)
+        code._drop_invalid_trade_code('Ni')
+        self.assertFalse(code.nonindustrial)
+        code._add_missing_trade_code('In')
+        self.assertTrue(code.industrial)
+        self.assertTrue(code.agricultural)
+
+        clone = TradeCodes.intern('Ni Ag')
+        self.assertTrue(clone.nonindustrial)
+        self.assertFalse(clone.industrial)
+
+    def test_match_flags_on_columns(self) -> None:
+        lines = ['Ag', 'Na', 'In', 'Ni', 'As', 'Ag In', 'Ri', '']
+        codes = [TradeCodes(line) for line in lines]
+        flags = np.array([code.flags for code in codes], dtype=np.int64)
+        left = np.repeat(flags, len(flags))
+        right = np.tile(flags, len(flags))
+
+        ag_column = TradeCodes.match_ag_flags(left, right)
+        in_column = TradeCodes.match_in_flags(left, right)
+        for i, code1 in enumerate(codes):
+            for j, code2 in enumerate(codes):
+                with self.subTest(code1=lines[i], code2=lines[j]):
+                    exp_ag = (code1.agricultural and code2.needs_agricultural) or \
+                             (code1.needs_agricultural and code2.agricultural)
+                    exp_in = (code1.industrial and code2.nonindustrial) or (code1.nonindustrial and code2.industrial)
+                    self.assertEqual(exp_ag, code1.match_ag_codes(code2))
+                    self.assertEqual(exp_in, code1.match_in_codes(code2))
+                    self.assertEqual(exp_ag, ag_column[i * len(codes) + j])
+                    self.assertEqual(exp_in, in_column[i * len(codes) + j])
+
 
 if __name__ == "__main__":
     # import sys;sys.argv = ['', 'Test.testName']
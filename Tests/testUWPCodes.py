@@ -0,0 +1,79 @@
+"""
+Created on Oct 19, 2026
+
+@author: CyberiaResurrection
+"""
+import copy
+import pickle
+import sys
+import unittest
+
+from PyRoute.AreaItems.Sector import Sector
+from PyRoute.Star import Star
+from PyRoute.UWPCodes import UWPCodeRecord, UWPCodes
+
+
+class testUWPCodeRecord(unittest.TestCase):
+
+    def _codes(self) -> dict:
+        return {'Starport': 'C', 'Size': '9', 'Atmosphere': 'C', 'Hydrographics': '4', 'Population': '7',
+                'Government': '3', 'Law Level': '3', 'Tech Level': 9, 'Pop Code': '1', 'Starport Size': 0,
+                'Primary Type': 'M', 'Importance': 0, 'Resources': 14}
+
+    def test_behaves_like_dict(self) -> None:
+        expected = self._codes()
+        record = UWPCodeRecord(*expected.values())
+
+        self.assertEqual(expected, record)
+        self.assertEqual(UWPCodes.uwpCodes, list(record))
+        self.assertEqual(list(expected.items()), list(record.items()))
+        self.assertEqual(13, len(record))
+
+        record['Pop Code'] = '3'
+        self.assertEqual('3', record['Pop Code'])
+        del record['Pop Code']
+        self.assertNotIn('Pop Code', record)
+        self.assertEqual(12, len(record))
+        with self.assertRaises(KeyError):
+            record['Pop Code']
+        with self.assertRaises(KeyError):
+            del record['Pop Code']
+        with self.assertRaises(KeyError):
+            record['Spin'] = 1
+        record['Pop Code'] = '6'
+        self.assertEqual(UWPCodes.uwpCodes, list(record), "Key order should not depend on write order")
+
+    def test_code_strings_shared(self) -> None:
+        codes = self._codes()
+        first = UWPCodeRecord(*codes.values())
+        second = UWPCodeRecord(*[''.join(list(value)) if isinstance(value, str) else value
+                                 for value in codes.values()])
+        self.assertIs(first['Starport'], second['Starport'])
+        second['Pop Code'] = str(10 // 10)
+        self.assertIs(first['Pop Code'], second['Pop Code'])
+        self.assertLess(sys.getsizeof(first), sys.getsizeof(dict(first)))
+
+    def test_copies_round_trip(self) -> None:
+        record = UWPCodeRecord(*self._codes().values())
+        for copied in [pickle.loads(pickle.dumps(record)), copy.deepcopy(record)]:
+            with self.subTest(copied=type(copied)):
+                self.assertIsInstance(copied, UWPCodeRecord)
+                self.assertEqual(record, copied)
+
+    def test_star_parsing_and_state(self) -> None:
+        sector = Sector('# Core', '# 0, 0')
+        star = Star.parse_line_into_star(
+            "0103 Irkigkhan            C9C4733-9 Fl                   { 0 }  (E69+0) [4726] B     - - 123 8  Im M2 V           ",
+            sector, 'fixed', 'fixed')
+
+        self.assertIsInstance(star.uwpCodes, UWPCodeRecord)
+        self.assertEqual('C', star.uwpCodes['Starport'])
+        self.assertEqual(9, star.uwpCodes['Tech Level'])
+        self.assertEqual('M', star.uwpCodes['Primary Type'])
+        state = star.__getstate__()
+        self.assertEqual(dict, type(state['uwpCodes']))
+        self.assertEqual(dict(star.uwpCodes), state['uwpCodes'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+"""
+Created on Oct 19, 2026
+
+@author: CyberiaResurrection
+"""
+import os
+import tempfile
+
+from PyRoute.DeltaDebug.DeltaDictionary import DeltaDictionary, SectorDictionary
+from PyRoute.DeltaDebug.DeltaGalaxy import DeltaGalaxy
+from PyRoute.Inputs.ParseStarInput import ParseStarInput
+from PyRoute.StatCalculation.StatCalculation import StatCalculation
+from PyRoute.wikistats import WikiStats
+from Tests.baseTest import baseTest
+
+
+class testWikiStats(baseTest):
+
+    def setUp(self) -> None:
+        ParseStarInput.deep_space = {}
+
+    def _read_pages(self, output_path: str) -> dict[str, bytes]:
+        pages = {}
+        for filename in sorted(os.listdir(output_path)):
+            with open(os.path.join(output_path, filename), 'rb') as f:
+                pages[filename] = f.read()
+        return pages
+
+    def test_pool_pages_match_serial_pages(self) -> None:
+        delta = DeltaDictionary()
+        for filename in ['DeltaFiles/Zarushagar-Ibara.sec', 'DeltaFiles/Dagudashaag-Bolivar.sec']:
+            sector = SectorDictionary.load_traveller_map_file(self.unpack_filename(filename))
+            delta[sector.name] = sector
+
+        args = self._make_args()
+        galaxy = DeltaGalaxy(args.btn, args.max_jump)
+        galaxy.read_sectors(delta, args.pop_code, args.ru_calc,
+                            args.route_reuse, args.routes, args.route_btn, args.mp_threads, args.debug_flag)
+        galaxy.generate_routes()
+        stats = StatCalculation(galaxy)
+        stats.calculate_statistics(args.ally_match)
+
+        outputs = []
+        for mp_threads in [1, 2]:
+            with tempfile.TemporaryDirectory() as output_path:
+                galaxy.output_path = output_path
+                wiki = WikiStats(galaxy, stats.all_uwp, args.ally_count, args.ally_match, False, mp_threads=mp_threads)
+                wiki.write_statistics()
+                outputs.append(self._read_pages(output_path))
+
+        expected = ['Dagudashaag Sector.economic.wiki', 'Dagudashaag Sector.sector.wiki', 'Zarushagar Sector.economic.wiki',
+                    'Zarushagar Sector.sector.wiki', 'allegiances.wiki', 'sectors.wiki', 'sectors_list.txt',
+                    'subsector_list.txt', 'subsectors.wiki', 'summary.wiki']
+        self.assertEqual(expected, list(outputs[0]))
+        self.assertEqual(outputs[0], outputs[1])